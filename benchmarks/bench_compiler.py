@@ -0,0 +1,93 @@
+"""Compare the AST front-end with the old text-pasting compiler.
+
+Measures compile throughput (Plats lines/sec) and peak traced memory for a synthetic
+program, for three pipelines:
+
+- legacy:   old `compile_plats` (Python source text) + `compile()`
+- text:     new `compile_plats` (parse -> ast -> rendered text) + `compile()`
+- code:     new `compile_plats_code` (parse -> ast -> code object, no text)
+
+Usage:
+    python benchmarks/bench_compiler.py [--lines 100000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / "src"))
+sys.path.insert(0, str(HERE))
+
+import _legacy_compiler  # noqa: E402
+from vlaamscodex.compiler import compile_plats, compile_plats_code  # noqa: E402
+
+
+def make_program(n_lines: int) -> str:
+    """A program of roughly `n_lines` lines: small funksies plus top-level statements."""
+    out = ["plan doe"]
+    i = 0
+    while len(out) < n_lines - 1:
+        out.append(f"  maak funksie f{i} met a en b doe")
+        out.append(f"    zet t{i} op da a keer getal {i} derbij da b amen")
+        out.append(f"    klap tekst regel {i} plakt spatie plakt da t{i} amen")
+        out.append(f"    geeftterug da t{i} amen")
+        out.append("  gedaan")
+        out.append(f"  zet x{i} op getal {i} gedeeld getal 2 amen")
+        out.append(f"  roep f{i} met da x{i} en getal 3 amen")
+        i += 1
+    out.append("gedaan")
+    return "\n".join(out) + "\n"
+
+
+def _legacy(src: str) -> object:
+    return compile(_legacy_compiler.compile_plats(src), "<bench>", "exec")
+
+
+def _text(src: str) -> object:
+    return compile(compile_plats(src), "<bench>", "exec")
+
+
+def _code(src: str) -> object:
+    return compile_plats_code(src, "<bench>")
+
+
+PIPELINES = {"legacy": _legacy, "text": _text, "code": _code}
+
+
+def measure(fn, src: str, repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(src)
+        best = min(best, time.perf_counter() - t0)
+
+    tracemalloc.start()
+    fn(src)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--lines", type=int, default=100_000)
+    p.add_argument("--repeat", type=int, default=3)
+    args = p.parse_args(argv)
+
+    src = make_program(args.lines)
+    n_lines = src.count("\n")
+    print(f"program: {n_lines} lines, {len(src)} bytes")
+    print(f"{'pipeline':<8} {'seconds':>9} {'lines/sec':>12} {'peak MiB':>9}")
+    for name, fn in PIPELINES.items():
+        seconds, peak = measure(fn, src, args.repeat)
+        print(f"{name:<8} {seconds:>9.3f} {n_lines / seconds:>12,.0f} {peak / 2**20:>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,72 @@
+"""Run-time cost of module-level `plan` variables vs fast locals (`optimize=2`).
+
+The program is a hot, variable-heavy `plan` body: `--steps` unrolled iterations of a
+small update loop (swapping a handful of variables plus running counters; values stay
+small so the timing is dominated by variable access, not big-integer arithmetic). The code object is compiled once and executed `--repeat` times; compile time
+is not measured.
+
+Usage:
+    python benchmarks/bench_fast_locals.py [--steps 20000] [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / "src"))
+
+from vlaamscodex.compiler import compile_plats_code  # noqa: E402
+
+
+def make_program(steps: int) -> str:
+    out = [
+        "plan doe",
+        "  zet a op getal 0 amen",
+        "  zet b op getal 1 amen",
+        "  zet som op getal 0 amen",
+        "  zet stap op getal 0 amen",
+    ]
+    for _ in range(steps):
+        out.append("  zet t op da a derbij da b amen")
+        out.append("  zet a op da b amen")
+        out.append("  zet b op da t deraf da b amen")
+        out.append("  zet som op da som derbij da a keer getal 2 amen")
+        out.append("  zet stap op da stap derbij getal 1 amen")
+    out.append("  zet resultaat op da som amen")
+    out.append("gedaan")
+    return "\n".join(out) + "\n"
+
+
+def bench(src: str, optimize: int, repeat: int) -> tuple[float, object]:
+    code = compile_plats_code(src, "<bench>", optimize=optimize)
+    best = float("inf")
+    ns: dict[str, object] = {}
+    for _ in range(repeat):
+        ns = {}
+        t0 = time.perf_counter()
+        exec(code, ns)
+        best = min(best, time.perf_counter() - t0)
+    return best, ns.get("resultaat")
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--steps", type=int, default=20_000)
+    p.add_argument("--repeat", type=int, default=20)
+    args = p.parse_args(argv)
+
+    src = make_program(args.steps)
+    base, _ = bench(src, 0, args.repeat)
+    print(f"{'level':<6} {'ms/run':>9} {'speedup':>8}")
+    for level in (0, 1, 2):
+        seconds, _ = bench(src, level, args.repeat)
+        print(f"-O{level:<4} {seconds * 1e3:>9.2f} {base / seconds:>7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
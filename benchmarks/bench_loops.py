@@ -0,0 +1,103 @@
+"""Native `zolang` / `voor` loops vs. recursion.
+
+Before loops existed, repetition had to be written as a self-recursive funksie that
+passes an accumulator down. This compares summing `0..n-1` four ways:
+
+- recursion:  `geeftterug roep tel met ...`, compiled at -O0 (real Python recursion)
+- tail calls: the same funksie at `-O` >= 1, rewritten into a loop by the optimizer
+- zolang:     `zolang da i iskleinerdan da n doe ... gedaan`
+- voor:       `voor i van getal 0 tot da n doe ... gedaan`
+
+Plain recursion is limited by `sys.getrecursionlimit()`, so the shared size stays below
+it; the loops are then also timed on a large `--big` size that recursion cannot reach.
+
+Usage:
+    python benchmarks/bench_loops.py [--n 800] [--big 1000000] [--repeat 200] [-O 2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / "src"))
+
+from vlaamscodex.compiler import compile_plats_code  # noqa: E402
+
+RECURSION = """\
+maak funksie tel met i en n en acc doe
+  als da i iskleinerdan da n dan doe
+    geeftterug roep tel met da i derbij getal 1 en da n en da acc derbij da i amen
+  gedaan
+  geeftterug da acc amen
+gedaan
+plan doe
+  roep tel met getal 0 en getal {n} en getal 0 amen
+gedaan
+"""
+
+ZOLANG = """\
+plan doe
+  zet i op getal 0 amen
+  zet som op getal 0 amen
+  zolang da i iskleinerdan getal {n} doe
+    zet som op da som derbij da i amen
+    zet i op da i derbij getal 1 amen
+  gedaan
+gedaan
+"""
+
+VOOR = """\
+plan doe
+  zet som op getal 0 amen
+  voor i van getal 0 tot getal {n} doe
+    zet som op da som derbij da i amen
+  gedaan
+gedaan
+"""
+
+
+def _time(src: str, optimize: int, repeat: int) -> float:
+    code = compile_plats_code(src, "<bench>", optimize=optimize)
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        exec(code, {})
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--n", type=int, default=800)
+    p.add_argument("--big", type=int, default=1_000_000)
+    p.add_argument("--repeat", type=int, default=200)
+    p.add_argument("-O", dest="optimize", type=int, default=2, choices=[0, 1, 2])
+    args = p.parse_args(argv)
+
+    cases = {"zolang": ZOLANG, "voor": VOOR}
+    runs = [("recursion", RECURSION, 0), ("tail calls", RECURSION, max(args.optimize, 1))]
+    runs += [(name, template, args.optimize) for name, template in cases.items()]
+    print(f"n = {args.n} (-O{args.optimize})")
+    base = None
+    for name, template, level in runs:
+        try:
+            seconds = _time(template.format(n=args.n), level, args.repeat)
+        except RecursionError:
+            print(f"  {name:<11} RecursionError")
+            continue
+        base = base or seconds
+        print(f"  {name:<11} {seconds * 1e6:>10.1f} us  {base / seconds:>6.2f}x")
+
+    print(f"n = {args.big} (-O{args.optimize})")
+    for name in ("zolang", "voor"):
+        seconds = _time(cases[name].format(n=args.big), args.optimize, 3)
+        print(f"  {name:<11} {seconds * 1e3:>10.1f} ms  {args.big / seconds:>14,.0f} iterations/sec")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,98 @@
+"""Micro-benchmarks for the optimizing middle-end (`optimize=0` vs `optimize=1`).
+
+Each case is a small funksie compiled at both levels; the benchmark times calls of the
+generated function (best of `--repeat` runs of `--number` calls) and reports the
+speedup, plus the extra compile time the pass costs on a large program.
+
+Usage:
+    python benchmarks/bench_optimizer.py [--number 200000] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import timeit
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / "src"))
+sys.path.insert(0, str(HERE))
+
+from bench_compiler import make_program  # noqa: E402
+from vlaamscodex.compiler import clear_compile_cache, compile_plats_code  # noqa: E402
+
+CASES = {
+    "plakt chain (5 parts)": (
+        "maak funksie f met naam doe\n"
+        "  geeftterug tekst gdag plakt spatie plakt da naam plakt tekst , plakt spatie plakt tekst welkom amen\n"
+        "gedaan\n",
+        ("wereld",),
+    ),
+    "plakt chain (9 parts)": (
+        "maak funksie f met a en b en c doe\n"
+        "  geeftterug tekst [ plakt da a plakt tekst | plakt da b plakt tekst | plakt da c"
+        " plakt tekst ] plakt spatie plakt tekst ok amen\n"
+        "gedaan\n",
+        ("een", "twee", "drie"),
+    ),
+    "constant arithmetic": (
+        "maak funksie f met x doe\n"
+        "  geeftterug da x keer getal 60 keer getal 60 derbij getal 24 keer getal 7 amen\n"
+        "gedaan\n",
+        (3,),
+    ),
+    "code after geeftterug": (
+        "maak funksie f met x doe\n"
+        "  geeftterug da x amen\n"
+        "  klap tekst nooit amen\n"
+        "gedaan\n",
+        (1,),
+    ),
+}
+
+
+def _function(src: str, optimize: int):
+    ns: dict[str, object] = {}
+    exec(compile_plats_code(src, "<bench>", optimize=optimize), ns)
+    return ns["f"]
+
+
+def bench_call(src: str, args: tuple, optimize: int, number: int, repeat: int) -> float:
+    fn = _function(src, optimize)
+    return min(timeit.repeat(lambda: fn(*args), number=number, repeat=repeat)) / number
+
+
+def bench_compile(n_lines: int, optimize: int, repeat: int) -> float:
+    src = make_program(n_lines)
+    best = float("inf")
+    for _ in range(repeat):
+        clear_compile_cache()
+        t0 = time.perf_counter()
+        compile_plats_code(src, "<bench>", optimize=optimize)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--number", type=int, default=200_000)
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--lines", type=int, default=50_000, help="program size for the compile-time row")
+    args = p.parse_args(argv)
+
+    print(f"{'case':<24} {'-O0 ns':>9} {'-O1 ns':>9} {'speedup':>8}")
+    for name, (src, call_args) in CASES.items():
+        o0 = bench_call(src, call_args, 0, args.number, args.repeat)
+        o1 = bench_call(src, call_args, 1, args.number, args.repeat)
+        print(f"{name:<24} {o0 * 1e9:>9.1f} {o1 * 1e9:>9.1f} {o0 / o1:>7.2f}x")
+
+    c0 = bench_compile(args.lines, 0, 3)
+    c1 = bench_compile(args.lines, 1, 3)
+    print(f"\ncompile {args.lines} lines: -O0 {c0:.3f}s, -O1 {c1:.3f}s ({(c1 / c0 - 1) * 100:+.0f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
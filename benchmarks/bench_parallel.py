@@ -0,0 +1,98 @@
+"""Scaling of chunked parallel compilation (`vlaamscodex.parallel`) over 1..N cores.
+
+Compiles one synthetic program of mostly independent top-level funksies (plus a `plan`
+calling them) with `compile_plats()` as the sequential baseline, then with
+`compile_plats_parallel(jobs=j)` for every `j` in `--jobs` (default: 1, 2, 4, ... up to
+the CPU count). Prints seconds, lines/sec and speed-up over the baseline, and checks
+that every parallel result equals the sequential one.
+
+The baseline does not run Python's `compile()` on the result; the parallel path does
+(per chunk), so `jobs=1` is slower than the baseline by that validation step.
+
+Usage:
+    python benchmarks/bench_parallel.py [--lines 200000] [--jobs 1,2,4,8] [-O 1] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / "src"))
+
+from vlaamscodex.compiler import compile_plats, set_compile_cache_size  # noqa: E402
+from vlaamscodex.parallel import compile_plats_parallel  # noqa: E402
+
+
+def make_program(n_lines: int) -> str:
+    """About `n_lines` lines: 10-line funksies (every third `onthoud`), then a `plan`."""
+    out: list[str] = []
+    i = 0
+    while len(out) < n_lines * 0.9:
+        memo = "onthoud " if i % 3 == 0 else ""
+        out += [
+            f"maak {memo}funksie f{i} met a en b doe",
+            f"  zet t op da a keer getal {i} derbij da b amen",
+            "  als da t isgroterdan getal 3 doe",
+            "    klap tekst groot plakt spatie plakt da t amen",
+            "  anders doe",
+            "    klap tekst klein amen",
+            "  gedaan",
+            "  geeftterug da t amen",
+            "gedaan",
+            "",
+        ]
+        i += 1
+    out.append("plan doe")
+    j = 0
+    while len(out) < n_lines - 1:
+        out.append(f"  zet x{j} op roep f{j % i} met getal {j} en getal 1 amen")
+        j += 1
+    out.append("gedaan")
+    return "\n".join(out) + "\n"
+
+
+def best_of(repeat: int, fn) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main(argv: list[str] | None = None) -> int:
+    cpus = os.cpu_count() or 1
+    default_jobs = sorted({1, *(2**k for k in range(1, 8) if 2**k <= cpus), cpus})
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--lines", type=int, default=200_000)
+    p.add_argument("--jobs", default=",".join(map(str, default_jobs)), help="Comma-separated worker counts")
+    p.add_argument("-O", "--optimize", type=int, default=0, choices=[0, 1])
+    p.add_argument("--repeat", type=int, default=3)
+    args = p.parse_args(argv)
+
+    set_compile_cache_size(0)  # time the compiler, not the in-process memo
+    src = make_program(args.lines)
+    n_lines = src.count("\n")
+    print(f"program: {n_lines} lines, {len(src)} bytes, {cpus} CPUs, -O{args.optimize}")
+
+    base, expected = best_of(args.repeat, lambda: compile_plats(src, optimize=args.optimize))
+    print(f"{'jobs':>10} {'seconds':>9} {'lines/sec':>12} {'speed-up':>9}")
+    print(f"{'sequential':>10} {base:>9.3f} {n_lines / base:>12,.0f} {1.0:>8.2f}x")
+    for jobs in (int(j) for j in args.jobs.split(",")):
+        seconds, result = best_of(
+            args.repeat, lambda: compile_plats_parallel(src, optimize=args.optimize, jobs=jobs)
+        )
+        if result != expected:
+            print(f"jobs={jobs}: output differs from compile_plats()", file=sys.stderr)
+            return 1
+        print(f"{jobs:>10} {seconds:>9.3f} {n_lines / seconds:>12,.0f} {base / seconds:>8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
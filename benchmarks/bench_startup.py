@@ -0,0 +1,80 @@
+"""What the `.pth` startup hook costs every Python process in the environment.
+
+Times `python -c pass`-style interpreter starts (wall clock, subprocess) for:
+
+- none:      a site directory without the package (baseline)
+- codec:     the old hook, `import vlaamscodex.codec; register()`
+- bootstrap: the current hook, `data/vlaamscodex_autoload.pth` (`vlaamscodex._bootstrap`)
+
+Each variant gets its own temporary site directory, processed with `site.addsitedir()`
+from an interpreter started with `-S`, so the real site-packages (which may already
+contain an installed hook) stay out of the measurement. Bytecode is cached first.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 40]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+
+HOOKS = {
+    "none": None,
+    "codec": "import vlaamscodex.codec as _vc; _vc.register()\n",
+    "bootstrap": (ROOT / "data" / "vlaamscodex_autoload.pth").read_text(encoding="utf-8"),
+}
+
+
+def make_site(root: Path, hook: str | None) -> Path:
+    root.mkdir()
+    # Same path entry for every variant, so only the hook differs.
+    (root / "00-src.pth").write_text(str(ROOT / "src") + "\n", encoding="utf-8")
+    if hook is not None:
+        (root / "vlaamscodex_autoload.pth").write_text(hook, encoding="utf-8")
+    return root
+
+
+def start(site_dir: Path, env: dict[str, str]) -> float:
+    cmd = [sys.executable, "-S", "-c", f"import site; site.addsitedir({str(site_dir)!r})"]
+    t0 = time.perf_counter()
+    subprocess.run(cmd, env=env, check=True)
+    return time.perf_counter() - t0
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--runs", type=int, default=40)
+    args = p.parse_args(argv)
+
+    env = {k: v for k, v in os.environ.items() if k not in ("PYTHONDONTWRITEBYTECODE", "PYTHONPATH")}
+    with tempfile.TemporaryDirectory() as td:
+        env["PYTHONPYCACHEPREFIX"] = str(Path(td) / "pycache")
+        sites = {name: make_site(Path(td) / name, hook) for name, hook in HOOKS.items()}
+        for site_dir in sites.values():
+            start(site_dir, env)  # warm the bytecode cache
+
+        times: dict[str, list[float]] = {name: [] for name in sites}
+        for _ in range(args.runs):  # interleaved, so drift hits every variant alike
+            for name, site_dir in sites.items():
+                times[name].append(start(site_dir, env))
+
+    base = statistics.median(times["none"])
+    print(f"{'hook':<10} {'min ms':>8} {'median ms':>10} {'overhead':>9}")
+    for name, ts in times.items():
+        median = statistics.median(ts)
+        print(f"{name:<10} {min(ts) * 1e3:>8.2f} {median * 1e3:>10.2f} {(median - base) * 1e3:>+8.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
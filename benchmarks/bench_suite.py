@@ -0,0 +1,21 @@
+"""The `plats bench` suite, runnable from a checkout without installing the package.
+
+Usage:
+    python benchmarks/bench_suite.py [--sizes 1k,10k,100k,1m] [--cases compile_plats,transform]
+                                     [--json out.json] [--baseline base.json] [--threshold 0.15]
+
+See `vlaamscodex.bench` for the cases and corpora.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / "src"))
+
+from vlaamscodex.cli import main  # noqa: E402
+
+if __name__ == "__main__":
+    raise SystemExit(main(["bench", *sys.argv[1:]]))
@@ -4,9 +4,23 @@ This package exists to demonstrate the mechanism described in /docs:
 - Platskript (.plats) is translated into Python.
 - A custom Python source encoding (`vlaamsplats`) can decode Plats source into Python source
   so `python script.plats` works (with a startup hook that registers the codec).
+- `install_import_hook()` lets `import foo` load `foo.plats` from `sys.path`.
 
 This is intentionally small and not production-ready.
 """
 
-__all__ = ["__version__"]
+__all__ = ["__version__", "install_import_hook", "uninstall_import_hook"]
 __version__ = "0.2.5"
+
+
+def install_import_hook() -> None:
+    """Make `import foo` find `foo.plats` on `sys.path` (compiled once, cached as `.pyc`)."""
+    from .importer import install
+
+    install()
+
+
+def uninstall_import_hook() -> None:
+    from .importer import uninstall
+
+    uninstall()
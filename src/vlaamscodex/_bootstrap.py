@@ -0,0 +1,28 @@
+"""Interpreter startup hook for the `vlaamsplats` codec (run by `vlaamscodex_autoload.pth`).
+
+The `.pth` file runs in *every* Python process of the environment, so this module only
+imports `codecs` (already loaded at startup) and registers a search function that
+answers `None` for every other encoding. `vlaamscodex.codec`, and through it the
+compiler, is imported the first time a `vlaamsplats`/`plats` source is decoded.
+"""
+
+import codecs
+
+_NAMES = frozenset({"vlaamsplats", "plats"})
+_registered = False
+
+
+def _search(encoding_name):  # -> codecs.CodecInfo | None
+    if encoding_name.replace("-", "_").lower() not in _NAMES:
+        return None
+    from . import codec
+
+    return codec._search(encoding_name)
+
+
+def register() -> None:
+    """Register the lazy codec search function (once per process)."""
+    global _registered
+    if not _registered:
+        codecs.register(_search)
+        _registered = True
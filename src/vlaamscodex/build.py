@@ -0,0 +1,178 @@
+"""Incremental, parallel `plats build` for whole directory trees.
+
+    plats build src/ --out build/ -j 8
+
+compiles every `src/**/*.plats` to `build/**/*.py`. A manifest in the output directory
+(`.plats-build.json`) records the SHA-256 of each source and of the output written for
+it, together with the compiler version and optimization level, so a rebuild:
+
+- skips sources whose hash is unchanged (and whose output is still on disk);
+- compiles the rest in a process pool (`jobs`, default `os.cpu_count()`);
+- only writes outputs whose bytes actually change, so mtimes of untouched files stay put;
+- removes outputs it wrote earlier for sources that no longer exist.
+
+Files with syntax errors are reported and retried on the next build. A file that built
+before keeps its manifest entry, marked failed, so its old output is still pruned once the
+source is deleted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .compiler import COMPILER_VERSION, compile_plats
+from .errors import PlatsSyntaxError
+
+MANIFEST_NAME = ".plats-build.json"
+_MANIFEST_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class BuildError:
+    path: Path
+    message: str
+    line: int | None = None
+
+    def __str__(self) -> str:
+        where = f"{self.path}:{self.line}" if self.line is not None else str(self.path)
+        return f"{where}: error: {self.message}"
+
+
+@dataclass(slots=True)
+class BuildResult:
+    compiled: list[Path] = field(default_factory=list)  # outputs (re)written
+    unchanged: list[Path] = field(default_factory=list)  # recompiled, identical output
+    skipped: list[Path] = field(default_factory=list)  # source hash unchanged
+    removed: list[Path] = field(default_factory=list)  # outputs of deleted sources
+    errors: list[BuildError] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write(path: Path, data: bytes) -> None:
+    # Like `cache._atomic_write`, but honouring the umask: these are user-facing files.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _plats_text(data: bytes) -> str:
+    # Blank (not drop) a coding cookie, like `plats run`, so error lines match the file.
+    lines = data.decode("utf-8").splitlines()
+    if lines and lines[0].lstrip().startswith("#") and "coding" in lines[0]:
+        lines[0] = ""
+    return "\n".join(lines)
+
+
+def _compile_job(job: tuple[str, bytes, int]) -> tuple[str, str | None, str | None, int | None]:
+    """Worker: `(rel, source bytes, optimize)` -> `(rel, python, error message, error line)`."""
+    rel, data, optimize = job
+    try:
+        return rel, compile_plats(_plats_text(data), optimize=optimize), None, None
+    except PlatsSyntaxError as e:
+        return rel, None, e.message, e.line
+    except (UnicodeDecodeError, ValueError) as e:
+        return rel, None, str(e), None
+
+
+def _load_manifest(out_dir: Path, optimize: int) -> dict[str, dict[str, str]]:
+    try:
+        data = json.loads((out_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != _MANIFEST_VERSION
+        or data.get("compiler") != COMPILER_VERSION
+        or data.get("optimize") != optimize
+        or not isinstance(data.get("files"), dict)
+    ):
+        # Still return the entries: their outputs are ours to prune, just not to trust.
+        files = data.get("files") if isinstance(data, dict) else None
+        return {rel: {"output": ""} for rel in files} if isinstance(files, dict) else {}
+    return data["files"]
+
+
+def build_tree(src_dir: Path, out_dir: Path, *, jobs: int | None = None, optimize: int = 0) -> BuildResult:
+    """Compile `src_dir/**/*.plats` into `out_dir/**/*.py`, incrementally and in parallel."""
+    src_dir = Path(src_dir)
+    out_dir = Path(out_dir)
+    result = BuildResult()
+    old = _load_manifest(out_dir, optimize)
+    new: dict[str, dict[str, str]] = {}
+
+    out_root = out_dir.resolve()
+    sources = sorted(
+        p for p in src_dir.rglob("*.plats") if p.is_file() and out_root not in p.resolve().parents
+    )
+    todo: list[tuple[str, bytes, int]] = []
+    source_hashes: dict[str, str] = {}
+    for path in sources:
+        rel = path.relative_to(src_dir).with_suffix(".py").as_posix()
+        data = path.read_bytes()
+        digest = _sha256(data)
+        entry = old.get(rel)
+        target = out_dir / rel
+        if entry is not None and entry.get("source") == digest and entry.get("output") and target.is_file():
+            new[rel] = entry
+            result.skipped.append(target)
+            continue
+        source_hashes[rel] = digest
+        todo.append((rel, data, optimize))
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    if jobs > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(todo))) as pool:
+            outcomes = list(pool.map(_compile_job, todo, chunksize=max(1, len(todo) // (jobs * 4))))
+    else:
+        outcomes = [_compile_job(job) for job in todo]
+
+    for rel, py_src, message, line in outcomes:
+        target = out_dir / rel
+        if py_src is None:
+            result.errors.append(BuildError(src_dir / Path(rel).with_suffix(".plats"), message or "", line))
+            if rel in old:  # the previous output is still on disk and still ours to prune
+                new[rel] = {"source": source_hashes[rel], "output": "", "failed": "true"}
+            continue
+        data = py_src.encode("utf-8")
+        out_hash = _sha256(data)
+        try:
+            same = target.is_file() and _sha256(target.read_bytes()) == out_hash
+        except OSError:
+            same = False
+        if same:
+            result.unchanged.append(target)
+        else:
+            _write(target, data)
+            result.compiled.append(target)
+        new[rel] = {"source": source_hashes[rel], "output": out_hash}
+
+    for rel in sorted(old.keys() - new.keys() - source_hashes.keys()):
+        target = out_dir / rel
+        try:
+            target.unlink()
+        except OSError:
+            continue
+        result.removed.append(target)
+
+    if new != old or not (out_dir / MANIFEST_NAME).is_file():
+        manifest = {"version": _MANIFEST_VERSION, "compiler": COMPILER_VERSION, "optimize": optimize, "files": new}
+        _write(out_dir / MANIFEST_NAME, (json.dumps(manifest, indent=1, sort_keys=True) + "\n").encode("utf-8"))
+    return result
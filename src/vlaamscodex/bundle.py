@@ -0,0 +1,121 @@
+"""`plats bundle`: a single-file zipapp of precompiled Platskript.
+
+    plats bundle app.plats -o app.pyz
+    python app.pyz
+
+The archive holds the program's code object (marshalled, no Python source round trip),
+any extra `.plats` modules as sourceless `.pyc` files (importable through `zipimport`)
+and a small `__main__.py` shim that only imports `marshal` and `sys`. Running the bundle
+neither compiles anything nor imports `vlaamscodex`, so it starts as fast as plain Python.
+
+Code objects are tied to the interpreter version: the shim checks the bytecode magic
+number and exits with a clear message (instead of a crash) when run by another Python.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import marshal
+import os
+import stat
+import sys
+import zipfile
+from pathlib import Path
+from typing import Iterable
+
+from . import __version__
+from .compiler import compile_plats_code
+
+MAIN_ENTRY = "__plats__/main.bin"
+# Fixed timestamp so identical inputs produce byte-identical bundles.
+_ZIP_DATE = (1980, 1, 1, 0, 0, 0)
+# pyc flags (PEP 552): hash-based, not checked against a source (there is none in the archive).
+_PYC_FLAGS_UNCHECKED_HASH = 0b01
+
+_SHIM = '''\
+# Generated by `plats bundle` (vlaamscodex {version}). Runs precompiled Platskript.
+import marshal
+import sys
+
+try:
+    from _frozen_importlib_external import MAGIC_NUMBER  # loaded at startup, unlike importlib.util
+except ImportError:
+    from importlib.util import MAGIC_NUMBER
+
+_blob = __loader__.get_data(__file__[: -len("__main__.py")] + {entry!r})
+if _blob[:4] != MAGIC_NUMBER:
+    sys.exit("{name}: bundled for Python {python}; rebuild it with `plats bundle` for this interpreter")
+exec(marshal.loads(_blob[4:]), {{"__name__": "__main__", "__file__": {name!r}}})
+'''
+
+
+def _read_plats(path: Path) -> str:
+    lines = path.read_text(encoding="utf-8").splitlines()
+    if lines and lines[0].lstrip().startswith("#") and "coding" in lines[0]:
+        lines[0] = ""
+    return "\n".join(lines)
+
+
+def _sourceless_pyc(code: object, source: bytes) -> bytes:
+    pyc = bytearray(importlib.util.MAGIC_NUMBER)
+    pyc += _PYC_FLAGS_UNCHECKED_HASH.to_bytes(4, "little")
+    pyc += importlib.util.source_hash(source)
+    pyc += marshal.dumps(code)
+    return bytes(pyc)
+
+
+def _add(zf: zipfile.ZipFile, name: str, data: bytes) -> None:
+    info = zipfile.ZipInfo(name, date_time=_ZIP_DATE)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.external_attr = 0o644 << 16
+    zf.writestr(info, data)
+
+
+def bundle(
+    entry: Path,
+    out: Path,
+    *,
+    modules: Iterable[Path] = (),
+    optimize: int = 0,
+    interpreter: str | None = None,
+) -> Path:
+    """Write a zipapp for the Plats program `entry` to `out` and return `out`.
+
+    `modules` are extra `.plats` files, bundled as top-level modules named after their
+    stem. `interpreter` adds a `#!` line (like `zipapp -p`) and makes `out` executable.
+    Raises `PlatsSyntaxError` for source errors, before anything is written.
+    """
+    entry = Path(entry)
+    out = Path(out)
+    main_code = compile_plats_code(_read_plats(entry), entry.name, optimize=optimize)
+    compiled_modules: list[tuple[str, bytes]] = []
+    for path in modules:
+        path = Path(path)
+        src = _read_plats(path)
+        code = compile_plats_code(src, path.name, optimize=optimize)
+        compiled_modules.append((f"{path.stem}.pyc", _sourceless_pyc(code, src.encode("utf-8"))))
+
+    shim = _SHIM.format(
+        version=__version__,
+        entry=MAIN_ENTRY,
+        name=entry.name,
+        python="{}.{}".format(*sys.version_info[:2]),
+    )
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(f".{out.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            if interpreter:
+                f.write(b"#!" + interpreter.encode("utf-8") + b"\n")
+            with zipfile.ZipFile(f, "w") as zf:
+                _add(zf, "__main__.py", shim.encode("utf-8"))
+                _add(zf, MAIN_ENTRY, importlib.util.MAGIC_NUMBER + marshal.dumps(main_code))
+                for name, data in sorted(compiled_modules):
+                    _add(zf, name, data)
+        if interpreter:
+            os.chmod(tmp, os.stat(tmp).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+        os.replace(tmp, out)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return out
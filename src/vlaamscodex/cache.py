@@ -0,0 +1,193 @@
+"""On-disk cache for compiled Platskript (`__pycache__`-style).
+
+Two kinds of entries are stored:
+
+- `.platsc`: a marshalled code object (for `plats run` / `plats examples --run`)
+- `.platspy`: the generated Python source text (for `plats show-python` and the codec)
+
+Every entry is keyed by a SHA-256 over the Plats source, the compiler version, the entry
+kind, the optimization level and (for code objects) the interpreter cache tag and filename baked into the code.
+A stale or corrupt entry is simply recompiled and overwritten.
+
+Location:
+- next to the source in `__pycache__/<stem>.<cache_tag>[.opt-N].<kind>` when the source path is known
+- otherwise (codec, built-in examples) or when `VLAAMSCODEX_CACHE_DIR` is set, in a shared
+  content-addressed directory: `<cache dir>/<xx>/<digest>.<kind>`
+
+Writes go through a temporary file plus `os.replace()`, so concurrent runs never observe
+half-written entries. Set `VLAAMSCODEX_NO_CACHE=1` (or pass `--no-cache` on the CLI) to
+bypass the cache entirely; like `.pyc` files, nothing is written when
+`sys.dont_write_bytecode` is set.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+from pathlib import Path
+from types import CodeType
+from typing import Callable, TypeVar
+
+from .compiler import COMPILER_VERSION, compile_plats, compile_plats_code
+
+CACHE_MAGIC = b"PLTC\x01"
+KIND_CODE = "platsc"
+KIND_PYTHON = "platspy"
+
+_HEADER_LEN = len(CACHE_MAGIC) + hashlib.sha256().digest_size
+
+_T = TypeVar("_T")
+
+
+def cache_enabled() -> bool:
+    """False when `VLAAMSCODEX_NO_CACHE` is set to a truthy value."""
+    raw = os.getenv("VLAAMSCODEX_NO_CACHE", "").strip().lower()
+    return raw not in ("1", "true", "yes", "y", "on")
+
+
+def default_cache_dir() -> Path:
+    """The shared cache directory (`VLAAMSCODEX_CACHE_DIR`, else the user cache dir)."""
+    env = os.getenv("VLAAMSCODEX_CACHE_DIR")
+    if env:
+        return Path(env).expanduser()
+    if os.name == "nt":
+        base = os.getenv("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+    else:
+        base = os.getenv("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "vlaamscodex"
+
+
+def cache_key(plats_src: str, kind: str, filename: str = "", optimize: int = 0) -> bytes:
+    h = hashlib.sha256()
+    h.update(CACHE_MAGIC)
+    h.update(f"{kind}\0{COMPILER_VERSION}\0".encode())
+    if optimize:
+        h.update(f"opt-{optimize}\0".encode())
+    if kind == KIND_CODE:
+        h.update(f"{sys.implementation.cache_tag}\0{filename}\0".encode())
+    h.update(plats_src.encode("utf-8", "surrogatepass"))
+    return h.digest()
+
+
+def cache_path(
+    key: bytes,
+    kind: str,
+    source_path: Path | None = None,
+    cache_dir: Path | None = None,
+    optimize: int = 0,
+) -> Path:
+    if source_path is not None and cache_dir is None and not os.getenv("VLAAMSCODEX_CACHE_DIR"):
+        tag = sys.implementation.cache_tag or "plats"
+        if optimize:
+            tag = f"{tag}.opt-{optimize}"
+        return source_path.parent / "__pycache__" / f"{source_path.stem}.{tag}.{kind}"
+    digest = key.hex()
+    return (cache_dir or default_cache_dir()) / digest[:2] / f"{digest}.{kind}"
+
+
+def _read_entry(path: Path, key: bytes) -> bytes | None:
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    if len(data) < _HEADER_LEN or not data.startswith(CACHE_MAGIC):
+        return None
+    if data[len(CACHE_MAGIC) : _HEADER_LEN] != key:
+        return None
+    return data[_HEADER_LEN:]
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Write `data` to `path` via a temp file in the same directory and `os.replace()`."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _write_entry(path: Path, key: bytes, payload: bytes) -> None:
+    if sys.dont_write_bytecode:
+        return
+    try:
+        _atomic_write(path, CACHE_MAGIC + key + payload)
+    except OSError:
+        # Read-only checkout, full disk, ...: caching is best effort.
+        pass
+
+
+def _load(
+    plats_src: str,
+    kind: str,
+    filename: str,
+    source_path: Path | None,
+    cache_dir: Path | None,
+    optimize: int,
+    build: Callable[[], _T],
+) -> _T:
+    key = cache_key(plats_src, kind, filename, optimize)
+    path = cache_path(key, kind, source_path, cache_dir, optimize)
+    payload = _read_entry(path, key)
+    if payload is not None:
+        try:
+            return marshal.loads(payload)
+        except (EOFError, ValueError, TypeError):
+            pass
+    value = build()
+    _write_entry(path, key, marshal.dumps(value))
+    return value
+
+
+def load_code(
+    plats_src: str,
+    filename: str = "<plats>",
+    *,
+    source_path: Path | None = None,
+    use_cache: bool = True,
+    cache_dir: Path | None = None,
+    optimize: int = 0,
+) -> CodeType:
+    """Return the code object for `plats_src`, from the cache when possible."""
+    if not use_cache or not cache_enabled():
+        return compile_plats_code(plats_src, filename, optimize=optimize)
+    return _load(
+        plats_src,
+        KIND_CODE,
+        filename,
+        source_path,
+        cache_dir,
+        optimize,
+        lambda: compile_plats_code(plats_src, filename, optimize=optimize),
+    )
+
+
+def load_python(
+    plats_src: str,
+    *,
+    source_path: Path | None = None,
+    use_cache: bool = True,
+    cache_dir: Path | None = None,
+    optimize: int = 0,
+) -> str:
+    """Return the generated Python source for `plats_src`, from the cache when possible."""
+    if not use_cache or not cache_enabled():
+        return compile_plats(plats_src, optimize=optimize)
+    return _load(
+        plats_src,
+        KIND_PYTHON,
+        "",
+        source_path,
+        cache_dir,
+        optimize,
+        lambda: compile_plats(plats_src, optimize=optimize),
+    )
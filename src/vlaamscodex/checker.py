@@ -15,6 +15,8 @@ import re
 from pathlib import Path
 from dataclasses import dataclass
 
+from .parser import tokenize_line
+
 # Checker command aliases (Multi-Vlaams!)
 CHECKER_ALIASES = {
     # West-Vlaams
@@ -131,8 +133,14 @@ KEYWORDS = {
     "plakt", "derbij", "deraf", "keer", "gedeeld",
     "als", "anders", "zolang", "waar", "onwaar",
     "is", "nie", "en", "of", "groter", "kleiner",
+    "dan", "voor", "van", "tot", "stap", "stop",
+    "reeks", "som", "minimum", "maximum", "gemiddelde", "lengte",
+    "lever", "elk", "uit",
 }
 
+# First word of lines that open a block closed by `gedaan` (`anders doe` continues one).
+BLOCK_OPENERS = {"plan", "maak", "als", "zolang", "voor"}
+
 
 def get_error_message(error_type: str, dialect: str = "default") -> str:
     """Get an error message in the specified dialect."""
@@ -145,6 +153,50 @@ def get_success_message(dialect: str = "default") -> str:
     return SUCCESS_MESSAGES.get(dialect, SUCCESS_MESSAGES["default"])
 
 
+# Statements that should end with 'amen'
+AMEN_STATEMENTS = [
+    re.compile(r"^zet\s+\w+\s+op\s+"),  # zet X op Y amen
+    re.compile(r"^klap\s+"),  # klap X amen
+    re.compile(r"^roep\s+"),  # roep X amen
+    re.compile(r"^geeftterug\s+"),  # geeftterug X amen
+    re.compile(r"^lever\s+"),  # lever X amen
+]
+
+
+def check_line(line: str, line_number: int, dialect: str = "default") -> list[SyntaxIssue]:
+    """Line-local checks (used per line by `check_syntax` and the language server)."""
+    issues: list[SyntaxIssue] = []
+    # Same token rules as the compiler, so `klap x amen  # uitleg` is fine
+    stripped = " ".join(tokenize_line(line))
+
+    # Skip empty lines, comments and block structure lines
+    if not stripped or stripped.startswith("#") or stripped in ("plan doe", "gedaan", "anders", "anders doe"):
+        return issues
+
+    for pattern in AMEN_STATEMENTS:
+        if pattern.match(stripped) and not stripped.endswith("amen"):
+            issues.append(SyntaxIssue(
+                line_number=line_number,
+                line_content=line,
+                issue_type="missing_amen",
+                message=get_error_message("missing_amen", dialect),
+                suggestion=f"{stripped} amen",
+            ))
+            break
+
+    # Check for 'maak funksie' without 'doe'
+    if stripped.startswith("maak funksie") and "doe" not in stripped:
+        issues.append(SyntaxIssue(
+            line_number=line_number,
+            line_content=line,
+            issue_type="invalid_statement",
+            message=get_error_message("invalid_statement", dialect),
+            suggestion="maak funksie <naam> met <params> doe",
+        ))
+
+    return issues
+
+
 def check_syntax(source: str, dialect: str = "default") -> list[SyntaxIssue]:
     """Check Platskript source code for common issues.
 
@@ -184,8 +236,12 @@ def check_syntax(source: str, dialect: str = "default") -> list[SyntaxIssue]:
                 ))
                 break
 
-    # Count block openers and closers
-    plan_doe_count = source.count("plan doe") + source.count("maak funksie")
+    # Count block openers (plan, maak funksie, als, zolang, voor) and closers
+    plan_doe_count = 0
+    for line in lines:
+        words = line.split("#", 1)[0].split()
+        if words and words[-1] == "doe" and words[0] in BLOCK_OPENERS:
+            plan_doe_count += 1
     gedaan_count = source.count("gedaan")
     if plan_doe_count != gedaan_count:
         issues.append(SyntaxIssue(
@@ -193,49 +249,12 @@ def check_syntax(source: str, dialect: str = "default") -> list[SyntaxIssue]:
             line_content="",
             issue_type="unbalanced_blocks",
             message=get_error_message("unbalanced_blocks", dialect),
-            suggestion=f"'plan doe'/'maak funksie': {plan_doe_count}, 'gedaan': {gedaan_count}",
+            suggestion=f"'... doe' blocks: {plan_doe_count}, 'gedaan': {gedaan_count}",
         ))
 
     # Check each line for common issues
     for i, line in enumerate(lines, 1):
-        stripped = line.strip()
-
-        # Skip empty lines and comments
-        if not stripped or stripped.startswith("#"):
-            continue
-
-        # Skip block structure lines
-        if stripped in ("plan doe", "gedaan", "anders"):
-            continue
-
-        # Check for statements that should end with 'amen'
-        amen_statements = [
-            r"^zet\s+\w+\s+op\s+",       # zet X op Y amen
-            r"^klap\s+",                  # klap X amen
-            r"^roep\s+",                  # roep X amen
-            r"^geeftterug\s+",            # geeftterug X amen
-        ]
-
-        for pattern in amen_statements:
-            if re.match(pattern, stripped) and not stripped.endswith("amen"):
-                issues.append(SyntaxIssue(
-                    line_number=i,
-                    line_content=line,
-                    issue_type="missing_amen",
-                    message=get_error_message("missing_amen", dialect),
-                    suggestion=f"{stripped} amen",
-                ))
-                break
-
-        # Check for 'maak funksie' without 'doe'
-        if stripped.startswith("maak funksie") and "doe" not in stripped:
-            issues.append(SyntaxIssue(
-                line_number=i,
-                line_content=line,
-                issue_type="invalid_statement",
-                message=get_error_message("invalid_statement", dialect),
-                suggestion="maak funksie <naam> met <params> doe",
-            ))
+        issues.extend(check_line(line, i, dialect))
 
     return issues
 
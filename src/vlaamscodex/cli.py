@@ -25,20 +25,10 @@ import os
 import sys
 from pathlib import Path
 
-from .compiler import compile_plats
 from . import __version__
-from .platsweb.builder import build_dir as platsweb_build_dir, dev_dir as platsweb_dev_dir
-from .platsweb.errors import PlatsWebParseError
-from .repl import run_repl, detect_dialect, REPL_ALIASES
-from .fortune import print_fortune, detect_fortune_dialect, FORTUNE_ALIASES
-from .init import create_project, detect_init_dialect, print_init_help, INIT_ALIASES
-from .checker import check_file, detect_checker_dialect, print_checker_help, CHECKER_ALIASES
-from .examples import (
-    list_examples, show_example, run_example, save_example,
-    detect_examples_dialect, print_examples_help, EXAMPLES_ALIASES
-)
-from .dialects.transformer import available_packs as available_dialect_packs
-from .dialects.transformer import transform as transform_dialect
+
+# Subcommands import their modules when they run: `plats run` must not pay for the
+# PlatsWeb dev server, the REPL or the dialect packs (see tests/test_cli_startup.py).
 
 # =============================================================================
 # MULTI-VLAAMS DIALECT ALIASSEN 🇧🇪
@@ -266,23 +256,56 @@ COMMAND_ALIASES = {
 
 def _read_plats(path: Path) -> str:
     text = path.read_text(encoding="utf-8")
-    # ignore coding cookie if present
+    # ignore coding cookie if present (blanked, not dropped, so line numbers stay put)
     lines = text.splitlines()
     if lines and lines[0].lstrip().startswith("#") and "coding" in lines[0]:
-        lines = lines[1:]
+        lines[0] = ""
     return "\n".join(lines)
 
 
-def cmd_run(path: Path) -> int:
+def cmd_run(path: Path, use_cache: bool = True, optimize: int = 0, sandbox: bool = False, watch: bool = False) -> int:
+    if watch:
+        return _run_watched(path, optimize, sandbox)
+    if sandbox:
+        return _run_sandboxed(path, optimize)
+
+    from .cache import load_code
+
     plats_src = _read_plats(path)
-    py_src = compile_plats(plats_src)
-    codeobj = compile(py_src, str(path), "exec")
+    codeobj = load_code(plats_src, str(path), source_path=path, use_cache=use_cache, optimize=optimize)
     exec(codeobj, {})
     return 0
 
 
-def cmd_build(path: Path, out: Path) -> int:
+def _run_watched(path: Path, optimize: int, sandbox: bool) -> int:
+    if sandbox or optimize >= 2:
+        print("--watch runs in-process at -O0/-O1 (no --sandbox, no -O2)", file=sys.stderr)
+        return 2
+    from .watch import watch
+
+    return watch(path, optimize=optimize, read=lambda: _read_plats(path))
+
+
+def _run_sandboxed(path: Path, optimize: int) -> int:
+    from .sandbox import OK, SandboxPool
+
+    with SandboxPool(1) as pool:
+        result = pool.run(_read_plats(path), str(path), optimize=optimize)
+    sys.stdout.write(result.stdout)
+    sys.stdout.flush()
+    sys.stderr.write(result.stderr)
+    if result.status == OK:
+        return 0
+    if result.status not in ("error", "syntax_error"):
+        print(f"{path}: stopped by the sandbox: {result.status}", file=sys.stderr)
+    return 1
+
+
+def cmd_build(path: Path, out: Path, optimize: int = 0, jobs: int | None = None) -> int:
     if path.is_dir():
+        from .platsweb.builder import build_dir as platsweb_build_dir
+        from .platsweb.errors import PlatsWebParseError
+
         try:
             dist = platsweb_build_dir(path, out_dir=None, dev=False)
             print(f"Wrote: {dist / 'index.html'}")
@@ -299,12 +322,199 @@ def cmd_build(path: Path, out: Path) -> int:
             return 1
 
     plats_src = _read_plats(path)
-    py_src = compile_plats(plats_src)
+    if jobs is not None and optimize < 2:  # one large file, compiled in chunks
+        from .parallel import compile_plats_parallel
+
+        py_src = compile_plats_parallel(plats_src, optimize=optimize, filename=str(path), jobs=jobs)
+    else:
+        from .compiler import compile_plats
+
+        py_src = compile_plats(plats_src, optimize=optimize)
     out.write_text(py_src, encoding="utf-8")
     print(f"Wrote: {out}")
     return 0
 
 
+def cmd_build_tree(src_dir: Path, out_dir: Path, jobs: int | None = None, optimize: int = 0) -> int:
+    from .build import build_tree
+
+    result = build_tree(src_dir, out_dir, jobs=jobs, optimize=optimize)
+    for target in result.compiled:
+        print(f"Wrote: {target}")
+    for target in result.removed:
+        print(f"Removed: {target}")
+    for error in result.errors:
+        print(error, file=sys.stderr)
+    print(
+        f"{len(result.compiled)} written, {len(result.unchanged)} unchanged, "
+        f"{len(result.skipped)} up to date, {len(result.removed)} removed, {len(result.errors)} failed"
+    )
+    return 0 if result.ok else 1
+
+
+def cmd_bundle(
+    path: Path, out: Path, modules: list[Path] | None = None, optimize: int = 0, interpreter: str | None = None
+) -> int:
+    from .bundle import bundle
+    from .errors import PlatsSyntaxError
+
+    try:
+        bundle(path, out, modules=modules or (), optimize=optimize, interpreter=interpreter)
+    except PlatsSyntaxError as e:
+        print(f"{path}:{e.line}: error: {e.message}", file=sys.stderr)
+        return 1
+    print(f"Wrote: {out}")
+    return 0
+
+
+def cmd_profile(path: Path, optimize: int = 0, top: int = 10, sort: str = "self", backend: str | None = None) -> int:
+    from .profiler import profile_plats
+
+    report = None
+    try:
+        report = profile_plats(_read_plats(path), str(path), optimize=optimize, backend=backend)
+    except BaseException as e:
+        report = getattr(e, "profile_report", None)  # the program failed: still show where time went
+        raise
+    finally:
+        if report is not None:
+            sys.stdout.flush()
+            print(report.format(top=top, sort=sort), file=sys.stderr)
+    return 0
+
+
+def cmd_memprof(path: Path, optimize: int = 0, top: int = 10, json_out: Path | None = None) -> int:
+    from .memprof import memprofile_plats
+
+    report = memprofile_plats(_read_plats(path), str(path), optimize=optimize)
+    sys.stdout.flush()
+    print(report.format(top=top), file=sys.stderr)
+    if json_out is not None:
+        json_out.write_text(report.to_json(), encoding="utf-8")
+        print(f"Wrote: {json_out}", file=sys.stderr)
+    return 0
+
+
+def cmd_bench(
+    sizes: str = "1k,10k",
+    cases: str | None = None,
+    repeat: int = 3,
+    json_out: str | None = None,
+    baseline: Path | None = None,
+    save_baseline: Path | None = None,
+    threshold: float = 0.15,
+) -> int:
+    import json
+
+    from . import bench
+
+    size_list = [s.strip() for s in sizes.split(",") if s.strip()]
+    case_list = [c.strip() for c in cases.split(",") if c.strip()] if cases else None
+    try:
+        for size in size_list:
+            bench.parse_size(size)
+        previous = json.loads(baseline.read_text(encoding="utf-8")) if baseline is not None else None
+    except (ValueError, OSError) as e:
+        print(f"plats bench: {e}", file=sys.stderr)
+        return 2
+    unknown = sorted(set(case_list or ()) - set(bench.CASES))
+    if unknown:
+        print(f"plats bench: unknown case(s): {', '.join(unknown)} (known: {', '.join(bench.CASES)})", file=sys.stderr)
+        return 2
+
+    table = sys.stderr if json_out == "-" else sys.stdout
+    print(f"{'case':<18} {'size':>6} {'seconds':>9} {'lines/sec':>12}", file=table)
+
+    def progress(r: bench.Result) -> None:
+        print(f"{r.case:<18} {r.size:>6} {r.seconds:>9.4f} {r.lines_per_sec:>12,.0f}", file=table, flush=True)
+
+    results = bench.run_suite(size_list, case_list, repeat=repeat, progress=progress)
+    doc = bench.to_json(results, repeat=repeat)
+    text = json.dumps(doc, indent=2) + "\n"
+    if json_out == "-":
+        sys.stdout.write(text)
+    elif json_out:
+        Path(json_out).write_text(text, encoding="utf-8")
+        print(f"Wrote: {json_out}", file=table)
+    if save_baseline is not None:
+        save_baseline.write_text(text, encoding="utf-8")
+        print(f"Wrote baseline: {save_baseline}", file=table)
+    if previous is None:
+        return 0
+
+    try:
+        comparisons = bench.compare(doc, previous, threshold)
+    except ValueError as e:
+        print(f"plats bench: {e}", file=sys.stderr)
+        return 2
+    only_now, only_before = bench.unmatched(doc, previous)
+    for key in only_now:
+        print(f"plats bench: warning: {key} is not in the baseline", file=sys.stderr)
+    for key in only_before:
+        print(f"plats bench: warning: {key} is in the baseline but was not run", file=sys.stderr)
+    if not comparisons:
+        print(f"plats bench: no case in common with the baseline {baseline}", file=sys.stderr)
+        return 2
+    print(f"\n{'vs. baseline':<25} {'before':>9} {'now':>9} {'change':>8}", file=table)
+    for c in comparisons:
+        flag = "  REGRESSION" if c.regressed else ""
+        print(f"{c.key:<25} {c.baseline_seconds:>9.4f} {c.seconds:>9.4f} {c.change:>+8.1%}{flag}", file=table)
+    regressions = [c for c in comparisons if c.regressed]
+    if regressions:
+        print(
+            f"plats bench: {len(regressions)} case(s) slower than the baseline by more than {threshold:.0%}",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+def cmd_daemon(
+    action: str, socket_path: str | None = None, foreground: bool = False, idle_timeout: float | None = None
+) -> int:
+    from . import daemon
+
+    try:
+        if action == "start" and foreground:
+            daemon.serve(socket_path, idle_timeout=idle_timeout)
+            return 0
+        if action == "start":
+            print(f"plats daemon running (pid {daemon.start(socket_path, idle_timeout=idle_timeout)})")
+            return 0
+    except RuntimeError as e:
+        print(f"plats daemon: {e}", file=sys.stderr)
+        return 1
+    if action == "stop":
+        if not daemon.stop(socket_path):
+            print("plats daemon is not running", file=sys.stderr)
+            return 1
+        print("plats daemon stopped")
+        return 0
+    status = daemon.status(socket_path)
+    if status is None:
+        print("plats daemon is not running")
+        return 1
+    print(f"plats daemon running (pid {status['pid']}, vlaamscodex {status['version']}, {status['jobs']} jobs)")
+    return 0
+
+
+def cmd_lsp() -> int:
+    from .lsp import serve
+
+    return serve(sys.stdin.buffer, sys.stdout.buffer)
+
+
+def cmd_serve(host: str, port: int, workers: int | None, run: bool = True) -> int:
+    from .service import serve
+
+    try:
+        serve(host, port, run_workers=0 if not run else workers)
+    except (OSError, RuntimeError) as e:
+        print(f"plats serve: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
 def cmd_dev(path: Path, host: str | None = None, port: int | None = None) -> int:
     if not path.is_dir():
         print("dev expects a directory (example: plats dev examples/hello-web)", file=sys.stderr)
@@ -317,6 +527,9 @@ def cmd_dev(path: Path, host: str | None = None, port: int | None = None) -> int
     if host is None:
         # If we're on a platform that exposes a PORT env var, default bind-all so it works externally.
         host = "0.0.0.0" if env_port else "127.0.0.1"
+    from .platsweb.builder import dev_dir as platsweb_dev_dir
+    from .platsweb.errors import PlatsWebParseError
+
     try:
         return platsweb_dev_dir(path, host=host, port=port, allow_port_fallback=allow_port_fallback)
     except PlatsWebParseError as e:
@@ -334,9 +547,11 @@ def cmd_dev(path: Path, host: str | None = None, port: int | None = None) -> int
         raise
 
 
-def cmd_show_python(path: Path) -> int:
+def cmd_show_python(path: Path, use_cache: bool = True, optimize: int = 0) -> int:
+    from .cache import load_python
+
     plats_src = _read_plats(path)
-    py_src = compile_plats(plats_src)
+    py_src = load_python(plats_src, source_path=path, use_cache=use_cache, optimize=optimize)
     print(py_src)
     return 0
 
@@ -351,10 +566,23 @@ that uses Flemish dialect keywords and compiles to Python.
 
 COMMANDS (English):
   plats run <file.plats>                Run a Platskript program
+  plats run <file.plats> --sandbox      Run with CPU/memory/output limits and restricted builtins
+  plats run <file.plats> --watch        Keep running; hot-reload changed funksies on every save
   plats build <file.plats> [--out <file>]  Compile to Python source file (default: <file>.py)
   plats build <dir>                     Build PlatsWeb (dist/index.html + app.js + app.css)
+  plats build <dir> --out <dir> [-j N]  Compile a whole tree incrementally, in parallel
+  plats build <file.plats> -j N         Compile one large file in chunks on N cores
+  plats bundle <file.plats> [-o app.pyz]  Zipapp with precompiled code (runs without vlaamscodex)
+  plats profile <file.plats> [--top N]  Run with the profiler; hot funksies and lines on stderr
+  plats memprof <file.plats> [--json F] Memory at peak / at end per .plats line (tracemalloc)
+  plats bench [--baseline F]            Benchmark suite; JSON output, fails on regressions
   plats show-python <file.plats>        Display generated Python code
+    (run/build/show-python: -O1 = constant folding, plakt fusion, dead code removal;
+     -O2 = -O1 + plan variables as fast locals)
   plats dev <dir>                       PlatsWeb dev server (watch + live reload)
+  plats lsp                             Language server over stdio (diagnostics while typing)
+  plats serve [--port 8765] [--workers N]  HTTP API: /compile /run /check /transform (+ /batch)
+  plats daemon start|stop|status        Pre-warmed server; `platsc <args>` runs `plats <args>` on it
   plats vraag "<vraag>" --dialect <id>  Vraag iets (antwoord in dialect packs)
   plats dialecten                       List dialect packs
   plats help                            Show this help message
@@ -436,16 +664,22 @@ def cmd_version() -> int:
 
 def cmd_repl(dialect: str = "default") -> int:
     """Start the interactive REPL."""
+    from .repl import run_repl
+
     return run_repl(dialect=dialect)
 
 
 def cmd_fortune(dialect: str | None = None) -> int:
     """Show a random Flemish fortune/proverb."""
+    from .fortune import print_fortune
+
     return print_fortune(dialect=dialect)
 
 
 def cmd_init(name: str | None = None, dialect: str = "default") -> int:
     """Initialize a new Platskript project."""
+    from .init import create_project, print_init_help
+
     if name is None:
         return print_init_help()
     return create_project(name, dialect=dialect)
@@ -453,6 +687,8 @@ def cmd_init(name: str | None = None, dialect: str = "default") -> int:
 
 def cmd_check(path: Path | None = None, dialect: str = "default") -> int:
     """Check Platskript syntax with Flemish error messages."""
+    from .checker import check_file, print_checker_help
+
     if path is None:
         return print_checker_help()
     success, message = check_file(path, dialect=dialect)
@@ -464,13 +700,16 @@ def cmd_examples(
     show: str | None = None,
     run: str | None = None,
     save: str | None = None,
-    dialect: str = "default"
+    dialect: str = "default",
+    use_cache: bool = True,
 ) -> int:
     """Browse and run built-in examples."""
+    from .examples import list_examples, run_example, save_example, show_example
+
     if show:
         return show_example(show)
     if run:
-        return run_example(run)
+        return run_example(run, use_cache=use_cache)
     if save:
         return save_example(save)
     list_examples(dialect)
@@ -563,6 +802,8 @@ Mier info: https://github.com/brentishere41848/Vlaams-Codex
 
 
 def cmd_dialecten() -> int:
+    from .dialects.transformer import available_packs as available_dialect_packs
+
     packs = available_dialect_packs()
     for p in packs:
         inherits = f" <- {', '.join(p.inherits)}" if p.inherits else ""
@@ -577,6 +818,8 @@ def cmd_vraag(question: str, dialect_id: str = "vlaams/basis") -> int:
         "Dat is een goede vraag. Wat bedoel je precies?\n"
         "Als je wat extra context geeft, kan ik gerichter antwoorden."
     )
+    from .dialects.transformer import transform as transform_dialect
+
     try:
         out = transform_dialect(neutral_answer, dialect_id)
     except KeyError:
@@ -588,6 +831,18 @@ def cmd_vraag(question: str, dialect_id: str = "vlaams/basis") -> int:
     return 0
 
 
+def _add_optimize_flag(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "-O",
+        dest="optimize",
+        type=int,
+        choices=[0, 1, 2],
+        default=0,
+        help="Optimization level: -O0 (default), -O1 (constant folding, plakt fusion, dead code removal), "
+        "-O2 (-O1 + plan variables as fast locals)",
+    )
+
+
 def main(argv: list[str] | None = None) -> int:
     # Handle 'help' and 'version' before argparse
     if argv is None:
@@ -607,10 +862,14 @@ def main(argv: list[str] | None = None) -> int:
         if argv[0] in ("version", "-v", "--version", "-V", "versie"):
             return cmd_version()
         if argv[0] == "repl":
+            from .repl import detect_dialect
+
             # Detect dialect from original command
             dialect = detect_dialect(original_cmd)
             return cmd_repl(dialect=dialect)
         if argv[0] == "fortune":
+            from .fortune import detect_fortune_dialect
+
             # Detect dialect from original command for fortune
             dialect = detect_fortune_dialect(original_cmd)
             return cmd_fortune(dialect=dialect)
@@ -631,10 +890,72 @@ def main(argv: list[str] | None = None) -> int:
     # English commands
     p_run = sub.add_parser("run", help="Run a Platskript program", aliases=["loop"])
     p_run.add_argument("path", type=Path, help="Path to .plats file")
+    p_run.add_argument("--no-cache", action="store_true", help="Always recompile (skip the __pycache__ compile cache)")
+    p_run.add_argument(
+        "--sandbox", action="store_true", help="Run in a resource-limited worker with restricted builtins (Unix)"
+    )
+    p_run.add_argument(
+        "--watch", action="store_true", help="Keep running and hot-reload changed funksies when the file changes"
+    )
+    _add_optimize_flag(p_run)
 
     p_build = sub.add_parser("build", help="Build Python or PlatsWeb", aliases=["bouw"])
-    p_build.add_argument("path", type=Path, help="Path to .plats file OR directory for PlatsWeb")
-    p_build.add_argument("--out", type=Path, required=False, help="Output .py file (only for file builds)")
+    p_build.add_argument("path", type=Path, help="Path to .plats file OR directory (PlatsWeb, or a tree with --out)")
+    p_build.add_argument("--out", type=Path, required=False, help="Output .py file, or output directory for a tree build")
+    p_build.add_argument(
+        "-j", "--jobs", type=int, default=None, metavar="N", help="Parallel workers: per file for trees, per chunk of top-level blocks for one file"
+    )
+    _add_optimize_flag(p_build)
+
+    p_bundle = sub.add_parser("bundle", help="Bundle a program as a zipapp with precompiled code (.pyz)")
+    p_bundle.add_argument("path", type=Path, help="Path to the main .plats file")
+    p_bundle.add_argument("modules", type=Path, nargs="*", help="Extra .plats modules to bundle (importable by name)")
+    p_bundle.add_argument("-o", "--out", type=Path, default=None, help="Output archive (default: <file>.pyz)")
+    p_bundle.add_argument("-p", "--python", default=None, metavar="INTERPRETER", help="Add a #! line, like zipapp -p")
+    _add_optimize_flag(p_bundle)
+
+    p_profile = sub.add_parser("profile", help="Run a program and report hot funksies and .plats lines")
+    p_profile.add_argument("path", type=Path, help="Path to .plats file")
+    p_profile.add_argument("--top", type=int, default=10, metavar="N", help="Rows per table (default: 10)")
+    p_profile.add_argument("--sort", choices=["self", "cum"], default="self", help="Sort by self or cumulative time")
+    p_profile.add_argument(
+        "--backend", choices=["sys.monitoring", "sys.settrace"], default=None, help="Default: sys.monitoring on 3.12+"
+    )
+    _add_optimize_flag(p_profile)
+
+    p_memprof = sub.add_parser("memprof", help="Run a program and attribute memory to .plats lines")
+    p_memprof.add_argument("path", type=Path, help="Path to .plats file")
+    p_memprof.add_argument("--top", type=int, default=10, metavar="N", help="Rows per table (default: 10)")
+    p_memprof.add_argument("--json", type=Path, default=None, metavar="FILE", help="Also write a JSON report")
+    _add_optimize_flag(p_memprof)
+
+    p_bench = sub.add_parser("bench", help="Benchmark the compiler, codec, dialects, PlatsWeb and chat policy")
+    p_bench.add_argument("--sizes", default="1k,10k", help="Corpus sizes in lines: 1k,10k,100k,1m (default: 1k,10k)")
+    p_bench.add_argument("--cases", default=None, help="Comma-separated case names (default: all)")
+    p_bench.add_argument("--repeat", type=int, default=3, help="Runs per case; the best counts (default: 3)")
+    p_bench.add_argument("--json", default=None, metavar="FILE", help="Write the results as JSON ('-' for stdout)")
+    p_bench.add_argument("--baseline", type=Path, default=None, metavar="FILE", help="Compare with a saved run")
+    p_bench.add_argument("--save-baseline", type=Path, default=None, metavar="FILE", help="Save this run as baseline")
+    p_bench.add_argument(
+        "--threshold", type=float, default=0.15, help="Allowed slowdown vs. the baseline before failing (default: 0.15)"
+    )
+
+    p_daemon = sub.add_parser("daemon", help="Pre-warmed compile/run server for the `platsc` client (Unix)")
+    p_daemon.add_argument("action", choices=["start", "stop", "status"])
+    p_daemon.add_argument("--socket", default=None, metavar="PATH", help="Unix socket (default: per-user runtime dir)")
+    p_daemon.add_argument("--foreground", action="store_true", help="Serve in this process instead of detaching")
+    p_daemon.add_argument(
+        "--idle-timeout", type=float, default=None, metavar="SECONDS", help="Exit after this long without requests"
+    )
+
+    p_lsp = sub.add_parser("lsp", help="Language server (LSP over stdio) with live diagnostics")
+    p_lsp.add_argument("--stdio", action="store_true", help="Accepted for editor clients; stdio is the only transport")
+
+    p_serve = sub.add_parser("serve", help="HTTP service: /compile, /run, /check, /transform and batch variants")
+    p_serve.add_argument("--host", default="127.0.0.1", help="Host (default: 127.0.0.1)")
+    p_serve.add_argument("--port", type=int, default=8765, help="Port (default: 8765)")
+    p_serve.add_argument("--workers", type=int, default=None, help="Sandbox workers for /run (default: CPU count)")
+    p_serve.add_argument("--no-run", action="store_true", help="Disable /run (no sandbox workers)")
 
     p_dev = sub.add_parser("dev", help="PlatsWeb dev server (watch + live reload)")
     p_dev.add_argument("path", type=Path, help="Path to PlatsWeb directory (contains page.plats)")
@@ -643,6 +964,8 @@ def main(argv: list[str] | None = None) -> int:
 
     p_show = sub.add_parser("show-python", help="Display generated Python code", aliases=["toon"])
     p_show.add_argument("path", type=Path, help="Path to .plats file")
+    p_show.add_argument("--no-cache", action="store_true", help="Always recompile (skip the __pycache__ compile cache)")
+    _add_optimize_flag(p_show)
 
     # REPL command (Multi-Vlaams!)
     sub.add_parser("repl", help="Start interactive REPL (proboir/smos/efkes/klansen)")
@@ -663,6 +986,7 @@ def main(argv: list[str] | None = None) -> int:
     p_examples.add_argument("--show", metavar="NAME", help="Show example code")
     p_examples.add_argument("--run", metavar="NAME", help="Run an example")
     p_examples.add_argument("--save", metavar="NAME", help="Save example to file")
+    p_examples.add_argument("--no-cache", action="store_true", help="Always recompile (skip the compile cache)")
 
     # Dialect packs (rule-based text post-processing)
     p_vraag = sub.add_parser("vraag", help="Vraag iets (antwoord in dialect, deterministisch)")
@@ -677,31 +1001,70 @@ def main(argv: list[str] | None = None) -> int:
     args = p.parse_args(argv)
 
     if args.cmd in ("run", "loop"):
-        return cmd_run(args.path)
+        return cmd_run(
+            args.path, use_cache=not args.no_cache, optimize=args.optimize, sandbox=args.sandbox, watch=args.watch
+        )
     if args.cmd in ("build", "bouw"):
         if args.path.is_dir():
+            if args.out is not None:
+                return cmd_build_tree(args.path, args.out, jobs=args.jobs, optimize=args.optimize)
             return cmd_build(args.path, Path(""))
         out = args.out or args.path.with_suffix(".py")
-        return cmd_build(args.path, out)
+        return cmd_build(args.path, out, optimize=args.optimize, jobs=args.jobs)
+    if args.cmd == "bundle":
+        out = args.out or args.path.with_suffix(".pyz")
+        return cmd_bundle(args.path, out, args.modules, optimize=args.optimize, interpreter=args.python)
+    if args.cmd == "bench":
+        return cmd_bench(
+            args.sizes,
+            args.cases,
+            repeat=args.repeat,
+            json_out=args.json,
+            baseline=args.baseline,
+            save_baseline=args.save_baseline,
+            threshold=args.threshold,
+        )
+    if args.cmd == "profile":
+        return cmd_profile(args.path, optimize=args.optimize, top=args.top, sort=args.sort, backend=args.backend)
+    if args.cmd == "memprof":
+        return cmd_memprof(args.path, optimize=args.optimize, top=args.top, json_out=args.json)
     if args.cmd in ("show-python", "toon"):
-        return cmd_show_python(args.path)
+        return cmd_show_python(args.path, use_cache=not args.no_cache, optimize=args.optimize)
+    if args.cmd == "daemon":
+        return cmd_daemon(args.action, args.socket, foreground=args.foreground, idle_timeout=args.idle_timeout)
+    if args.cmd == "lsp":
+        return cmd_lsp()
+    if args.cmd == "serve":
+        return cmd_serve(args.host, args.port, args.workers, run=not args.no_run)
     if args.cmd == "dev":
         return cmd_dev(args.path, host=args.host, port=args.port)
     if args.cmd == "repl":
+        from .repl import detect_dialect
+
         dialect = detect_dialect(original_cmd)
         return cmd_repl(dialect=dialect)
     if args.cmd == "fortune":
+        from .fortune import detect_fortune_dialect
+
         dialect = detect_fortune_dialect(original_cmd)
         return cmd_fortune(dialect=dialect)
     if args.cmd == "init":
+        from .init import detect_init_dialect
+
         dialect = detect_init_dialect(original_cmd)
         return cmd_init(name=args.name, dialect=dialect)
     if args.cmd == "check":
+        from .checker import detect_checker_dialect
+
         dialect = detect_checker_dialect(original_cmd)
         return cmd_check(path=args.path, dialect=dialect)
     if args.cmd == "examples":
+        from .examples import detect_examples_dialect
+
         dialect = detect_examples_dialect(original_cmd)
-        return cmd_examples(show=args.show, run=args.run, save=args.save, dialect=dialect)
+        return cmd_examples(
+            show=args.show, run=args.run, save=args.save, dialect=dialect, use_cache=not args.no_cache
+        )
     if args.cmd == "dialecten":
         return cmd_dialecten()
     if args.cmd == "vraag":
@@ -0,0 +1,139 @@
+"""`platsc`: thin client for `plats daemon`.
+
+    platsc run script.plats        # same arguments as `plats`
+
+Sends the arguments, working directory and environment to the daemon together with this
+process's stdin/stdout/stderr file descriptors, then waits for the exit status. When no
+daemon is listening (or the platform has no Unix sockets) the command runs in-process
+through `vlaamscodex.cli.main`, so `platsc` can always stand in for `plats`.
+
+The socket's directory must belong to this user and be closed to everyone else
+(`socket_dir_problem()`); otherwise `platsc` does not connect and runs in-process too.
+
+Kept to `json`, `os`, `socket`, `stat` and `sys` so the client itself starts in a few ms.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import stat
+import sys
+
+ENV_SOCKET = "VLAAMSCODEX_DAEMON_SOCKET"
+_HEAD = 4  # length prefix of every message (big-endian)
+
+
+def socket_path() -> str:
+    """`VLAAMSCODEX_DAEMON_SOCKET`, else a per-user path under `XDG_RUNTIME_DIR` or `/tmp`."""
+    env = os.getenv(ENV_SOCKET)
+    if env:
+        return env
+    base = os.getenv("XDG_RUNTIME_DIR") or "/tmp"
+    return os.path.join(base, f"vlaamscodex-{os.getuid()}", "daemon.sock")
+
+
+def socket_dir_problem(path: str) -> str | None:
+    """Why the directory holding socket `path` must not be used, or None when it is safe.
+
+    It has to be a real directory (not a symlink) owned by this user, without any group or
+    other permissions. Otherwise another local user could have created it, with a listening
+    socket in it, and would receive the client's environment and stdio descriptors.
+    """
+    directory = os.path.dirname(path) or "."
+    try:
+        st = os.lstat(directory)
+    except OSError as e:
+        return f"cannot stat {directory}: {e.strerror}"
+    if not stat.S_ISDIR(st.st_mode):
+        return f"{directory} is not a directory"
+    if st.st_uid != os.getuid():
+        return f"{directory} is owned by uid {st.st_uid}, not by this user ({os.getuid()})"
+    if st.st_mode & 0o077:
+        return f"{directory} is accessible to other users (mode {stat.S_IMODE(st.st_mode):o}, expected 700)"
+    return None
+
+
+def daemon_supported() -> bool:
+    return hasattr(socket, "AF_UNIX") and hasattr(socket, "send_fds")
+
+
+def _send(sock: socket.socket, message: dict, fds: tuple[int, ...] = ()) -> None:
+    body = json.dumps(message).encode("utf-8")
+    data = len(body).to_bytes(_HEAD, "big") + body
+    if fds:  # the descriptors ride along with the first bytes
+        data = data[socket.send_fds(sock, [data], list(fds)) :]
+    sock.sendall(data)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("connection closed mid-message")
+        data += chunk
+    return data
+
+
+def _recv(sock: socket.socket, maxfds: int = 0) -> tuple[dict, list[int]]:
+    if maxfds:
+        head, fds, _flags, _addr = socket.recv_fds(sock, _HEAD, maxfds)
+    else:
+        head, fds = sock.recv(_HEAD), []
+    if not head:
+        raise ConnectionError("connection closed")
+    head += _recv_exact(sock, _HEAD - len(head))
+    return json.loads(_recv_exact(sock, int.from_bytes(head, "big"))), fds
+
+
+def request(message: dict, path: str | None = None, fds: tuple[int, ...] = ()) -> dict | None:
+    """Send one message to the daemon and return its reply; None when no daemon listens."""
+    if not daemon_supported():
+        return None
+    path = path or socket_path()
+    if socket_dir_problem(path) is not None:
+        return None  # never talk to a socket someone else could have planted
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with sock:
+        try:
+            sock.connect(path)
+        except OSError:  # no socket file, or a stale one
+            return None
+        _send(sock, message, fds)
+        # Closing the socket (e.g. on Ctrl-C) makes the daemon stop the worker.
+        return _recv(sock)[0]
+
+
+def run(argv: list[str], path: str | None = None) -> int | None:
+    """Run `plats <argv>` on the daemon and return its exit status; None without a daemon."""
+    sys.stdout.flush()
+    sys.stderr.flush()
+    message = {
+        "op": "run",
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "env": dict(os.environ),
+        "encoding": sys.stdout.encoding,
+    }
+    try:
+        reply = request(message, path, fds=(0, 1, 2))
+    except KeyboardInterrupt:
+        return 130
+    return None if reply is None else int(reply["exit"])
+
+
+def main(argv: list[str] | None = None) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+    code = run(argv)
+    if code is None:
+        from .cli import main as plats_main
+
+        return plats_main(argv)
+    return code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -9,32 +9,153 @@ because Python will use this codec to decode the file and will receive
 valid Python source back.
 
 See docs/02_how_python_runs_it.md for the full explanation.
+
+Decoding is incremental: sources up to `STREAM_THRESHOLD` bytes are buffered and go
+through the on-disk compile cache; larger (typically generated) files are compiled line
+by line with `compiler.compile_plats_iter` machinery, so memory stays bounded by the
+largest open block instead of the file size.
 """
 
 from __future__ import annotations
 
 import codecs
-import io
+from collections import deque
 from typing import Optional
 
+# Larger inputs bypass the (whole-text) compile cache and are compiled as they stream in.
+STREAM_THRESHOLD = 1 << 20
+# Bytes read from the underlying stream per `StreamReader` refill.
+_READ_CHUNK = 1 << 16
+_HEADER = "# coding: utf-8\n"
 
-def _compile_plats_bytes(b: bytes, errors: str) -> tuple[str, int]:
-    from .compiler import compile_plats
 
-    utf8 = codecs.lookup("utf-8")
+def _is_cookie(line: str) -> bool:
+    return line.lstrip().startswith("#") and "coding" in line
 
-    # Decode original bytes as UTF-8 text (Plats source).
-    text, _ = utf8.decode(b, errors)
 
-    # Remove first-line coding cookie so the Plats compiler doesn't see it.
+def _compile_plats_text(text: str) -> str:
+    from .cache import load_python
+
+    # Blank the first-line coding cookie so the Plats compiler doesn't see it (but keep
+    # the line, so error line numbers match the file).
     lines = text.splitlines()
-    if lines and lines[0].lstrip().startswith("#") and "coding" in lines[0]:
-        lines = lines[1:]
+    if lines and _is_cookie(lines[0]):
+        lines[0] = ""
     plats_src = "\n".join(lines)
 
-    # Compile to Python source text.
-    py_src = "# coding: utf-8\n" + compile_plats(plats_src)
-    return py_src, len(b)
+    # Compile to Python source text (served from the on-disk cache when unchanged).
+    return _HEADER + load_python(plats_src)
+
+
+def _compile_plats_bytes(b: bytes, errors: str) -> tuple[str, int]:
+    # Decode original bytes as UTF-8 text (Plats source).
+    text, _ = codecs.lookup("utf-8").decode(b, errors)
+    return _compile_plats_text(text), len(b)
+
+
+class _PlatsIncrementalDecoder(codecs.IncrementalDecoder):
+    """Plats bytes in, Python text out; only ever returns complete Python lines."""
+
+    def __init__(self, errors: str = "strict") -> None:
+        super().__init__(errors)
+        self.reset()
+
+    def reset(self) -> None:
+        self._utf8 = codecs.getincrementaldecoder("utf-8")(self.errors)
+        self._partial = ""  # trailing Plats text without its newline yet
+        self._held: list[str] = []  # complete Plats lines, while still below the threshold
+        self._held_size = 0
+        self._stream = None  # compiler._StreamCompiler once past the threshold
+        self._done = False
+
+    def decode(self, input: bytes, final: bool = False) -> str:  # type: ignore[override]
+        if self._done:
+            return ""
+        lines = (self._partial + self._utf8.decode(input, final)).splitlines(keepends=True)
+        self._partial = ""
+        # A trailing "\r" may be the first half of a "\r\n" split across chunks.
+        if lines and not final and not lines[-1].endswith("\n"):
+            self._partial = lines.pop()
+
+        out: list[str] = []
+        if self._stream is None:
+            self._held.extend(lines)
+            self._held_size += len(input)
+            if final:
+                self._done = True
+                return _compile_plats_text("".join(self._held)) if self._held else ""
+            if self._held_size <= STREAM_THRESHOLD:
+                return ""
+            from .compiler import _StreamCompiler
+
+            self._stream = _StreamCompiler()
+            out.append(_HEADER)
+            lines, self._held = self._held, []
+
+        for line in lines:
+            out.extend(self._stream.feed(line))
+        if final:
+            out.extend(self._stream.close())
+            self._done = True
+        return "".join(out)
+
+
+class _PlatsStreamReader(codecs.StreamReader):
+    """Reads Python text from a stream of Plats bytes, `_READ_CHUNK` bytes at a time."""
+
+    def __init__(self, stream, errors: str = "strict") -> None:
+        super().__init__(stream, errors)
+        self._decoder = _PlatsIncrementalDecoder(errors)
+        self._lines: deque[str] = deque()
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Decode one more chunk; False once the stream is exhausted."""
+        if self._eof:
+            return False
+        data = self.stream.read(_READ_CHUNK)
+        self._eof = not data
+        self._lines.extend(self._decoder.decode(data, final=self._eof).splitlines(keepends=True))
+        return True
+
+    def read(self, size: int = -1, chars: int = -1, firstline: bool = False):  # type: ignore[override]
+        want = chars if chars is not None and chars >= 0 else size
+        if want is None or want < 0:
+            while self._fill():
+                pass
+            out = "".join(self._lines)
+            self._lines.clear()
+            return out
+        parts: list[str] = []
+        while want > 0 and (self._lines or self._fill()):
+            if not self._lines:
+                continue
+            line = self._lines.popleft()
+            if len(line) > want:
+                self._lines.appendleft(line[want:])
+                line = line[:want]
+            parts.append(line)
+            want -= len(line)
+        return "".join(parts)
+
+    def readline(self, size: int | None = None, keepends: bool = True):  # type: ignore[override]
+        while not self._lines and self._fill():
+            pass
+        if not self._lines:
+            return ""
+        line = self._lines.popleft()
+        if size is not None and 0 <= size < len(line):
+            self._lines.appendleft(line[size:])
+            line = line[:size]
+        if not keepends:
+            line = line.rstrip("\r\n")
+        return line
+
+    def reset(self) -> None:
+        super().reset()
+        self._decoder.reset()
+        self._lines.clear()
+        self._eof = False
 
 
 def _search(encoding_name: str) -> Optional[codecs.CodecInfo]:
@@ -53,52 +174,11 @@ def _search(encoding_name: str) -> Optional[codecs.CodecInfo]:
                 return "", 0
             return _compile_plats_bytes(b, errors)
 
-    class IncrementalDecoder(codecs.IncrementalDecoder):
-        def __init__(self, errors: str = "strict"):
-            super().__init__(errors)
-            self._buffer = bytearray()
-            self._done = False
-
-        def decode(self, input: bytes, final: bool = False) -> str:  # type: ignore[override]
-            if input:
-                self._buffer.extend(input)
-            if not final:
-                return ""
-            if self._done or not self._buffer:
-                return ""
-            out, _ = _compile_plats_bytes(bytes(self._buffer), self.errors)
-            self._buffer.clear()
-            self._done = True
-            return out
+    class IncrementalDecoder(_PlatsIncrementalDecoder):
+        pass
 
-        def reset(self) -> None:  # noqa: D401 - match codecs API
-            self._buffer.clear()
-            self._done = False
-
-    class StreamReader(codecs.StreamReader):
-        def __init__(self, stream, errors: str = "strict"):
-            super().__init__(stream, errors)
-            self._compiled: io.StringIO | None = None
-
-        def _ensure_compiled(self) -> io.StringIO:
-            if self._compiled is None:
-                raw = self.stream.read()
-                py_src, _ = _compile_plats_bytes(raw, self.errors)
-                self._compiled = io.StringIO(py_src)
-            return self._compiled
-
-        def read(self, size: int = -1, chars: int = -1, firstline: bool = False):  # type: ignore[override]
-            sio = self._ensure_compiled()
-            if size is None or size < 0:
-                return sio.read()
-            return sio.read(size)
-
-        def readline(self, size: int | None = None, keepends: bool = True):  # type: ignore[override]
-            sio = self._ensure_compiled()
-            line = sio.readline(-1 if size is None else size)
-            if not keepends and line:
-                line = line.splitlines(keepends=False)[0]
-            return line
+    class StreamReader(_PlatsStreamReader):
+        pass
 
     class StreamWriter(Codec, codecs.StreamWriter):
         pass
@@ -1,209 +1,784 @@
-"""Platskript -> Python compiler (toy).
+"""Platskript -> Python compiler.
 
 Supported constructs (v0.1):
 - program: `plan doe ... gedaan`
 - statement terminator: `amen`
 - assignment: `zet <name> op <expr> amen`
 - print: `klap <expr> amen`
-- function def: `maak funksie <name> met <params...> doe ... gedaan`
+- function def: `maak funksie <name> [met <params...>] doe ... gedaan`
+- memoized function: `maak onthoud [<size>] funksie <name> ...` (`functools.lru_cache`)
 - function call: `roep <name> [met <args...>] amen`
 - return: `geeftterug <expr> amen`
-
-Expressions (toy):
+- if/else: `als <expr> [dan] doe ... [anders doe ...] gedaan`
+- while loop: `zolang <expr> doe ... gedaan`
+- range loop: `voor <name> van <expr> tot <expr> [stap <expr>] doe ... gedaan`
+- iteration: `voor elk <name> uit <expr> doe ... gedaan` (`for <name> in <expr>`)
+- generator: `lever <expr> amen` (`yield`) makes the enclosing funksie lazy
+- break: `stop amen`
+- comments: `# ...` to end of line
+
+Expressions:
 - `tekst <words...>` -> string literal
 - `getal <digits>` -> number literal
 - `da <name>` -> variable reference
 - `spatie` -> " "
 - operators: `plakt` (+) and a handful of arithmetic/boolean comparisons in OP_MAP
-
-This compiler is written to be easy to read, not to be fully correct.
-For a real language, write a real parser and an AST.
+- `reeks met <a> en <b> ...` / `reeks van <expr> tot <expr> [stap <expr>]` -> numeric
+  sequence; `derbij`/`deraf`/`keer`/`gedeeld` on it work per element (`_REEKS_PRELUDE`)
+- `som|minimum|maximum|gemiddelde|lengte van <expr>` -> reduction
+
+Pipeline: `parser` builds a `nodes.Module`, `optimizer` optionally rewrites it
+(`optimize>=1`), and it is lowered here to a Python `ast.Module`. At `optimize=2` the
+`plan` body is wrapped in a generated function (`__plats_main__`) so its variables are
+fast locals instead of module globals (see `_Lowering._fast_plan`). Generated nodes
+carry the `.plats` line numbers, so code objects built with `compile_plats_code()`
+report Platskript lines in tracebacks. `compile_plats()` renders the same tree back to
+Python source text (for `plats build`, `show-python` and the source codec).
 """
 
 from __future__ import annotations
 
-import re
-
-OP_MAP = {
-    "plakt": "+",
-    "derbij": "+",
-    "deraf": "-",
-    "keer": "*",
-    "gedeeld": "/",
-    "isgelijk": "==",
-    "isniegelijk": "!=",
-    "isgroterdan": ">",
-    "iskleinerdan": "<",
-    "enook": "and",
-    "ofwel": "or",
-    "nie": "not",
+import ast
+import copy
+import gc
+import hashlib
+import os
+from contextlib import contextmanager
+from types import CodeType
+from typing import Iterable, Iterator
+
+from . import __version__
+from . import nodes as n
+from .errors import PlatsSyntaxError
+from .memo import CacheStats, LRUCache
+from .optimizer import optimize as _optimize
+from .parser import OP_MAP, Parser, parse_plats, tokenize_line
+
+__all__ = [
+    "COMPILER_VERSION",
+    "MAIN_FUNCTION",
+    "OP_MAP",
+    "PlatsSyntaxError",
+    "clear_compile_cache",
+    "compile_cache_stats",
+    "compile_plats",
+    "compile_plats_ast",
+    "compile_plats_code",
+    "compile_plats_iter",
+    "compile_plats_with_map",
+    "lower",
+    "render_python",
+    "set_compile_cache_size",
+]
+
+# Part of every cache key: bump the suffix whenever the generated code changes.
+COMPILER_VERSION = f"{__version__}+codegen.2"
+
+_BIN_OPS: dict[str, type[ast.operator]] = {
+    "plakt": ast.Add,
+    "derbij": ast.Add,
+    "deraf": ast.Sub,
+    "keer": ast.Mult,
+    "gedeeld": ast.Div,
+}
+_BOOL_OPS: dict[str, type[ast.boolop]] = {"enook": ast.And, "ofwel": ast.Or}
+_CMP_OPS: dict[str, type[ast.cmpop]] = {
+    "isgelijk": ast.Eq,
+    "isniegelijk": ast.NotEq,
+    "isgroterdan": ast.Gt,
+    "iskleinerdan": ast.Lt,
 }
 
-_EXPR_STOP = {"dan", "doe", "amen"}
+_LOAD = ast.Load()
+_STORE = ast.Store()
+
+# Reductions that are plain builtins; `gemiddelde` is a method of the reeks class.
+_REDUCE_BUILTINS = {"som": "sum", "minimum": "min", "maximum": "max", "lengte": "len"}
+
+# The reeks type. It is emitted once into every module that uses it, before the first use
+# (like the `lru_cache` import), so generated code keeps running on the standard library
+# alone. Element-wise arithmetic maps an `operator` function over both arrays, or over
+# the array and a repeated scalar. The loop runs in C and fills the result array in one
+# pass, with no Python-level call per element.
+REEKS_CLASS = "__plats_reeks__"
+_REEKS_PRELUDE = """
+from array import array as __plats_array__
+class __plats_reeks__(__plats_array__):
+    'Platskript reeks: doubles in an array.array; derbij/deraf/keer/gedeeld work per element.'
+    __slots__ = ()
+    from itertools import repeat as _repeat
+    from operator import add as _add, sub as _sub, mul as _mul, truediv as _div
+    def __new__(cls, values=()):
+        return super().__new__(cls, 'd', values)
+    def _map(self, op, other, reflected):
+        if isinstance(other, __plats_array__):
+            if len(other) != len(self):
+                raise ValueError(f'reeksen van verschillende lengte: {len(self)} en {len(other)}')
+        else:
+            other = self._repeat(other, len(self))
+        return __plats_reeks__(map(op, other, self) if reflected else map(op, self, other))
+    def __add__(self, other):
+        return self._map(self._add, other, False)
+    def __radd__(self, other):
+        return self._map(self._add, other, True)
+    def __sub__(self, other):
+        return self._map(self._sub, other, False)
+    def __rsub__(self, other):
+        return self._map(self._sub, other, True)
+    def __mul__(self, other):
+        return self._map(self._mul, other, False)
+    def __rmul__(self, other):
+        return self._map(self._mul, other, True)
+    def __truediv__(self, other):
+        return self._map(self._div, other, False)
+    def __rtruediv__(self, other):
+        return self._map(self._div, other, True)
+    def __repr__(self):
+        return f'reeks({self.tolist()})'
+    @staticmethod
+    def gemiddelde(values):
+        if isinstance(values, __plats_array__):
+            count = len(values)
+            total = sum(values)
+        else:
+            total = count = 0
+            for count, value in enumerate(values, 1):
+                total += value
+        if not count:
+            raise ValueError('gemiddelde van een lege reeks')
+        return total / count
+"""
+_REEKS_AST: list[ast.stmt] = []
 
 
-def _split_args(tokens: list[str]) -> list[list[str]]:
-    """Split arguments separated by the token `en`."""
-    args: list[list[str]] = []
-    cur: list[str] = []
-    for t in tokens:
-        if t == "en":
-            if cur:
-                args.append(cur)
-                cur = []
-        else:
-            cur.append(t)
-    if cur:
-        args.append(cur)
-    return args
-
-
-def _parse_expr(tokens: list[str]) -> str:
-    """Parse a minimal expression into a Python expression string."""
-    parts: list[str] = []
-    i = 0
-    while i < len(tokens):
-        t = tokens[i]
-        if t in _EXPR_STOP:
-            break
-
-        if t == "spatie":
-            parts.append(repr(" "))
-            i += 1
-            continue
+def _reeks_prelude() -> list[ast.stmt]:
+    """The reeks class definition (and its import), every node on line 0.
 
-        if t == "tekst":
-            i += 1
-            words: list[str] = []
-            while (
-                i < len(tokens)
-                and tokens[i] not in OP_MAP
-                and tokens[i] not in _EXPR_STOP
-                and tokens[i] != "en"
-            ):
-                words.append(tokens[i])
-                i += 1
-            parts.append(repr(" ".join(words)))
-            continue
+    Line 0 marks it as generated, not user code: tracebacks, `plats profile` and `plats
+    memprof` charge its work to the `.plats` line that called it.
+    """
+    if not _REEKS_AST:
+        for stmt in ast.parse(_REEKS_PRELUDE).body:
+            for node in ast.walk(stmt):
+                if "lineno" in node._attributes:
+                    node.lineno = node.end_lineno = 0
+                    node.col_offset = node.end_col_offset = 0
+            _REEKS_AST.append(stmt)
+    return copy.deepcopy(_REEKS_AST)
 
-        if t == "getal":
-            i += 1
-            if i >= len(tokens):
-                raise ValueError("getal without value")
-            num = tokens[i]
-            i += 1
-            if not re.fullmatch(r"-?\d+(\.\d+)?", num):
-                raise ValueError(f"invalid number literal: {num}")
-            parts.append(num)
-            continue
 
-        if t == "da":
-            i += 1
-            if i >= len(tokens):
-                raise ValueError("da without identifier")
-            parts.append(tokens[i])
-            i += 1
-            continue
+# --- lowering: nodes.Module -> ast.Module ------------------------------------
+
+
+# Name of the function wrapping a `plan` body in fast-locals mode.
+MAIN_FUNCTION = "__plats_main__"
 
-        if t in OP_MAP:
-            parts.append(OP_MAP[t])
-            i += 1
+
+def _scope_names(stmts: list[n.Stmt], out: set[str]) -> set[str]:
+    """Names bound directly in a block (assignments, loop variables, funksie names), not inside funksies."""
+    for stmt in stmts:
+        if isinstance(stmt, n.FunctionDef):
+            out.add(stmt.name)
             continue
+        if isinstance(stmt, n.Assign):
+            out.add(stmt.target)
+        elif isinstance(stmt, (n.For, n.ForEach)):
+            out.add(stmt.target)
+        if isinstance(stmt, (n.Plan, n.If, n.While, n.For, n.ForEach)):
+            _scope_names(stmt.body, out)
+        if isinstance(stmt, n.If):
+            _scope_names(stmt.orelse, out)
+    return out
+
+
+def _referenced_names(nodes: list[n.Stmt]) -> set[str]:
+    out: set[str] = set()
+    for stmt in nodes:
+        for node in n.walk(stmt):
+            if isinstance(node, n.Name):
+                out.add(node.id)
+            elif isinstance(node, n.Call):
+                out.add(node.func)
+            elif isinstance(node, (n.Assign, n.For, n.ForEach)):
+                out.add(node.target)
+            elif isinstance(node, n.FunctionDef):
+                out.add(node.name)
+    return out
+
+
+class _Lowering:
+    """Translate the Platskript tree into Python AST nodes, statement by statement."""
+
+    def __init__(self, fast_locals: bool = False) -> None:
+        self._fast_locals = fast_locals
+        self._module_body: list[n.Stmt] = []
+        self._uses_lru_cache = False
+        self._uses_reeks = False
+        self._stmt_handlers = {
+            n.Plan: self._plan,
+            n.FunctionDef: self._function_def,
+            n.Print: self._print,
+            n.Assign: self._assign,
+            n.ExprStmt: self._expr_stmt,
+            n.Return: self._return,
+            n.If: self._if,
+            n.While: self._while,
+            n.For: self._for,
+            n.ForEach: self._for_each,
+            n.Yield: self._yield,
+            n.Break: self._break,
+            n.Rebind: self._rebind,
+            n.Continue: self._continue,
+        }
+        self._expr_handlers = {
+            n.Str: self._constant,
+            n.Num: self._constant,
+            n.Const: self._constant,
+            n.Name: self._name,
+            n.BinOp: self._binop,
+            n.Compare: self._compare,
+            n.UnaryOp: self._unaryop,
+            n.Call: self._call,
+            n.Seq: self._seq,
+            n.SeqRange: self._seq_range,
+            n.Reduce: self._reduce,
+        }
+
+    def module(self, mod: n.Module) -> ast.Module:
+        self._module_body = mod.body
+        return ast.Module(body=self.toplevel(mod.body), type_ignores=[])
+
+    def toplevel(self, stmts: list[n.Stmt]) -> list[ast.stmt]:
+        """Lower module-level statements; may be called repeatedly (streaming)."""
+        out: list[ast.stmt] = []
+        for stmt in stmts:
+            if isinstance(stmt, n.Plan) and not self._fast_locals:
+                # Module statements too: imports and the reeks class go right before their first
+                # user, as they do when `parallel` compiles the plan body in pieces.
+                out.extend(self.toplevel(stmt.body))
+                continue
+            had_lru_cache = self._uses_lru_cache
+            had_reeks = self._uses_reeks
+            lowered: list[ast.stmt] = []
+            self._stmt_handlers[type(stmt)](stmt, lowered)
+            if self._uses_lru_cache and not had_lru_cache:
+                # Plain stdlib import, so `plats build` output runs without vlaamscodex installed.
+                line = stmt.line
+                alias = ast.alias(name="lru_cache", asname=None, lineno=line, col_offset=0)
+                out.append(ast.ImportFrom(module="functools", names=[alias], level=0, lineno=line, col_offset=0))
+            if self._uses_reeks and not had_reeks:
+                out.extend(_reeks_prelude())
+            out.extend(lowered)
+        return out
+
+    def block(self, stmts: list[n.Stmt]) -> list[ast.stmt]:
+        out: list[ast.stmt] = []
+        for stmt in stmts:
+            self._stmt_handlers[type(stmt)](stmt, out)
+        return out
+
+    def expr(self, node: n.Expr) -> ast.expr:
+        return self._expr_handlers[type(node)](node)
+
+    # statements
+
+    def _plan(self, node: n.Plan, out: list[ast.stmt]) -> None:
+        if self._fast_locals and any(stmt is node for stmt in self._module_body):
+            self._fast_plan(node, out)
+            return
+        # The program block has no scope of its own: its body runs at module level.
+        out.extend(self.block(node.body))
+
+    def _fast_plan(self, node: n.Plan, out: list[ast.stmt]) -> None:
+        """Emit the plan body as `def __plats_main__(): ...` plus a call.
+
+        Plan variables become fast locals. Names that must stay module globals get a
+        `global` declaration: funksies defined in the plan (they are the module's API
+        and may be called from anywhere) and variables the rest of the module (other
+        top-level statements, top-level funksies) refers to. Funksies nested in the plan
+        read plan variables through closure cells, which follow rebinding like globals do.
+        """
+        line = node.line
+        outside = _referenced_names([stmt for stmt in self._module_body if stmt is not node])
+        funksies = {stmt.name for stmt in node.body if isinstance(stmt, n.FunctionDef)}
+        shared = sorted(funksies | (_scope_names(node.body, set()) & outside))
+
+        body: list[ast.stmt] = []
+        if shared:
+            body.append(ast.Global(names=shared, lineno=line, col_offset=0))
+        body.extend(self.block(node.body))
+        if not body:
+            body.append(ast.Pass(lineno=line, col_offset=0))
+        out.append(
+            ast.FunctionDef(
+                name=MAIN_FUNCTION,
+                args=ast.arguments(posonlyargs=[], args=[], kwonlyargs=[], kw_defaults=[], defaults=[]),
+                body=body,
+                decorator_list=[],
+                returns=None,
+                lineno=line,
+                col_offset=0,
+            )
+        )
+        call = ast.Call(
+            func=ast.Name(id=MAIN_FUNCTION, ctx=_LOAD, lineno=line, col_offset=0),
+            args=[],
+            keywords=[],
+            lineno=line,
+            col_offset=0,
+        )
+        out.append(ast.Expr(value=call, lineno=node.end_line or line, col_offset=0))
+
+    def _function_def(self, node: n.FunctionDef, out: list[ast.stmt]) -> None:
+        line = node.line
+        args = ast.arguments(
+            posonlyargs=[],
+            args=[ast.arg(arg=p, lineno=line, col_offset=0) for p in node.params],
+            kwonlyargs=[],
+            kw_defaults=[],
+            defaults=[],
+        )
+        body = self.block(node.body) or [ast.Pass(lineno=line, col_offset=0)]
+        decorators: list[ast.expr] = []
+        if node.memo_size is not None:
+            self._uses_lru_cache = True
+            size = ast.Constant(value=node.memo_size, lineno=line, col_offset=0)
+            decorators.append(
+                ast.Call(
+                    func=ast.Name(id="lru_cache", ctx=_LOAD, lineno=line, col_offset=0),
+                    args=[],
+                    keywords=[ast.keyword(arg="maxsize", value=size, lineno=line, col_offset=0)],
+                    lineno=line,
+                    col_offset=0,
+                )
+            )
+        out.append(
+            ast.FunctionDef(
+                name=node.name,
+                args=args,
+                body=body,
+                decorator_list=decorators,
+                returns=None,
+                lineno=line,
+                col_offset=0,
+            )
+        )
+
+    def _print(self, node: n.Print, out: list[ast.stmt]) -> None:
+        line = node.line
+        call = ast.Call(
+            func=ast.Name(id="print", ctx=_LOAD, lineno=line, col_offset=0),
+            args=[self.expr(node.value)],
+            keywords=[],
+            lineno=line,
+            col_offset=0,
+        )
+        out.append(ast.Expr(value=call, lineno=line, col_offset=0))
+
+    def _assign(self, node: n.Assign, out: list[ast.stmt]) -> None:
+        line = node.line
+        target = ast.Name(id=node.target, ctx=_STORE, lineno=line, col_offset=0)
+        out.append(ast.Assign(targets=[target], value=self.expr(node.value), lineno=line, col_offset=0))
+
+    def _expr_stmt(self, node: n.ExprStmt, out: list[ast.stmt]) -> None:
+        out.append(ast.Expr(value=self.expr(node.value), lineno=node.line, col_offset=0))
+
+    def _return(self, node: n.Return, out: list[ast.stmt]) -> None:
+        out.append(ast.Return(value=self.expr(node.value), lineno=node.line, col_offset=0))
+
+    def _if(self, node: n.If, out: list[ast.stmt]) -> None:
+        line = node.line
+        out.append(
+            ast.If(
+                test=self.expr(node.test),
+                body=self.block(node.body) or [ast.Pass(lineno=line, col_offset=0)],
+                orelse=self.block(node.orelse),
+                lineno=line,
+                col_offset=0,
+            )
+        )
+
+    def _while(self, node: n.While, out: list[ast.stmt]) -> None:
+        line = node.line
+        out.append(
+            ast.While(
+                test=self.expr(node.test),
+                body=self.block(node.body) or [ast.Pass(lineno=line, col_offset=0)],
+                orelse=[],
+                lineno=line,
+                col_offset=0,
+            )
+        )
+
+    def _for(self, node: n.For, out: list[ast.stmt]) -> None:
+        line = node.line
+        bounds = [self.expr(node.start), self.expr(node.stop)]
+        if node.step is not None:
+            bounds.append(self.expr(node.step))
+        iterator = ast.Call(
+            func=ast.Name(id="range", ctx=_LOAD, lineno=line, col_offset=0),
+            args=bounds,
+            keywords=[],
+            lineno=line,
+            col_offset=0,
+        )
+        out.append(
+            ast.For(
+                target=ast.Name(id=node.target, ctx=_STORE, lineno=line, col_offset=0),
+                iter=iterator,
+                body=self.block(node.body) or [ast.Pass(lineno=line, col_offset=0)],
+                orelse=[],
+                lineno=line,
+                col_offset=0,
+            )
+        )
+
+    def _for_each(self, node: n.ForEach, out: list[ast.stmt]) -> None:
+        line = node.line
+        out.append(
+            ast.For(
+                target=ast.Name(id=node.target, ctx=_STORE, lineno=line, col_offset=0),
+                iter=self.expr(node.iter),
+                body=self.block(node.body) or [ast.Pass(lineno=line, col_offset=0)],
+                orelse=[],
+                lineno=line,
+                col_offset=0,
+            )
+        )
+
+    def _yield(self, node: n.Yield, out: list[ast.stmt]) -> None:
+        line = node.line
+        value = ast.Yield(value=self.expr(node.value), lineno=line, col_offset=0)
+        out.append(ast.Expr(value=value, lineno=line, col_offset=0))
+
+    def _break(self, node: n.Break, out: list[ast.stmt]) -> None:
+        out.append(ast.Break(lineno=node.line, col_offset=0))
+
+    def _continue(self, node: n.Continue, out: list[ast.stmt]) -> None:
+        out.append(ast.Continue(lineno=node.line, col_offset=0))
+
+    def _rebind(self, node: n.Rebind, out: list[ast.stmt]) -> None:
+        line = node.line
+        if len(node.targets) == 1:
+            target: ast.expr = ast.Name(id=node.targets[0], ctx=_STORE, lineno=line, col_offset=0)
+            value = self.expr(node.values[0])
+        else:
+            target = ast.Tuple(
+                elts=[ast.Name(id=t, ctx=_STORE, lineno=line, col_offset=0) for t in node.targets],
+                ctx=_STORE,
+                lineno=line,
+                col_offset=0,
+            )
+            value = ast.Tuple(elts=[self.expr(v) for v in node.values], ctx=_LOAD, lineno=line, col_offset=0)
+        out.append(ast.Assign(targets=[target], value=value, lineno=line, col_offset=0))
+
+    # expressions
+
+    def _constant(self, node: n.Str | n.Num | n.Const) -> ast.expr:
+        return ast.Constant(value=node.value, lineno=node.line, col_offset=0)
+
+    def _name(self, node: n.Name) -> ast.expr:
+        return ast.Name(id=node.id, ctx=_LOAD, lineno=node.line, col_offset=0)
+
+    def _binop(self, node: n.BinOp) -> ast.expr:
+        line = node.line
+        bool_op = _BOOL_OPS.get(node.op)
+        if bool_op is not None:
+            values = [self.expr(node.left), self.expr(node.right)]
+            return ast.BoolOp(op=bool_op(), values=values, lineno=line, col_offset=0)
+        return ast.BinOp(
+            left=self.expr(node.left),
+            op=_BIN_OPS[node.op](),
+            right=self.expr(node.right),
+            lineno=line,
+            col_offset=0,
+        )
+
+    def _compare(self, node: n.Compare) -> ast.expr:
+        return ast.Compare(
+            left=self.expr(node.left),
+            ops=[_CMP_OPS[op]() for op in node.ops],
+            comparators=[self.expr(c) for c in node.comparators],
+            lineno=node.line,
+            col_offset=0,
+        )
+
+    def _unaryop(self, node: n.UnaryOp) -> ast.expr:
+        return ast.UnaryOp(op=ast.Not(), operand=self.expr(node.operand), lineno=node.line, col_offset=0)
+
+    def _call(self, node: n.Call) -> ast.expr:
+        line = node.line
+        return ast.Call(
+            func=ast.Name(id=node.func, ctx=_LOAD, lineno=line, col_offset=0),
+            args=[self.expr(a) for a in node.args],
+            keywords=[],
+            lineno=line,
+            col_offset=0,
+        )
+
+    def _seq(self, node: n.Seq) -> ast.expr:
+        line = node.line
+        items = ast.List(elts=[self.expr(i) for i in node.items], ctx=_LOAD, lineno=line, col_offset=0)
+        return self._reeks_call(items, line)
+
+    def _seq_range(self, node: n.SeqRange) -> ast.expr:
+        line = node.line
+        bounds = [self.expr(node.start), self.expr(node.stop)]
+        if node.step is not None:
+            bounds.append(self.expr(node.step))
+        numbers = ast.Call(
+            func=ast.Name(id="range", ctx=_LOAD, lineno=line, col_offset=0),
+            args=bounds,
+            keywords=[],
+            lineno=line,
+            col_offset=0,
+        )
+        return self._reeks_call(numbers, line)
+
+    def _reduce(self, node: n.Reduce) -> ast.expr:
+        line = node.line
+        builtin = _REDUCE_BUILTINS.get(node.func)
+        if builtin is not None:
+            func: ast.expr = ast.Name(id=builtin, ctx=_LOAD, lineno=line, col_offset=0)
+        else:  # gemiddelde
+            self._uses_reeks = True
+            cls = ast.Name(id=REEKS_CLASS, ctx=_LOAD, lineno=line, col_offset=0)
+            func = ast.Attribute(value=cls, attr="gemiddelde", ctx=_LOAD, lineno=line, col_offset=0)
+        return ast.Call(func=func, args=[self.expr(node.value)], keywords=[], lineno=line, col_offset=0)
+
+    def _reeks_call(self, values: ast.expr, line: int) -> ast.expr:
+        self._uses_reeks = True
+        return ast.Call(
+            func=ast.Name(id=REEKS_CLASS, ctx=_LOAD, lineno=line, col_offset=0),
+            args=[values],
+            keywords=[],
+            lineno=line,
+            col_offset=0,
+        )
+
+
+def lower(mod: n.Module, *, fast_locals: bool = False) -> ast.Module:
+    """Lower a parsed Platskript module to a compilable Python `ast.Module`.
+
+    `fast_locals=True` wraps top-level `plan` bodies in a function (`optimize=2`).
+    """
+    return _Lowering(fast_locals).module(mod)
+
+
+# --- rendering: ast.Module -> Python source ----------------------------------
+
+
+def _render_block(stmts: list[ast.stmt], indent: int, out: list[str], lines: list[int] | None = None) -> None:
+    """Append rendered lines to `out`; if given, `lines` gets the `.plats` line of each one."""
+    pad = "    " * indent
+
+    def emit(text: str, lineno: int) -> None:
+        out.append(text)
+        if lines is not None:
+            lines.append(lineno)
+
+    for stmt in stmts:
+        if isinstance(stmt, ast.ClassDef):
+            emit(f"{pad}class {stmt.name}({', '.join(ast.unparse(b) for b in stmt.bases)}):", stmt.lineno)
+            _render_block(stmt.body, indent + 1, out, lines)
+        elif isinstance(stmt, ast.FunctionDef):
+            for deco in stmt.decorator_list:
+                emit(f"{pad}@{ast.unparse(deco)}", stmt.lineno)
+            emit(f"{pad}def {stmt.name}({ast.unparse(stmt.args)}):", stmt.lineno)
+            _render_block(stmt.body, indent + 1, out, lines)
+        elif isinstance(stmt, ast.If):
+            emit(f"{pad}if {ast.unparse(stmt.test)}:", stmt.lineno)
+            _render_block(stmt.body, indent + 1, out, lines)
+            if stmt.orelse:
+                emit(f"{pad}else:", stmt.orelse[0].lineno)
+                _render_block(stmt.orelse, indent + 1, out, lines)
+        elif isinstance(stmt, ast.While):
+            emit(f"{pad}while {ast.unparse(stmt.test)}:", stmt.lineno)
+            _render_block(stmt.body, indent + 1, out, lines)
+        elif isinstance(stmt, ast.For):
+            emit(f"{pad}for {ast.unparse(stmt.target)} in {ast.unparse(stmt.iter)}:", stmt.lineno)
+            _render_block(stmt.body, indent + 1, out, lines)
+        else:
+            emit(pad + ast.unparse(stmt), stmt.lineno)
 
-        # fallback: treat as identifier
-        parts.append(t)
-        i += 1
 
-    return " ".join(parts) if parts else "None"
+def render_python(module: ast.Module) -> str:
+    """Render a lowered module as Python source, one generated line per statement."""
+    out: list[str] = []
+    _render_block(module.body, 0, out)
+    return "\n".join(out) + "\n"
 
 
-def compile_plats(plats_src: str) -> str:
-    """Compile Platskript source to Python source."""
-    py_lines: list[str] = []
-    indent = 0
-    stack: list[str] = []
+# --- in-process memoization ----------------------------------------------------
 
-    def emit(line: str) -> None:
-        py_lines.append(("    " * indent) + line)
 
-    for raw in plats_src.splitlines():
-        line = raw.strip()
-        if not line:
-            continue
+def _env_cache_size(default: int = 128) -> int:
+    raw = os.getenv("VLAAMSCODEX_COMPILE_CACHE_SIZE")
+    try:
+        return max(0, int(raw)) if raw is not None else default
+    except ValueError:
+        return default
 
-        # Skip coding cookie if present (the codec will remove it too, but this is safe).
-        if line.startswith("#") and "coding" in line:
-            continue
 
-        tokens = line.split()
+# Compiled outputs (Python text and code objects) are immutable, so they are shared
+# between callers. Keyed by source digest, never by the (possibly huge) source itself.
+_COMPILE_CACHE: LRUCache[tuple[str, bytes, str], object] = LRUCache(_env_cache_size())
 
-        # close block
-        if tokens == ["gedaan"]:
-            if not stack:
-                raise ValueError("gedaan without open block")
-            kind = stack.pop()
-            if kind in {"funksie"}:
-                indent -= 1
-            continue
 
-        # start program (no indent; just a marker)
-        if tokens[:2] == ["plan", "doe"]:
-            stack.append("plan")
-            continue
+def _memo_key(kind: str, plats_src: str, filename: str = "") -> tuple[str, bytes, str]:
+    return kind, hashlib.sha256(plats_src.encode("utf-8", "surrogatepass")).digest(), filename
 
-        # function start: maak funksie NAME met ... doe
-        if len(tokens) >= 5 and tokens[0:2] == ["maak", "funksie"] and tokens[-1] == "doe":
-            name = tokens[2]
-            if "met" not in tokens:
-                raise ValueError("function missing 'met'")
-            met_i = tokens.index("met")
-            params_tokens = tokens[met_i + 1 : -1]
-            params = [t for t in params_tokens if t != "en"]
-            emit(f"def {name}({', '.join(params)}):")
-            indent += 1
-            stack.append("funksie")
-            continue
 
-        # statements must end with 'amen'
-        if not tokens or tokens[-1] != "amen":
-            raise ValueError(f"missing 'amen' statement terminator: {line}")
-        tokens = tokens[:-1]
+def compile_cache_stats() -> CacheStats:
+    """Hit/miss/eviction counters of the in-process compile cache."""
+    return _COMPILE_CACHE.stats()
 
-        if not tokens:
-            continue
 
-        if tokens[0] == "klap":
-            emit(f"print({_parse_expr(tokens[1:])})")
-            continue
+def set_compile_cache_size(maxsize: int) -> None:
+    """Resize the in-process compile cache (0 disables it). Default: `VLAAMSCODEX_COMPILE_CACHE_SIZE` or 128."""
+    _COMPILE_CACHE.resize(maxsize)
 
-        if tokens[0] == "zet":
-            if "op" not in tokens:
-                raise ValueError("zet missing 'op'")
-            op_i = tokens.index("op")
-            var = tokens[1]
-            emit(f"{var} = {_parse_expr(tokens[op_i + 1:])}")
-            continue
 
-        if tokens[0] == "roep":
-            func = tokens[1]
-            if "met" in tokens:
-                met_i = tokens.index("met")
-                args = [_parse_expr(a) for a in _split_args(tokens[met_i + 1 :])]
-                emit(f"{func}({', '.join(args)})")
-            else:
-                emit(f"{func}()")
-            continue
+def clear_compile_cache() -> None:
+    _COMPILE_CACHE.clear()
+
+
+# --- public API ----------------------------------------------------------------
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    # Both trees are acyclic, so refcounting frees them; skipping the cyclic collector
+    # while they are built avoids repeated full-heap scans on large programs.
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _build_ast(plats_src: str, optimize: int, filename: str = "<plats>") -> ast.Module:
+    return lower(_optimize(parse_plats(plats_src), optimize, filename), fast_locals=optimize >= 2)
+
+
+def compile_plats_ast(plats_src: str, *, optimize: int = 0) -> ast.Module:
+    """Compile Platskript source to a Python `ast.Module`."""
+    with _gc_paused():
+        return _build_ast(plats_src, optimize)
+
+
+def _compile_code(plats_src: str, filename: str, optimize: int) -> CodeType:
+    with _gc_paused():
+        return compile(_build_ast(plats_src, optimize, filename), filename, "exec", dont_inherit=True)
+
+
+def _compile_python(plats_src: str, optimize: int) -> str:
+    with _gc_paused():
+        return render_python(_build_ast(plats_src, optimize))
 
-        if tokens[0] == "geeftterug":
-            emit(f"return {_parse_expr(tokens[1:])}")
-            continue
 
-        raise ValueError(f"unknown instruction: {line}")
+def compile_plats_with_map(plats_src: str, *, optimize: int = 0) -> tuple[str, tuple[int, ...]]:
+    """Like `compile_plats()`, plus the `.plats` line of every generated Python line.
 
-    if stack:
-        raise ValueError(f"unclosed blocks: {stack}")
-    if indent != 0:
-        raise ValueError(f"internal error: indent={indent}")
+    `line_map[i - 1]` is the Platskript line that Python line `i` was generated from (0
+    for the generated `reeks` class), so tools that only see the generated Python (`plats
+    build` output under cProfile, coverage, tracebacks) can point back at the Plats
+    source. Not memoized.
+    """
+    out: list[str] = []
+    lines: list[int] = []
+    with _gc_paused():
+        _render_block(_build_ast(plats_src, optimize).body, 0, out, lines)
+    return "\n".join(out) + "\n", tuple(lines)
 
-    return "\n".join(py_lines) + "\n"
 
+def compile_plats_code(plats_src: str, filename: str = "<plats>", *, optimize: int = 0) -> CodeType:
+    """Compile Platskript source straight to a code object (no Python source round trip).
+
+    `optimize=1` runs the middle-end pass from `vlaamscodex.optimizer` first; `optimize=2`
+    also turns `plan` variables into fast locals.
+    """
+    key = _memo_key(f"code-O{optimize}", plats_src, filename)
+    return _COMPILE_CACHE.get_or_compute(  # type: ignore[return-value]
+        key, lambda: _compile_code(plats_src, filename, optimize)
+    )
+
+
+def compile_plats(plats_src: str, *, optimize: int = 0) -> str:
+    """Compile Platskript source to Python source (`optimize`: see `compile_plats_code`)."""
+    key = _memo_key(f"python-O{optimize}", plats_src)
+    return _COMPILE_CACHE.get_or_compute(key, lambda: _compile_python(plats_src, optimize))  # type: ignore[return-value]
+
+
+# --- streaming ------------------------------------------------------------------
+
+
+class _StreamCompiler:
+    """Incremental Plats -> Python text compiler with bounded memory.
+
+    Lines are fed one at a time. As soon as a module-level statement is complete it is
+    optimized, lowered, rendered and dropped from the tree. `plan` bodies are spliced at
+    module level, so statements directly inside `plan doe` stream too; only the blocks
+    that are still open (and the current funksie) are held in memory.
+
+    The rendered output is identical to `compile_plats()`.
+    """
+
+    def __init__(self, *, optimize: int = 0, filename: str = "<plats>") -> None:
+        if optimize >= 2:
+            raise ValueError("optimize=2 (fast locals) needs the whole module; use compile_plats()")
+        _optimize(n.Module(), optimize)  # validate the level up front
+        self._optimize = optimize
+        self._filename = filename
+        self._parser = Parser()
+        self._lowering = _Lowering()
+        self._lineno = 0
+
+    def feed(self, line: str) -> list[str]:
+        """Consume one source line; return the Python lines that became final."""
+        self._lineno += 1
+        tokens = tokenize_line(line)
+        if not tokens:
+            return []
+        self._parser.feed(self._lineno, tokens)
+        return self._drain()
+
+    def close(self) -> list[str]:
+        """Signal end of input (raises for unclosed blocks) and return the remaining lines."""
+        self._parser.finish()
+        return self._drain()
+
+    def _drain(self) -> list[str]:
+        stack = self._parser.stack
+        depth = 0
+        while depth < len(stack) and isinstance(stack[depth], n.Plan):
+            depth += 1
+        body = stack[depth - 1].body if depth else self._parser.module.body
+        ready = len(body) - (1 if len(stack) > depth else 0)
+        if ready <= 0:
+            return []
+        stmts = body[:ready]
+        del body[:ready]
+
+        stmts = _optimize(n.Module(stmts), self._optimize, self._filename).body
+        out: list[str] = []
+        _render_block(self._lowering.toplevel(stmts), 0, out)
+        return [line + "\n" for line in out]
+
+
+def compile_plats_iter(
+    lines: Iterable[str], *, optimize: int = 0, filename: str = "<plats>"
+) -> Iterator[str]:
+    """Compile Platskript lines to Python source lines (each ending in a newline), lazily.
+
+    `lines` can be any iterable of source lines, e.g. an open file. Output is produced as
+    soon as statements complete, so memory stays bounded by the largest open block
+    rather than the file size. `"".join(compile_plats_iter(src.splitlines()))` equals
+    `compile_plats(src)` for any non-empty program. `optimize=2` is not supported.
+    """
+    compiler = _StreamCompiler(optimize=optimize, filename=filename)
+    for line in lines:
+        yield from compiler.feed(line)
+    yield from compiler.close()
@@ -0,0 +1,386 @@
+"""`plats daemon`: a pre-warmed server that runs `plats` commands for thin clients.
+
+    plats daemon start            # detaches; --foreground keeps it attached
+    platsc run script.plats       # any `plats` arguments (see `vlaamscodex.client`)
+    plats daemon status | stop
+
+The daemon imports the CLI, compiler, cache, checker and dialect registry once and then
+listens on a Unix socket (`client.socket_path()`). Its directory must be owned by this
+user with mode 0700 (`client.socket_dir_problem()`); the daemon refuses to bind otherwise.
+Requests are read without blocking, so a client that connects and stays silent does not
+hold up the others. Every request runs `cli.main` in a worker process forked from that
+warm state: it starts
+without import or registry cost, and whatever the program does (globals, `sys.modules`,
+crashes) cannot leak into the daemon or into other requests. Compiled code is shared
+between workers through the on-disk compile cache (`vlaamscodex.cache`).
+
+The client hands over its stdin/stdout/stderr descriptors (`SCM_RIGHTS`), so a worker
+writes straight into the client's terminal or pipes: output streams as it is produced,
+with the ordering and tty behaviour of a local run. Only the exit status is sent back.
+When the client goes away (Ctrl-C), its worker is terminated.
+
+Unix only; elsewhere `platsc` simply runs the command in-process.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import selectors
+import signal
+import socket
+import subprocess
+import sys
+import time
+import traceback
+from pathlib import Path
+
+from . import __version__
+from .client import _HEAD, _send, daemon_supported, request, socket_dir_problem, socket_path
+
+# How long a client may take to deliver its request before the daemon drops it.
+_REQUEST_TIMEOUT = 5.0
+_MAX_FDS = 3  # stdin, stdout, stderr
+_START_TIMEOUT = 10.0
+
+
+def _warm() -> None:
+    """Import and initialise everything requests need, once, before any worker forks."""
+    from . import cache, checker, cli, optimizer  # noqa: F401
+    from .compiler import compile_plats, compile_plats_code
+    from .dialects.transformer import available_packs
+
+    available_packs()
+    compile_plats_code("plan doe\n  klap tekst warm amen\ngedaan\n", "<warm>")
+    compile_plats("plan doe\n  klap tekst warm amen\ngedaan\n")
+
+
+def _socket_dir(path: str) -> None:
+    """Create the socket's directory if needed; refuse one that is not safely ours."""
+    os.makedirs(os.path.dirname(path) or ".", mode=0o700, exist_ok=True)
+    problem = socket_dir_problem(path)
+    if problem is not None:
+        raise RuntimeError(f"refusing to use {path}: {problem}")
+
+
+def _listen(path: str) -> socket.socket:
+    _socket_dir(path)
+    if os.path.exists(path):
+        if request({"op": "status"}, path) is not None:
+            raise RuntimeError(f"a daemon is already listening on {path}")
+        os.unlink(path)  # stale socket of a daemon that died
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    os.chmod(path, 0o600)
+    listener.listen(64)
+    listener.setblocking(False)
+    return listener
+
+
+def _exit_code(code: object) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def _run_worker(message: dict, fds: list[int]) -> int:
+    """Body of a forked worker: adopt the client's stdio, cwd and environment, run the CLI."""
+    for target, fd in enumerate(fds):
+        os.dup2(fd, target)
+        os.close(fd)
+    os.chdir(message["cwd"])
+    os.environ.clear()
+    os.environ.update(message["env"])
+    encoding = message.get("encoding") or "utf-8"
+    sys.stdin = open(0, encoding=encoding, closefd=False)
+    sys.stdout = open(1, "w", encoding=encoding, buffering=1 if os.isatty(1) else -1, closefd=False)
+    sys.stderr = open(2, "w", encoding=encoding, errors="backslashreplace", buffering=1, closefd=False)
+    sys.argv = ["plats", *message["argv"]]
+
+    from .cli import main
+
+    try:
+        code = _exit_code(main(message["argv"]))
+    except SystemExit as e:
+        code = _exit_code(e.code)
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    sys.stdout.flush()
+    sys.stderr.flush()
+    return code
+
+
+class _Pending:
+    """A connection whose request has not fully arrived yet."""
+
+    __slots__ = ("data", "fds", "deadline")
+
+    def __init__(self, deadline: float) -> None:
+        self.data = b""
+        self.fds: list[int] = []
+        self.deadline = deadline
+
+    def message(self) -> dict | None:
+        """The request once all of it has arrived (`client._send` framing), else None."""
+        if len(self.data) < _HEAD:
+            return None
+        end = _HEAD + int.from_bytes(self.data[:_HEAD], "big")
+        if len(self.data) < end:
+            return None
+        message = json.loads(self.data[_HEAD:end])
+        if not isinstance(message, dict):
+            raise ValueError("request is not a JSON object")
+        return message
+
+
+class _Daemon:
+    def __init__(self, path: str, idle_timeout: float | None) -> None:
+        self.path = path
+        self.idle_timeout = idle_timeout
+        self.listener = _listen(path)
+        self.selector = selectors.DefaultSelector()
+        self.jobs: dict[int, socket.socket] = {}  # worker pid -> client connection
+        self.pending: dict[socket.socket, _Pending] = {}  # connections still sending a request
+        self.running = True
+        # SIGCHLD wakes the selector through this pair (see signal.set_wakeup_fd).
+        self.wake_r, self.wake_w = socket.socketpair()
+        self.wake_r.setblocking(False)
+        self.wake_w.setblocking(False)
+
+    def serve(self) -> None:
+        self.selector.register(self.listener, selectors.EVENT_READ, "accept")
+        self.selector.register(self.wake_r, selectors.EVENT_READ, "wake")
+        old_wakeup = signal.set_wakeup_fd(self.wake_w.fileno())
+        old_chld = signal.signal(signal.SIGCHLD, lambda *_: None)
+        old_term = signal.signal(signal.SIGTERM, lambda *_: self.stop())
+        try:
+            while self.running or self.jobs:
+                idle = self.idle_timeout if self.running and not self.jobs and not self.pending else None
+                timeout = idle
+                if self.pending:
+                    timeout = max(0.0, min(p.deadline for p in self.pending.values()) - time.monotonic())
+                events = self.selector.select(timeout)
+                if not events and idle is not None:
+                    self.stop()
+                for key, _mask in events:
+                    if key.data == "accept":
+                        self._accept()
+                    elif key.data == "wake":
+                        self._drain_wakeups()
+                    elif isinstance(key.data, _Pending):
+                        self._read(key.fileobj, key.data)
+                    else:
+                        self._hangup(key.data, key.fileobj)
+                self._expire()
+                self._reap()
+        finally:
+            signal.set_wakeup_fd(old_wakeup)
+            signal.signal(signal.SIGCHLD, old_chld)
+            signal.signal(signal.SIGTERM, old_term)
+            self._close()
+
+    def stop(self) -> None:
+        """Stop accepting requests; running workers are terminated and reaped."""
+        if not self.running:
+            return
+        self.running = False
+        self.selector.unregister(self.listener)
+        self.listener.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        for conn in list(self.pending):
+            self._drop(conn, "daemon stopping")
+        for pid in self.jobs:
+            os.kill(pid, signal.SIGTERM)
+
+    def _accept(self) -> None:
+        try:
+            conn, _addr = self.listener.accept()
+        except BlockingIOError:
+            return
+        conn.setblocking(False)
+        pending = self.pending[conn] = _Pending(time.monotonic() + _REQUEST_TIMEOUT)
+        self.selector.register(conn, selectors.EVENT_READ, pending)
+
+    def _read(self, conn: socket.socket, pending: _Pending) -> None:
+        if conn not in self.pending:
+            return  # dropped by a `stop()` while this batch of events was handled
+        try:
+            chunk, fds, _flags, _addr = socket.recv_fds(conn, 65536, _MAX_FDS)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self._drop(conn, str(e))
+            return
+        pending.fds += fds
+        try:
+            if len(pending.fds) > _MAX_FDS:
+                raise ValueError(f"too many descriptors ({len(pending.fds)})")
+            if not chunk:
+                raise ValueError("connection closed mid-request")
+            pending.data += chunk
+            message = pending.message()
+        except ValueError as e:  # also malformed JSON
+            self._drop(conn, str(e))
+            return
+        if message is None:
+            return
+        self.selector.unregister(conn)
+        del self.pending[conn]
+        self._handle(conn, message, pending.fds)
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        for conn, pending in list(self.pending.items()):
+            if pending.deadline <= now:
+                self._drop(conn, f"no request within {_REQUEST_TIMEOUT:g}s")
+
+    def _drop(self, conn: socket.socket, reason: str) -> None:
+        pending = self.pending.pop(conn)
+        self.selector.unregister(conn)
+        for fd in pending.fds:
+            os.close(fd)
+        conn.close()
+        print(f"plats daemon: dropped a request: {reason}", file=sys.stderr)
+
+    def _handle(self, conn: socket.socket, message: dict, fds: list[int]) -> None:
+        conn.settimeout(_REQUEST_TIMEOUT)  # for the reply
+        try:
+            op = message.get("op")
+            if op == "run" and len(fds) == _MAX_FDS:
+                self._fork(conn, message, fds)
+                return
+            if op == "status":
+                _send(conn, {"pid": os.getpid(), "version": __version__, "jobs": len(self.jobs)})
+            elif op == "stop":
+                _send(conn, {"stopping": True})
+                self.stop()
+            else:
+                _send(conn, {"error": f"bad request: {op!r}", "exit": 2})
+        except OSError as e:
+            print(f"plats daemon: dropped a request: {e}", file=sys.stderr)
+        finally:
+            for fd in fds:
+                os.close(fd)
+        conn.close()
+
+    def _fork(self, conn: socket.socket, message: dict, fds: list[int]) -> None:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0:  # worker
+            code = 1
+            try:
+                signal.set_wakeup_fd(-1)
+                for sig in (signal.SIGCHLD, signal.SIGTERM):
+                    signal.signal(sig, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.default_int_handler)
+                self.selector.close()
+                for sock in (self.listener, self.wake_r, self.wake_w, conn, *self.jobs.values(), *self.pending):
+                    sock.close()
+                code = _run_worker(message, fds)
+            except BaseException:
+                traceback.print_exc()
+            finally:
+                os._exit(code)
+        conn.setblocking(False)
+        self.jobs[pid] = conn
+        self.selector.register(conn, selectors.EVENT_READ, pid)
+
+    def _drain_wakeups(self) -> None:
+        try:
+            while self.wake_r.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _hangup(self, pid: int, conn: socket.socket) -> None:
+        """The client sent more data or disconnected: either way it no longer waits."""
+        self.selector.unregister(conn)
+        if pid in self.jobs:
+            os.kill(pid, signal.SIGTERM)
+
+    def _reap(self) -> None:
+        while self.jobs:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            conn = self.jobs.pop(pid, None)
+            if conn is None:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            try:
+                self.selector.unregister(conn)
+            except KeyError:
+                pass  # already unregistered by _hangup
+            try:
+                conn.setblocking(True)
+                _send(conn, {"exit": code if code >= 0 else 128 - code})
+            except OSError:
+                pass
+            conn.close()
+
+    def _close(self) -> None:
+        self.selector.close()
+        self.wake_r.close()
+        self.wake_w.close()
+
+
+def serve(path: str | None = None, *, idle_timeout: float | None = None) -> None:
+    """Run the daemon in this process until `stop` is requested or SIGTERM arrives.
+
+    With `idle_timeout` (seconds) it also exits after that long without any request.
+    """
+    if not daemon_supported() or not hasattr(os, "fork"):
+        raise RuntimeError("plats daemon needs Unix sockets and fork()")
+    _warm()
+    daemon = _Daemon(path or socket_path(), idle_timeout)
+    print(f"plats daemon {__version__}: pid {os.getpid()}, listening on {daemon.path}", file=sys.stderr)
+    sys.stderr.flush()
+    daemon.serve()
+
+
+def start(path: str | None = None, *, idle_timeout: float | None = None) -> int:
+    """Start a detached daemon and return its pid once it accepts requests.
+
+    Its log (startup line, dropped requests) goes to `daemon.log` next to the socket.
+    """
+    path = path or socket_path()
+    status = request({"op": "status"}, path)
+    if status is not None:
+        return int(status["pid"])
+    _socket_dir(path)  # before the log file is opened in it
+    cmd = [sys.executable, "-m", "vlaamscodex.cli", "daemon", "start", "--foreground", "--socket", path]
+    if idle_timeout is not None:
+        cmd += ["--idle-timeout", str(idle_timeout)]
+    log = Path(path).with_name("daemon.log")
+    with open(log, "ab") as log_file:
+        proc = subprocess.Popen(
+            cmd, stdin=subprocess.DEVNULL, stdout=log_file, stderr=log_file, start_new_session=True
+        )
+    deadline = time.monotonic() + _START_TIMEOUT
+    while time.monotonic() < deadline:
+        status = request({"op": "status"}, path)
+        if status is not None:
+            return int(status["pid"])
+        if proc.poll() is not None:
+            break
+        time.sleep(0.02)
+    raise RuntimeError(f"plats daemon did not start; see {log}")
+
+
+def stop(path: str | None = None) -> bool:
+    """Ask the daemon to stop; False when none was running."""
+    return request({"op": "stop"}, path) is not None
+
+
+def status(path: str | None = None) -> dict | None:
+    """`{"pid", "version", "jobs"}` of the running daemon, or None."""
+    return request({"op": "status"}, path)
@@ -415,11 +415,20 @@ class _DialectRegistry:
         return resolved
 
 
-_DEFAULT_REGISTRY = _DialectRegistry()
+# Created on first use: locating the dialects directory walks the filesystem, which
+# `import` (e.g. every `plats` invocation) should not pay for.
+_DEFAULT_REGISTRY: _DialectRegistry | None = None
+
+
+def _default_registry() -> _DialectRegistry:
+    global _DEFAULT_REGISTRY
+    if _DEFAULT_REGISTRY is None:
+        _DEFAULT_REGISTRY = _DialectRegistry()
+    return _DEFAULT_REGISTRY
 
 
 def available_packs() -> list[PackInfo]:
-    return _DEFAULT_REGISTRY.available()
+    return _default_registry().available()
 
 
 def _compile_rule(
@@ -601,7 +610,7 @@ def transform(
         strict_idempotency=base.strict_idempotency if strict_idempotency is None else bool(strict_idempotency),
     )
 
-    resolved = _DEFAULT_REGISTRY.resolve(dialect_id)
+    resolved = _default_registry().resolve(dialect_id)
     protected_terms = (*GLOBAL_PROTECTED_TERMS, *resolved.protected_terms)
     compiled_rules = [
         _compile_rule(r, config=config, dialect_id=dialect_id, rule_index=i)
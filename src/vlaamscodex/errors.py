@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+
+class PlatsSyntaxError(ValueError):
+    """A Platskript source error, located at a 1-based `.plats` line.
+
+    Subclasses `ValueError` so callers that caught the old compiler errors keep working.
+    """
+
+    def __init__(self, message: str, line: int) -> None:
+        super().__init__(message, line)
+        self.message = message
+        self.line = line
+
+    def __str__(self) -> str:
+        return f"line {self.line}: {self.message}"
+
+
+class PlatsWarning(UserWarning):
+    """A compiler diagnostic that does not stop compilation (e.g. a missed optimization).
+
+    Emitted with `warnings.warn_explicit()` against the `.plats` file and line, so the
+    usual `warnings` filters (`-W error::vlaamscodex.errors.PlatsWarning`, ...) apply.
+    """
+
+
+def format_program_traceback(exc: BaseException, filename: str) -> str:
+    """Format `exc` showing only the frames of the Platskript program `filename`.
+
+    Hides the frames of whoever ran the program (`plats run --watch`, the sandbox). Column
+    markers are left out: they point into the generated Python, not the `.plats` line.
+    """
+    import traceback
+
+    te = traceback.TracebackException.from_exception(exc)
+    te.stack = traceback.StackSummary.from_list(
+        [
+            traceback.FrameSummary(f.filename, f.lineno, f.name, line=f.line)
+            for f in te.stack
+            if f.filename == filename and f.lineno  # line 0: generated helpers (the reeks class)
+        ]
+    )
+    return "".join(te.format())
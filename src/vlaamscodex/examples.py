@@ -194,14 +194,14 @@ def show_example(name: str) -> int:
     return 0
 
 
-def run_example(name: str) -> int:
+def run_example(name: str, use_cache: bool = True) -> int:
     """Run an example using InteractiveConsole for safe execution."""
     if name not in BUILTIN_EXAMPLES:
         print(f"Example '{name}' not found!")
         print(f"Available: {', '.join(BUILTIN_EXAMPLES.keys())}")
         return 1
 
-    from .compiler import compile_plats
+    from .cache import load_code
 
     example = BUILTIN_EXAMPLES[name]
     source_code = example["code"]
@@ -216,10 +216,10 @@ def run_example(name: str) -> int:
     print()
 
     try:
-        py_code = compile_plats(source_code)
+        codeobj = load_code(source_code, f"<{name}.plats>", use_cache=use_cache)
         # Use InteractiveConsole for safe code execution
         console = code.InteractiveConsole()
-        console.runsource(py_code, f"<{name}.plats>", "exec")
+        console.runcode(codeobj)
     except Exception as e:
         print(f"Error: {e}")
         return 1
@@ -0,0 +1,189 @@
+"""`import` support for `.plats` modules.
+
+After `vlaamscodex.install_import_hook()`, `import foo` finds `foo.plats` (or the package
+`foo/__init__.plats`) on `sys.path`, compiles it once and caches the code object as a
+standard hash-based `.pyc`:
+
+    foo.plats  ->  __pycache__/foo.plats.cpython-311.pyc
+
+The source hash also covers `compiler.COMPILER_VERSION`, so upgrading the compiler
+invalidates old bytecode. The finder sits just before `PathFinder` so `__init__.plats`
+packages are not shadowed by namespace packages; a Python module with the same name in
+the same directory still wins.
+"""
+
+from __future__ import annotations
+
+import importlib.abc
+import importlib.machinery
+import importlib.util
+import marshal
+import os
+import sys
+from pathlib import Path
+from types import CodeType
+from typing import Sequence
+
+from .cache import _atomic_write
+from .compiler import COMPILER_VERSION, compile_plats_code
+
+PLATS_SUFFIX = ".plats"
+
+# pyc flags (PEP 552): bit 0 = hash-based, bit 1 = check_source
+_PYC_FLAGS_CHECKED_HASH = 0b11
+_HASH_KEY = f"vlaamscodex {COMPILER_VERSION}\0".encode()
+
+
+def _source_hash(data: bytes) -> bytes:
+    return importlib.util.source_hash(_HASH_KEY + data)
+
+
+def cache_from_plats(path: str) -> str:
+    """`pkg/foo.plats` -> `pkg/__pycache__/foo.plats.<tag>.pyc` (honours `sys.pycache_prefix`)."""
+    return importlib.util.cache_from_source(path + ".py")
+
+
+def _decode_plats(data: bytes) -> str:
+    # Decode ourselves: `importlib.util.decode_source` would honour a
+    # `# coding: vlaamsplats` cookie and hand us generated Python instead of Plats.
+    text = data.decode("utf-8")
+    lines = text.splitlines()
+    if lines and lines[0].lstrip().startswith("#") and "coding" in lines[0]:
+        lines[0] = ""
+    return "\n".join(lines)
+
+
+class PlatsLoader(importlib.machinery.SourceFileLoader):
+    """Loads a `.plats` file, going through a hash-checked `.pyc` when possible."""
+
+    def source_to_code(self, data, path, *, _optimize=-1):  # type: ignore[override]
+        return compile_plats_code(_decode_plats(bytes(data)), str(path))
+
+    def get_code(self, fullname: str) -> CodeType:
+        source_path = self.get_filename(fullname)
+        data = self.get_data(source_path)
+        source_hash = _source_hash(data)
+        try:
+            bytecode_path = cache_from_plats(source_path)
+        except NotImplementedError:  # sys.implementation.cache_tag is None
+            bytecode_path = None
+
+        if bytecode_path is not None:
+            code = self._load_pyc(bytecode_path, source_hash)
+            if code is not None:
+                return code
+
+        code = self.source_to_code(data, source_path)
+        if bytecode_path is not None and not sys.dont_write_bytecode:
+            pyc = bytearray(importlib.util.MAGIC_NUMBER)
+            pyc += _PYC_FLAGS_CHECKED_HASH.to_bytes(4, "little")
+            pyc += source_hash
+            pyc += marshal.dumps(code)
+            try:
+                _atomic_write(Path(bytecode_path), bytes(pyc))
+            except OSError:
+                pass
+        return code
+
+    def _load_pyc(self, bytecode_path: str, source_hash: bytes) -> CodeType | None:
+        try:
+            pyc = self.get_data(bytecode_path)
+        except OSError:
+            return None
+        if (
+            len(pyc) < 16
+            or pyc[:4] != importlib.util.MAGIC_NUMBER
+            or int.from_bytes(pyc[4:8], "little") != _PYC_FLAGS_CHECKED_HASH
+            or pyc[8:16] != source_hash
+        ):
+            return None
+        try:
+            code = marshal.loads(pyc[16:])
+        except (EOFError, ValueError, TypeError):
+            return None
+        return code if isinstance(code, CodeType) else None
+
+
+class PlatsFinder(importlib.abc.MetaPathFinder):
+    """Finds `<name>.plats` modules and `<name>/__init__.plats` packages.
+
+    Python modules in the same `sys.path` entry take precedence. Directory listings are
+    cached per entry (revalidated by mtime), like `FileFinder` does, so the finder costs
+    one `stat()` per path entry for imports it does not handle.
+    """
+
+    def __init__(self) -> None:
+        self._listings: dict[str, tuple[int, frozenset[str]]] = {}
+
+    def invalidate_caches(self) -> None:
+        self._listings.clear()
+
+    def _listing(self, directory: str) -> frozenset[str]:
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return frozenset()
+        cached = self._listings.get(directory)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            names = frozenset(os.listdir(directory))
+        except OSError:
+            names = frozenset()
+        self._listings[directory] = (mtime, names)
+        return names
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Sequence[str] | None,
+        target: object = None,
+    ) -> importlib.machinery.ModuleSpec | None:
+        name = fullname.rpartition(".")[2]
+        for entry in sys.path if path is None else path:
+            if not isinstance(entry, str):
+                continue
+            directory = entry or "."
+            names = self._listing(directory)
+            if not names:
+                continue
+            if any(name + suffix in names for suffix in importlib.machinery.all_suffixes()):
+                return None  # a Python module of that name lives here; let PathFinder load it
+            if name in names:
+                package_dir = os.path.join(directory, name)
+                package_names = self._listing(package_dir)
+                if any("__init__" + suffix in package_names for suffix in importlib.machinery.all_suffixes()):
+                    return None
+                if "__init__" + PLATS_SUFFIX in package_names:
+                    init = os.path.join(package_dir, "__init__" + PLATS_SUFFIX)
+                    return importlib.util.spec_from_file_location(
+                        fullname,
+                        init,
+                        loader=PlatsLoader(fullname, init),
+                        submodule_search_locations=[package_dir],
+                    )
+            if name + PLATS_SUFFIX in names:
+                module_file = os.path.join(directory, name + PLATS_SUFFIX)
+                return importlib.util.spec_from_file_location(
+                    fullname, module_file, loader=PlatsLoader(fullname, module_file)
+                )
+        return None
+
+
+_FINDER = PlatsFinder()
+
+
+def install() -> None:
+    """Insert the `.plats` finder in front of `PathFinder` on `sys.meta_path` (idempotent)."""
+    if _FINDER in sys.meta_path:
+        return
+    for i, finder in enumerate(sys.meta_path):
+        if finder is importlib.machinery.PathFinder:
+            sys.meta_path.insert(i, _FINDER)
+            return
+    sys.meta_path.append(_FINDER)
+
+
+def uninstall() -> None:
+    if _FINDER in sys.meta_path:
+        sys.meta_path.remove(_FINDER)
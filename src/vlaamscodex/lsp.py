@@ -0,0 +1,363 @@
+"""`plats lsp`: a Language Server Protocol server for Platskript over stdio.
+
+Supports incremental document sync (`TextDocumentSyncKind.Incremental`) and publishes
+diagnostics from the parser, the Python compile step (e.g. `geeftterug` outside a
+funksie) and the line checks of `plats check`.
+
+Analysis is per top-level block: a document is split into chunks that start at nesting
+depth 0 (a `plan`, a funksie, a stray statement), and each chunk's diagnostics are
+cached by its exact lines, relative to its first line. After an edit only chunks whose
+text changed are parsed and compiled again; chunks that merely moved keep their cached
+result. Within a chunk the parser recovers after an error, so every bad line is reported.
+
+Diagnostics are published once the client has been quiet for `DEBOUNCE` seconds (at the
+latest `MAX_DELAY` after the first pending change), so fast typing never queues up
+analyses of intermediate states.
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, BinaryIO
+
+from . import __version__
+from .checker import BLOCK_OPENERS, check_line, get_error_message
+from .compiler import lower
+from .errors import PlatsSyntaxError
+from .nodes import Const, FunctionDef, If, Plan, Stmt, While
+from .parser import Parser, tokenize_line
+
+DEBOUNCE = 0.05
+MAX_DELAY = 0.3
+
+SEVERITY_ERROR = 1
+SEVERITY_WARNING = 2
+SEVERITY_INFORMATION = 3
+
+_SYNC_INCREMENTAL = 2
+_METHOD_NOT_FOUND = -32601
+_INTERNAL_ERROR = -32603
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")
+
+
+@dataclass(frozen=True, slots=True)
+class Diagnostic:
+    line: int  # 0-based; relative to the chunk while cached
+    message: str
+    severity: int = SEVERITY_ERROR
+    source: str = "plats"
+    code: str | None = None
+
+
+# --- analysis ----------------------------------------------------------------
+
+
+def _opens_block(tokens: list[str]) -> bool:
+    return tokens[-1] == "doe" and tokens[0] in BLOCK_OPENERS
+
+
+def _placeholder(tokens: list[str], line: int) -> Stmt:
+    """Stands in for a block whose header failed to parse, so its `gedaan` still matches."""
+    head = tokens[0]
+    if head == "maak":
+        return FunctionDef("_", [], line)
+    if head == "als":
+        return If(Const(True, line), line)
+    if head in ("zolang", "voor"):
+        return While(Const(True, line), line)
+    return Plan(line)
+
+
+def chunks(lines: list[str]) -> list[tuple[int, int]]:
+    """Split a document into independently analysable `[start, end)` line ranges."""
+    out: list[tuple[int, int]] = []
+    depth = 0
+    start: int | None = None
+    for i, raw in enumerate(lines):
+        tokens = tokenize_line(raw)
+        if not tokens:
+            continue
+        if start is None:
+            start = i
+        if tokens == ["gedaan"]:
+            depth = max(depth - 1, 0)
+        elif _opens_block(tokens):
+            depth += 1
+        if depth == 0:
+            out.append((start, i + 1))
+            start = None
+    if start is not None:
+        out.append((start, len(lines)))
+    return out
+
+
+def analyse_chunk(lines: tuple[str, ...]) -> tuple[Diagnostic, ...]:
+    """Diagnostics for one chunk, with line numbers relative to its first line."""
+    diagnostics: list[Diagnostic] = []
+    parser = Parser()
+    for lineno, raw in enumerate(lines, 1):
+        tokens = tokenize_line(raw)
+        if not tokens:
+            continue
+        try:
+            parser.feed(lineno, tokens)
+        except PlatsSyntaxError as e:
+            diagnostics.append(Diagnostic(e.line - 1, e.message))
+            if _opens_block(tokens):
+                parser._open(_placeholder(tokens, lineno))
+    try:
+        module = parser.finish()
+    except PlatsSyntaxError as e:
+        diagnostics.append(Diagnostic(e.line - 1, e.message))
+    else:
+        try:
+            compile(lower(module), "<plats>", "exec", dont_inherit=True)
+        except SyntaxError as e:
+            diagnostics.append(Diagnostic((e.lineno or 1) - 1, e.msg))
+
+    flagged = {d.line for d in diagnostics}
+    for lineno, raw in enumerate(lines, 1):
+        if lineno - 1 in flagged:
+            continue  # the compiler already explains this line
+        for issue in check_line(raw, lineno):
+            message = issue.message + (f" ({issue.suggestion})" if issue.suggestion else "")
+            diagnostics.append(Diagnostic(lineno - 1, message, SEVERITY_WARNING, "plats check", issue.issue_type))
+    return tuple(diagnostics)
+
+
+def _utf16_len(text: str) -> int:
+    return len(text) if text.isascii() else len(text.encode("utf-16-le")) // 2
+
+
+def _str_index(line: str, character: int) -> int:
+    """LSP positions count UTF-16 code units; map one to an index into `line`."""
+    if line.isascii():
+        return min(character, len(line))
+    units = 0
+    for i, ch in enumerate(line):
+        if units >= character:
+            return i
+        units += 2 if ord(ch) > 0xFFFF else 1
+    return len(line)
+
+
+class Document:
+    """An open text document plus the per-chunk diagnostics of its last analysis."""
+
+    def __init__(self, text: str, version: int | None = None) -> None:
+        self.lines = _LINE_BREAK.split(text)
+        self.version = version
+        self._cache: dict[tuple[str, ...], tuple[Diagnostic, ...]] = {}
+        self.analysed_chunks = 0  # chunks parsed + compiled so far (cache misses)
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+    def apply(self, change: dict[str, Any]) -> None:
+        """Apply one `TextDocumentContentChangeEvent` (ranged, or a full replacement)."""
+        if "range" not in change:
+            self.lines = _LINE_BREAK.split(change["text"])
+            return
+        sl, sc = self._position(change["range"]["start"])
+        el, ec = self._position(change["range"]["end"])
+        prefix, suffix = self.lines[sl][:sc], self.lines[el][ec:]
+        self.lines[sl : el + 1] = _LINE_BREAK.split(prefix + change["text"] + suffix)
+
+    def _position(self, position: dict[str, int]) -> tuple[int, int]:
+        """(line, str index); positions past the end clamp to the end of the document."""
+        line = position["line"]
+        if line >= len(self.lines):
+            return len(self.lines) - 1, len(self.lines[-1])
+        return line, _str_index(self.lines[line], position["character"])
+
+    def diagnostics(self) -> list[Diagnostic]:
+        cache: dict[tuple[str, ...], tuple[Diagnostic, ...]] = {}
+        out: list[Diagnostic] = []
+        has_plan = False
+        for start, end in chunks(self.lines):
+            key = tuple(self.lines[start:end])
+            found = cache.get(key)
+            if found is None:
+                found = self._cache.get(key)
+            if found is None:
+                found = analyse_chunk(key)
+                self.analysed_chunks += 1
+            cache[key] = found
+            has_plan = has_plan or tokenize_line(key[0])[:2] == ["plan", "doe"]
+            out.extend(
+                Diagnostic(start + d.line, d.message, d.severity, d.source, d.code) for d in found
+            )
+        self._cache = cache  # drop entries of chunks that no longer exist
+        if not has_plan:  # like `plats check`; only informational, modules need no plan
+            first = next((i for i, raw in enumerate(self.lines) if tokenize_line(raw)), None)
+            if first is not None:
+                message = get_error_message("missing_plan_doe")
+                out.append(Diagnostic(first, message, SEVERITY_INFORMATION, "plats check", "missing_plan_doe"))
+        return out
+
+    def to_lsp(self, diagnostic: Diagnostic) -> dict[str, Any]:
+        line = self.lines[diagnostic.line] if diagnostic.line < len(self.lines) else ""
+        indent = len(line) - len(line.lstrip())
+        result: dict[str, Any] = {
+            "range": {
+                "start": {"line": diagnostic.line, "character": _utf16_len(line[:indent])},
+                "end": {"line": diagnostic.line, "character": _utf16_len(line)},
+            },
+            "severity": diagnostic.severity,
+            "source": diagnostic.source,
+            "message": diagnostic.message,
+        }
+        if diagnostic.code:
+            result["code"] = diagnostic.code
+        return result
+
+
+# --- protocol ----------------------------------------------------------------
+
+
+def read_message(stream: BinaryIO) -> dict[str, Any] | None:
+    """Read one `Content-Length` framed JSON-RPC message; None at end of input."""
+    length = None
+    while True:
+        header = stream.readline()
+        if not header:
+            return None
+        header = header.strip()
+        if not header:
+            break
+        name, _, value = header.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+    if length is None:
+        raise ValueError("message without Content-Length")
+    return json.loads(stream.read(length))
+
+
+def write_message(stream: BinaryIO, message: dict[str, Any]) -> None:
+    body = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    stream.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+    stream.flush()
+
+
+class _Server:
+    def __init__(self, out: BinaryIO) -> None:
+        self.out = out
+        self.documents: dict[str, Document] = {}
+        self.pending: dict[str, None] = {}  # uris to (re)publish, in order
+        self.pending_since = 0.0
+        self.shutdown = False
+
+    def handle(self, message: dict[str, Any]) -> bool:
+        """Handle one message; True once the client sent `exit`."""
+        method = message.get("method")
+        params = message.get("params") or {}
+        is_request = "id" in message
+        if method == "exit":
+            return True
+        try:
+            result = self._dispatch(method, params, is_request)
+        except _MethodNotFound:
+            self._reply_error(message["id"], _METHOD_NOT_FOUND, f"method not found: {method}")
+            return False
+        except Exception as e:  # a bad message must not take the server down
+            if is_request:
+                self._reply_error(message["id"], _INTERNAL_ERROR, f"{type(e).__name__}: {e}")
+            else:
+                print(f"plats lsp: {method}: {type(e).__name__}: {e}", file=sys.stderr)
+            return False
+        if is_request and method is not None:
+            write_message(self.out, {"jsonrpc": "2.0", "id": message["id"], "result": result})
+        return False
+
+    def _dispatch(self, method: str | None, params: dict[str, Any], is_request: bool) -> Any:
+        if method == "initialize":
+            return {
+                "capabilities": {"textDocumentSync": {"openClose": True, "change": _SYNC_INCREMENTAL}},
+                "serverInfo": {"name": "plats-lsp", "version": __version__},
+            }
+        if method == "shutdown":
+            self.publish()
+            self.shutdown = True
+            return None
+        if method == "textDocument/didOpen":
+            doc = params["textDocument"]
+            self.documents[doc["uri"]] = Document(doc["text"], doc.get("version"))
+            self._touch(doc["uri"])
+        elif method == "textDocument/didChange":
+            uri = params["textDocument"]["uri"]
+            document = self.documents[uri]
+            for change in params["contentChanges"]:
+                document.apply(change)
+            document.version = params["textDocument"].get("version")
+            self._touch(uri)
+        elif method == "textDocument/didClose":
+            uri = params["textDocument"]["uri"]
+            self.documents.pop(uri, None)
+            self.pending.pop(uri, None)
+            self._notify_diagnostics(uri, [], None)
+        elif is_request and method is not None:
+            raise _MethodNotFound(method)
+        return None  # other notifications (initialized, didSave, $/...) need nothing
+
+    def _touch(self, uri: str) -> None:
+        if not self.pending:
+            self.pending_since = time.monotonic()
+        self.pending[uri] = None
+
+    def publish(self) -> None:
+        for uri in list(self.pending):
+            document = self.documents[uri]
+            items = [document.to_lsp(d) for d in document.diagnostics()]
+            self._notify_diagnostics(uri, items, document.version)
+        self.pending.clear()
+
+    def _notify_diagnostics(self, uri: str, items: list[dict[str, Any]], version: int | None) -> None:
+        params: dict[str, Any] = {"uri": uri, "diagnostics": items}
+        if version is not None:
+            params["version"] = version
+        write_message(self.out, {"jsonrpc": "2.0", "method": "textDocument/publishDiagnostics", "params": params})
+
+    def _reply_error(self, request_id: Any, code: int, message: str) -> None:
+        write_message(self.out, {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}})
+
+
+class _MethodNotFound(Exception):
+    pass
+
+
+def _read_all(stream: BinaryIO, inbox: queue.Queue) -> None:
+    try:
+        while (message := read_message(stream)) is not None:
+            inbox.put(message)
+            if message.get("method") == "exit":
+                return  # stop reading: a thread blocked on stdin would hang interpreter shutdown
+    except (OSError, ValueError) as e:
+        print(f"plats lsp: {e}", file=sys.stderr)
+    inbox.put(None)
+
+
+def serve(stdin: BinaryIO, stdout: BinaryIO) -> int:
+    """Serve one client until `exit`. Returns 0 if `shutdown` came first, else 1 (per LSP)."""
+    server = _Server(stdout)
+    inbox: queue.Queue = queue.Queue()
+    threading.Thread(target=_read_all, args=(stdin, inbox), name="plats-lsp-reader", daemon=True).start()
+    while True:
+        timeout = None
+        if server.pending:
+            timeout = max(0.0, min(DEBOUNCE, server.pending_since + MAX_DELAY - time.monotonic()))
+        try:
+            message = inbox.get(timeout=timeout)
+        except queue.Empty:
+            server.publish()
+            continue
+        if message is None:  # client went away without `exit`
+            return 0 if server.shutdown else 1
+        if server.handle(message):
+            return 0 if server.shutdown else 1
@@ -0,0 +1,193 @@
+"""`plats memprof`: memory profiling attributed to `.plats` lines and funksies.
+
+Runs a Platskript program under `tracemalloc` and attributes every traced block to the
+innermost `.plats` line on its allocation traceback, so memory allocated by library code
+is charged to the Plats statement that called it. Two views are reported:
+
+- **at peak**: the blocks alive when traced memory was highest. A sampler thread polls
+  `tracemalloc` every `SAMPLE_INTERVAL` seconds and takes a snapshot whenever memory
+  grew by `PEAK_STEP`, so the program itself runs without trace hooks (those would
+  disable CPython's in-place string concatenation and distort the numbers). Which state
+  gets sampled depends on thread timing, so this view is approximate;
+- **at end**: what is still alive when the program finishes (retained by its variables).
+
+`MemReport.to_json()` is stable (sorted, no timings), so reports can be diffed between
+releases. The sampled values (`peak_bytes` and the at-peak view, whose held snapshots
+count towards the peak) are kept apart under `"approximate"`.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import tracemalloc
+from dataclasses import asdict, dataclass
+from types import CodeType
+from typing import Any
+
+from .compiler import MAIN_FUNCTION, compile_plats_code
+from .profiler import _code_objects
+
+# Take a new "at peak" snapshot once traced memory exceeds the previous one by this factor.
+PEAK_STEP = 1.05
+SAMPLE_INTERVAL = 0.001
+_MIN_STEP_BYTES = 16 * 1024
+_NFRAMES = 8  # enough to reach the Plats frame through Python-level library helpers
+_REPORT_VERSION = 1
+
+
+@dataclass(frozen=True, slots=True)
+class MemStat:
+    line: int  # 0: allocations made outside the program's own code
+    funksie: str
+    size: int  # bytes
+    count: int  # blocks
+    source: str
+
+
+@dataclass(frozen=True, slots=True)
+class MemReport:
+    filename: str
+    peak_bytes: int  # tracemalloc's peak, including the sampler's own snapshots
+    at_peak: tuple[MemStat, ...]  # sorted by size, largest first; sampled, so approximate
+    at_end: tuple[MemStat, ...]
+
+    def by_funksie(self, which: str = "at_peak") -> dict[str, int]:
+        totals: dict[str, int] = {}
+        for stat in getattr(self, which):
+            totals[stat.funksie] = totals.get(stat.funksie, 0) + stat.size
+        return dict(sorted(totals.items(), key=lambda kv: (-kv[1], kv[0])))
+
+    def format(self, top: int = 10) -> str:
+        out = [f"{self.filename}: peak {_kib(self.peak_bytes)} traced"]
+        for title, stats in (("at peak", self.at_peak), ("at end", self.at_end)):
+            out.append("")
+            out.append(f"{title}: {_kib(sum(s.size for s in stats))}")
+            out.append(f"{'line':>5} {'size':>12} {'blocks':>8}  {'funksie':<16} source")
+            for s in stats[:top]:
+                out.append(f"{s.line or '-':>5} {_kib(s.size):>12} {s.count:>8}  {s.funksie:<16} {s.source}")
+        return "\n".join(out)
+
+    def to_json(self) -> str:
+        data = {
+            "version": _REPORT_VERSION,
+            "filename": self.filename,
+            "at_end": [asdict(s) for s in self.at_end],
+            "funksies_at_end": self.by_funksie("at_end"),
+            "approximate": {
+                "peak_bytes": self.peak_bytes,
+                "at_peak": [asdict(s) for s in self.at_peak],
+                "funksies_at_peak": self.by_funksie("at_peak"),
+            },
+        }
+        return json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+
+
+def _kib(size: int) -> str:
+    return f"{size / 1024:.1f} KiB"
+
+
+def _line_owners(code: CodeType) -> dict[int, str]:
+    """Map every `.plats` line to the funksie whose code it belongs to ("plan" at top level)."""
+    owners: dict[int, str] = {}
+    for c in _code_objects(code):  # parents come before nested code, so nested names win
+        name = "plan" if c.co_name in ("<module>", MAIN_FUNCTION) else c.co_name
+        for _start, _end, line in c.co_lines():
+            if line is not None:
+                owners[line] = name
+    return owners
+
+
+class _PeakSampler(threading.Thread):
+    """Background thread that snapshots traced memory whenever it reaches a new high."""
+
+    def __init__(self) -> None:
+        super().__init__(name="plats-memprof", daemon=True)
+        self.snapshot: tracemalloc.Snapshot | None = None
+        self._threshold = _MIN_STEP_BYTES
+        self._done = threading.Event()
+
+    def run(self) -> None:
+        while not self._done.wait(SAMPLE_INTERVAL):
+            current = tracemalloc.get_traced_memory()[0]
+            if current > self._threshold and tracemalloc.is_tracing():
+                self.snapshot = tracemalloc.take_snapshot()
+                self._threshold = max(int(current * PEAK_STEP), current + _MIN_STEP_BYTES)
+
+    def stop(self) -> None:
+        self._done.set()
+        self.join()
+
+
+def _traced(snapshot: tracemalloc.Snapshot) -> int:
+    return sum(trace.size for trace in snapshot.traces)
+
+
+def _attribute(
+    snapshot: tracemalloc.Snapshot, filename: str, owners: dict[int, str], src_lines: list[str]
+) -> tuple[MemStat, ...]:
+    totals: dict[int, list[int]] = {}
+    for trace in snapshot.traces:
+        line = 0
+        for frame in reversed(trace.traceback):  # innermost frame first
+            if frame.filename == filename and frame.lineno:  # line 0: the generated reeks class
+                line = frame.lineno
+                break
+        stats = totals.get(line)
+        if stats is None:
+            stats = totals[line] = [0, 0]
+        stats[0] += trace.size
+        stats[1] += 1
+    result = [
+        MemStat(
+            line,
+            owners.get(line, "plan") if line else "(buiten)",
+            size,
+            count,
+            src_lines[line - 1].strip() if 0 < line <= len(src_lines) else "",
+        )
+        for line, (size, count) in totals.items()
+    ]
+    result.sort(key=lambda s: (-s.size, s.line))
+    return tuple(result)
+
+
+def memprofile_plats(
+    plats_src: str, filename: str = "<plats>", *, optimize: int = 0, include_outside: bool = False
+) -> MemReport:
+    """Run a Platskript program under `tracemalloc` and return a `MemReport`.
+
+    Blocks whose traceback never passes through the program (interpreter and profiler
+    bookkeeping) are dropped unless `include_outside` is set; they then show up as line 0.
+    """
+    code = compile_plats_code(plats_src, filename, optimize=optimize)
+    owners = _line_owners(code)
+    sampler = _PeakSampler()
+    namespace: dict[str, Any] = {"__name__": "__main__"}
+
+    was_tracing = tracemalloc.is_tracing()
+    if was_tracing:
+        tracemalloc.stop()
+    tracemalloc.start(_NFRAMES)
+    sampler.start()
+    try:
+        exec(code, namespace)
+    finally:
+        sampler.stop()
+        end = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        if was_tracing:
+            tracemalloc.start()
+    del namespace
+
+    src_lines = plats_src.splitlines()
+    snapshot = sampler.snapshot
+    if snapshot is None or _traced(end) > _traced(snapshot):
+        snapshot = end
+    at_peak = _attribute(snapshot, filename, owners, src_lines)
+    at_end = _attribute(end, filename, owners, src_lines)
+    if not include_outside:
+        at_peak = tuple(s for s in at_peak if s.line)
+        at_end = tuple(s for s in at_end if s.line)
+    return MemReport(filename, peak, at_peak, at_end)
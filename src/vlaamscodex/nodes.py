@@ -0,0 +1,266 @@
+"""Platskript syntax tree.
+
+Every node is a slotted dataclass and carries the 1-based `.plats` line it came from,
+so later stages (lowering, diagnostics) can point back at the original source.
+
+Expressions keep the Platskript operator keyword (`plakt`, `derbij`, ...) instead of the
+Python operator, so passes can still tell `plakt` apart from `derbij`.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields
+from typing import Iterator, Union
+
+
+# --- expressions -------------------------------------------------------------
+
+
+@dataclass(slots=True)
+class Str:
+    value: str
+    line: int
+
+
+@dataclass(slots=True)
+class Num:
+    value: int | float
+    line: int
+
+
+@dataclass(slots=True)
+class Const:
+    """`None` (an empty expression)."""
+
+    value: object
+    line: int
+
+
+@dataclass(slots=True)
+class Name:
+    id: str
+    line: int
+
+
+@dataclass(slots=True)
+class BinOp:
+    """Arithmetic (`plakt`, `derbij`, ...) or boolean (`enook`, `ofwel`) operator."""
+
+    op: str
+    left: Expr
+    right: Expr
+    line: int
+
+
+@dataclass(slots=True)
+class Compare:
+    """Comparison chain, e.g. `da a iskleinerdan da b iskleinerdan da c`."""
+
+    left: Expr
+    ops: list[str]
+    comparators: list[Expr]
+    line: int
+
+
+@dataclass(slots=True)
+class UnaryOp:
+    op: str
+    operand: Expr
+    line: int
+
+
+@dataclass(slots=True)
+class Call:
+    func: str
+    args: list[Expr]
+    line: int
+
+
+@dataclass(slots=True)
+class Seq:
+    """`reeks met a en b ...`: a numeric sequence (`array.array` of doubles) of the items."""
+
+    items: list[Expr]
+    line: int
+
+
+@dataclass(slots=True)
+class SeqRange:
+    """`reeks van <start> tot <stop> [stap <step>]`: the numbers of that `range()` as a reeks."""
+
+    start: Expr
+    stop: Expr
+    step: Expr | None
+    line: int
+
+
+@dataclass(slots=True)
+class Reduce:
+    """`som|minimum|maximum|gemiddelde|lengte van <expr>`: one number from a whole sequence."""
+
+    func: str
+    value: Expr
+    line: int
+
+
+Expr = Union[Str, Num, Const, Name, BinOp, Compare, UnaryOp, Call, Seq, SeqRange, Reduce]
+
+
+# --- statements --------------------------------------------------------------
+
+
+@dataclass(slots=True)
+class Print:
+    value: Expr
+    line: int
+
+
+@dataclass(slots=True)
+class Assign:
+    target: str
+    value: Expr
+    line: int
+
+
+@dataclass(slots=True)
+class ExprStmt:
+    value: Expr
+    line: int
+
+
+@dataclass(slots=True)
+class Return:
+    value: Expr
+    line: int
+
+
+@dataclass(slots=True)
+class Yield:
+    """`lever <expr> amen`: hand one value to the caller; makes the funksie a generator."""
+
+    value: Expr
+    line: int
+
+
+@dataclass(slots=True)
+class FunctionDef:
+    """`maak [onthoud [N]] funksie ...`; `memo_size` is the `onthoud` cache size (None: plain).
+
+    `generator` is set when the body (not a nested funksie) contains `lever`.
+    """
+
+    name: str
+    params: list[str]
+    line: int
+    body: list[Stmt] = field(default_factory=list)
+    end_line: int = 0
+    memo_size: int | None = None
+    generator: bool = False
+
+
+@dataclass(slots=True)
+class Plan:
+    """`plan doe ... gedaan`: the program block. Its body runs at module level."""
+
+    line: int
+    body: list[Stmt] = field(default_factory=list)
+    end_line: int = 0
+
+
+@dataclass(slots=True)
+class If:
+    """`als <test> [dan] doe ... [anders doe ...] gedaan`; `else_line` is 0 without `anders`."""
+
+    test: Expr
+    line: int
+    body: list[Stmt] = field(default_factory=list)
+    orelse: list[Stmt] = field(default_factory=list)
+    else_line: int = 0
+    end_line: int = 0
+
+
+@dataclass(slots=True)
+class While:
+    """`zolang <test> doe ... gedaan`."""
+
+    test: Expr
+    line: int
+    body: list[Stmt] = field(default_factory=list)
+    end_line: int = 0
+
+
+@dataclass(slots=True)
+class For:
+    """`voor <target> van <start> tot <stop> [stap <step>] doe ... gedaan` (a `range()` loop)."""
+
+    target: str
+    start: Expr
+    stop: Expr
+    step: Expr | None
+    line: int
+    body: list[Stmt] = field(default_factory=list)
+    end_line: int = 0
+
+
+@dataclass(slots=True)
+class ForEach:
+    """`voor elk <target> uit <iter> doe ... gedaan`: one value at a time from any iterable."""
+
+    target: str
+    iter: Expr
+    line: int
+    body: list[Stmt] = field(default_factory=list)
+    end_line: int = 0
+
+
+@dataclass(slots=True)
+class Break:
+    """`stop amen`."""
+
+    line: int
+
+
+@dataclass(slots=True)
+class Rebind:
+    """Simultaneous assignment `a, b = x, y` (built by the tail-call pass)."""
+
+    targets: list[str]
+    values: list[Expr]
+    line: int
+
+
+@dataclass(slots=True)
+class Continue:
+    """Jump to the next loop iteration (built by the tail-call pass)."""
+
+    line: int
+
+
+Stmt = Union[
+    Print, Assign, ExprStmt, Return, Yield, FunctionDef, Plan, If, While, For, ForEach, Break, Rebind, Continue
+]
+Block = Union[Plan, FunctionDef, If, While, For, ForEach]
+
+
+@dataclass(slots=True)
+class Module:
+    body: list[Stmt] = field(default_factory=list)
+
+
+def iter_child_nodes(node: object) -> Iterator[object]:
+    """Yield the direct child nodes of `node` in field order (like `ast.iter_child_nodes`)."""
+    for f in fields(node):  # type: ignore[arg-type]
+        value = getattr(node, f.name)
+        if isinstance(value, list):
+            yield from (v for v in value if hasattr(v, "__dataclass_fields__"))
+        elif hasattr(value, "__dataclass_fields__"):
+            yield value
+
+
+def walk(node: object) -> Iterator[object]:
+    """Yield `node` and every node below it, depth first (like `ast.walk`)."""
+    stack = [node]
+    while stack:
+        cur = stack.pop()
+        yield cur
+        stack.extend(reversed(list(iter_child_nodes(cur))))
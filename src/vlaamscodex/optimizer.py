@@ -0,0 +1,327 @@
+"""Optimizing middle-end: rewrites the Platskript tree between parsing and lowering.
+
+Level 1 (`plats build -O1`, `compile_plats(..., optimize=1)`) runs:
+
+- constant folding: arithmetic on `getal` literals, comparisons and `nie` on literals,
+  and `enook`/`ofwel` with a literal left operand;
+- `plakt` fusion: in a chain like `tekst a plakt spatie plakt da x plakt tekst !`, each
+  run of adjacent text literals becomes one string (`'a ' + x + '!'`) instead of a `+`
+  per step. Other operands keep their `+`: their type is unknown, and an f-string would
+  turn `tekst x plakt getal 1` from a `TypeError` into `'x1'`;
+- dead code removal: statements after `geeftterug` or `stop` in the same block are dropped
+  (a dropped `lever` leaves one unreachable `yield`, so a generator stays a generator);
+- tail-call elimination: a funksie whose `geeftterug roep <zichzelf> met ...` calls sit in
+  tail position is rewritten into a `while True` loop that rebinds its parameters, so
+  deep recursion neither grows the stack nor hits the recursion limit. Self-calls that
+  cannot be rewritten are reported as `errors.PlatsWarning` (file and `.plats` line).
+
+Level 0 leaves the tree untouched; level 2 runs the same passes (its fast-locals codegen
+lives in `compiler.lower`). Line numbers are preserved on every node.
+"""
+
+from __future__ import annotations
+
+import operator
+import warnings
+from typing import Callable
+
+from . import nodes as n
+from .errors import PlatsWarning
+
+__all__ = ["MAX_OPT_LEVEL", "optimize"]
+
+MAX_OPT_LEVEL = 2
+
+_ARITH: dict[str, Callable[[object, object], object]] = {
+    "plakt": operator.add,
+    "derbij": operator.add,
+    "deraf": operator.sub,
+    "keer": operator.mul,
+    "gedeeld": operator.truediv,
+}
+_CMP: dict[str, Callable[[object, object], object]] = {
+    "isgelijk": operator.eq,
+    "isniegelijk": operator.ne,
+    "isgroterdan": operator.gt,
+    "iskleinerdan": operator.lt,
+}
+_LITERALS = (n.Str, n.Num, n.Const)
+
+
+class _Optimizer:
+    def __init__(self, filename: str = "<plats>") -> None:
+        self.filename = filename
+        self._stmt_handlers: dict[type, Callable[[n.Stmt], n.Stmt]] = {
+            n.Plan: self._scope,
+            n.FunctionDef: self._function,
+            n.Print: self._value,
+            n.Assign: self._value,
+            n.ExprStmt: self._value,
+            n.Return: self._value,
+            n.If: self._if,
+            n.While: self._loop,
+            n.For: self._for,
+            n.ForEach: self._for_each,
+            n.Yield: self._value,
+            n.Break: _identity,
+            n.Rebind: _identity,
+            n.Continue: _identity,
+        }
+        self._expr_handlers: dict[type, Callable[[n.Expr], n.Expr]] = {
+            n.Str: _identity,
+            n.Num: _identity,
+            n.Const: _identity,
+            n.Name: _identity,
+            n.BinOp: self._binop,
+            n.Compare: self._compare,
+            n.UnaryOp: self._unaryop,
+            n.Call: self._call,
+            n.Seq: self._seq,
+            n.SeqRange: self._seq_range,
+            n.Reduce: self._value,
+        }
+
+    def block(self, stmts: list[n.Stmt]) -> list[n.Stmt]:
+        out: list[n.Stmt] = []
+        for i, stmt in enumerate(stmts):
+            out.append(self._stmt_handlers[type(stmt)](stmt))
+            if isinstance(stmt, (n.Return, n.Break, n.Continue)):
+                # The rest of the block can never run, but a `lever` in it still makes the
+                # funksie a generator: keep one unreachable `yield` in its place.
+                dropped = _first_yield(stmts[i + 1 :])
+                if dropped is not None:
+                    out.append(n.Yield(n.Const(None, dropped.line), dropped.line))
+                break
+        return out
+
+    def expr(self, node: n.Expr) -> n.Expr:
+        return self._expr_handlers[type(node)](node)
+
+    # statements
+
+    def _scope(self, node):  # n.Plan | n.FunctionDef
+        node.body = self.block(node.body)
+        return node
+
+    def _function(self, node: n.FunctionDef) -> n.FunctionDef:
+        node.body = self.block(node.body)
+        _eliminate_tail_calls(node, self.filename)
+        return node
+
+    def _value(self, node):  # n.Print | n.Assign | n.ExprStmt | n.Return
+        node.value = self.expr(node.value)
+        return node
+
+    def _if(self, node: n.If) -> n.If:
+        node.test = self.expr(node.test)
+        node.body = self.block(node.body)
+        node.orelse = self.block(node.orelse)
+        return node
+
+    def _loop(self, node: n.While) -> n.While:
+        node.test = self.expr(node.test)
+        node.body = self.block(node.body)
+        return node
+
+    def _for_each(self, node: n.ForEach) -> n.ForEach:
+        node.iter = self.expr(node.iter)
+        node.body = self.block(node.body)
+        return node
+
+    def _for(self, node: n.For) -> n.For:
+        node.start = self.expr(node.start)
+        node.stop = self.expr(node.stop)
+        if node.step is not None:
+            node.step = self.expr(node.step)
+        node.body = self.block(node.body)
+        return node
+
+    # expressions
+
+    def _binop(self, node: n.BinOp) -> n.Expr:
+        if node.op == "plakt":
+            operands = _plakt_operands(node)
+            if any(isinstance(op, n.Str) for op in operands):
+                return self._plakt([self.expr(op) for op in operands], node.line)
+
+        left = self.expr(node.left)
+        right = self.expr(node.right)
+        if node.op == "enook" and isinstance(left, _LITERALS):
+            return right if left.value else left
+        if node.op == "ofwel" and isinstance(left, _LITERALS):
+            return left if left.value else right
+        if isinstance(left, n.Num) and isinstance(right, n.Num) and node.op in _ARITH:
+            if not (node.op == "gedeeld" and right.value == 0):
+                return n.Num(_ARITH[node.op](left.value, right.value), node.line)  # type: ignore[arg-type]
+        node.left = left
+        node.right = right
+        return node
+
+    def _plakt(self, operands: list[n.Expr], line: int) -> n.Expr:
+        """Rebuild a flattened `plakt` chain, merging each run of text literals into one.
+
+        Anything else keeps its `+`, so it raises `TypeError` exactly as at level 0.
+        Regrouping `(acc + a) + b` as `acc + (a + b)` for text `a`, `b` is safe: it gives
+        the same string when `acc` is text and the same `TypeError` when it is not.
+        """
+        out: n.Expr | None = None
+        run: list[n.Str] = []
+        for op in [*operands, None]:
+            if isinstance(op, n.Str):
+                run.append(op)
+                continue
+            if run:
+                text = n.Str("".join(s.value for s in run), run[0].line)
+                out = text if out is None else n.BinOp("plakt", out, text, line)
+                run = []
+            if op is not None:
+                out = op if out is None else n.BinOp("plakt", out, op, line)
+        assert out is not None
+        return out
+
+    def _compare(self, node: n.Compare) -> n.Expr:
+        node.left = self.expr(node.left)
+        node.comparators = [self.expr(c) for c in node.comparators]
+        operands = [node.left, *node.comparators]
+        if all(isinstance(op, _LITERALS) for op in operands):
+            try:
+                result = all(
+                    _CMP[op](a.value, b.value)  # type: ignore[union-attr]
+                    for op, a, b in zip(node.ops, operands, operands[1:])
+                )
+            except TypeError:  # e.g. `tekst a isgroterdan getal 1`: leave it for runtime
+                return node
+            return n.Const(result, node.line)
+        return node
+
+    def _unaryop(self, node: n.UnaryOp) -> n.Expr:
+        operand = self.expr(node.operand)
+        if isinstance(operand, _LITERALS):
+            return n.Const(not operand.value, node.line)
+        node.operand = operand
+        return node
+
+    def _call(self, node: n.Call) -> n.Expr:
+        node.args = [self.expr(a) for a in node.args]
+        return node
+
+    def _seq(self, node: n.Seq) -> n.Expr:
+        node.items = [self.expr(i) for i in node.items]
+        return node
+
+    def _seq_range(self, node: n.SeqRange) -> n.Expr:
+        node.start = self.expr(node.start)
+        node.stop = self.expr(node.stop)
+        if node.step is not None:
+            node.step = self.expr(node.step)
+        return node
+
+
+def _identity(node: n.Expr) -> n.Expr:
+    return node
+
+
+def _plakt_operands(node: n.BinOp) -> list[n.Expr]:
+    """Flatten a left-leaning `plakt` chain: `((a plakt b) plakt c)` -> `[a, b, c]`."""
+    rights: list[n.Expr] = []
+    cur: n.Expr = node
+    while isinstance(cur, n.BinOp) and cur.op == "plakt":
+        rights.append(cur.right)
+        cur = cur.left
+    rights.append(cur)
+    rights.reverse()
+    return rights
+
+
+def _first_yield(stmts: list[n.Stmt]) -> n.Yield | None:
+    """A `lever` in `stmts`, not counting those in nested funksies."""
+    stack: list[object] = list(stmts)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, n.Yield):
+            return node
+        if not isinstance(node, n.FunctionDef):
+            stack.extend(n.iter_child_nodes(node))
+    return None
+
+
+# --- tail-call elimination ------------------------------------------------------
+
+
+def _self_calls(stmts: list[n.Stmt], name: str) -> list[n.Call]:
+    """Calls to `name` in `stmts`, not counting calls made from nested funksies."""
+    found: list[n.Call] = []
+    stack: list[object] = list(stmts)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, n.FunctionDef):
+            continue
+        if isinstance(node, n.Call) and node.func == name:
+            found.append(node)
+        stack.extend(n.iter_child_nodes(node))
+    return found
+
+
+def _rewrite_tail_calls(stmts: list[n.Stmt], fn: n.FunctionDef, done: set[int]) -> list[n.Stmt]:
+    out: list[n.Stmt] = []
+    for stmt in stmts:
+        value = stmt.value if isinstance(stmt, n.Return) else None
+        if isinstance(value, n.Call) and value.func == fn.name and len(value.args) == len(fn.params):
+            done.add(id(value))
+            if fn.params:
+                out.append(n.Rebind(list(fn.params), value.args, stmt.line))
+            out.append(n.Continue(stmt.line))
+            break
+        if isinstance(stmt, n.If):
+            stmt.body = _rewrite_tail_calls(stmt.body, fn, done)
+            stmt.orelse = _rewrite_tail_calls(stmt.orelse, fn, done)
+        # loops are left alone: a `continue` there would restart the inner loop
+        out.append(stmt)
+    return out
+
+
+def _eliminate_tail_calls(fn: n.FunctionDef, filename: str) -> None:
+    if fn.memo_size is not None:
+        return  # `onthoud` funksies must keep going through their cache
+    if fn.generator:
+        return  # `geeftterug` ends a generator; looping would start levering the callee's values
+    calls = _self_calls(fn.body, fn.name)
+    if not calls:
+        return
+
+    def warn(message: str, line: int) -> None:
+        warnings.warn_explicit(
+            f"funksie '{fn.name}': {message}; not rewritten into a loop", PlatsWarning, filename, line
+        )
+
+    if any(isinstance(node, n.FunctionDef) for stmt in fn.body for node in n.walk(stmt)):
+        warn("contains a nested funksie that could capture its parameters", fn.line)
+        return
+
+    done: set[int] = set()
+    body = _rewrite_tail_calls(fn.body, fn, done)
+    for call in sorted(calls, key=lambda c: c.line):
+        if id(call) in done:
+            continue
+        if len(call.args) != len(fn.params):
+            warn(f"recursive call passes {len(call.args)} argument(s), expected {len(fn.params)}", call.line)
+        else:
+            warn("recursive call is not in tail position (only 'geeftterug roep ...' outside loops)", call.line)
+    if not done:
+        return
+
+    if not (body and isinstance(body[-1], (n.Return, n.Continue))):
+        body.append(n.Return(n.Const(None, fn.end_line or fn.line), fn.end_line or fn.line))
+    fn.body = [n.While(n.Const(True, fn.line), fn.line, body, fn.end_line)]
+
+
+def optimize(mod: n.Module, level: int = 1, filename: str = "<plats>") -> n.Module:
+    """Optimize `mod` in place at `level` (0 = off) and return it.
+
+    `filename` is only used to locate `PlatsWarning` diagnostics.
+    """
+    if not 0 <= level <= MAX_OPT_LEVEL:
+        raise ValueError(f"optimize level must be between 0 and {MAX_OPT_LEVEL}, got {level}")
+    if level >= 1:
+        mod.body = _Optimizer(filename).block(mod.body)
+    return mod
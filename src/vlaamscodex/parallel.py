@@ -0,0 +1,189 @@
+"""Compile one very large `.plats` file on several cores.
+
+    py_src = compile_plats_parallel(big_src, jobs=8)   # == compile_plats(big_src)
+    plats build big.plats -j 8
+
+The source is cut at top-level boundaries: between top-level funksies and statements,
+and between the statements directly inside a top-level `plan` (a `plan` has no scope of
+its own, its body is lowered at module level). The pieces are grouped into chunks of
+about equal size, and each chunk is parsed, optimized, lowered, checked with Python's
+`compile()` and rendered in a worker process.
+
+Workers tokenize their chunk starting at its first line in the file, so tree nodes, the
+line map and errors carry the original `.plats` line numbers without any remapping.
+The rendered chunks are concatenated in order, keeping the `from functools import
+lru_cache` and the `reeks` class definition of only the first chunk that has them;
+optimizer warnings are re-emitted in the calling process. The error raised is the first
+one in file order, like the sequential compiler; unclosed blocks at the end of the file
+are reported by compiling the file sequentially, so the message lists every open block.
+
+Unlike `compile_plats()`, every chunk goes through `compile()`, so errors only Python
+detects (`geeftterug` outside a funksie) raise `SyntaxError` here. `optimize=2` is not
+supported: fast locals wrap a whole `plan` body in one function. Inputs below
+`MIN_CHUNK_LINES * 2` lines, or `jobs=1`, are compiled in-process.
+"""
+
+from __future__ import annotations
+
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+from .compiler import _build_ast, _gc_paused, _reeks_prelude, _render_block, lower
+from .nodes import Module
+from .optimizer import optimize as _optimize
+from .parser import parse_lines, tokenize, tokenize_line
+
+__all__ = ["MIN_CHUNK_LINES", "compile_plats_parallel", "compile_plats_parallel_with_map", "split_toplevel"]
+
+# Smallest chunk worth a round trip to a worker.
+MIN_CHUNK_LINES = 2000
+# Lines the sequential compiler emits once per module, at the first use: first line -> key.
+_ONCE = {"from functools import lru_cache": "lru_cache", "from array import array as __plats_array__": "reeks"}
+_REEKS_LINES: list[int] = []  # rendered length of the reeks prelude, computed on first use
+
+
+def _once_spans(out: list[str]) -> list[tuple[int, int, str]]:
+    """`(start, count, key)` of every once-per-module block in a rendered chunk."""
+    spans = []
+    for first, key in _ONCE.items():
+        if first in out:
+            if key == "reeks":
+                if not _REEKS_LINES:
+                    rendered: list[str] = []
+                    _render_block(_reeks_prelude(), 0, rendered, [])
+                    _REEKS_LINES.append(len(rendered))
+                count = _REEKS_LINES[0]
+            else:
+                count = 1
+            spans.append((out.index(first), count, key))
+    return spans
+
+
+def _opens_block(tokens: list[str]) -> bool:
+    """Whether `Parser.feed` opens a block for this line (`anders doe` continues one)."""
+    if tokens[:2] == ["plan", "doe"]:
+        return True
+    if tokens[-1] != "doe":
+        return False
+    if tokens[0] == "maak":
+        return tokens[1:2] in (["funksie"], ["onthoud"])
+    return tokens[0] in ("als", "zolang", "voor")
+
+
+def split_toplevel(lines: list[str]) -> tuple[list[int], list[int], bool]:
+    """Find where `lines` may be cut: `(cuts, plan_lines, balanced)`.
+
+    `cuts` are 0-based line indexes at which a new top-level piece may start, in order.
+    `plan_lines` are the `plan doe` / `gedaan` lines of top-level `plan` blocks: they
+    produce no code and must be blanked out of the chunks. `balanced` is False when blocks
+    are still open at the end of the file.
+    """
+    cuts: list[int] = []
+    plan_lines: list[int] = []
+    plans = 0  # open top-level `plan` blocks (their bodies are spliced)
+    depth = 0  # open blocks inside the current piece
+    for i, raw in enumerate(lines):
+        tokens = tokenize_line(raw)
+        if not tokens:
+            continue
+        if depth == 0:
+            if tokens[:2] == ["plan", "doe"]:
+                plans += 1
+                plan_lines.append(i)
+                continue
+            if tokens == ["gedaan"] and plans:
+                plans -= 1
+                plan_lines.append(i)
+                continue
+            cuts.append(i)
+            if _opens_block(tokens):
+                depth = 1
+        elif tokens == ["gedaan"]:
+            depth -= 1
+        elif _opens_block(tokens):
+            depth += 1
+    return cuts, plan_lines, plans == 0 and depth == 0
+
+
+def _compile_chunk(
+    job: tuple[int, str, int, str],
+) -> tuple[str, list[int], list[tuple[int, int, str]], list[tuple[str, int]]]:
+    """Worker: one chunk -> (rendered Python, `.plats` line per Python line,
+    once-per-module blocks (see `_once_spans`), warnings)."""
+    first_line, text, optimize, filename = job
+    with warnings.catch_warnings(record=True) as caught, _gc_paused():
+        warnings.simplefilter("always")
+        module = lower(_optimize(parse_lines(tokenize(text, first_line)), optimize, filename))
+        compile(module, filename, "exec", dont_inherit=True)  # raises what only Python detects
+        out: list[str] = []
+        line_map: list[int] = []
+        _render_block(module.body, 0, out, line_map)
+    return "\n".join(out), line_map, _once_spans(out), [(str(w.message), w.lineno) for w in caught]
+
+
+def _chunks(lines: list[str], jobs: int, filename: str, optimize: int) -> list[tuple[int, str, int, str]] | None:
+    cuts, plan_lines, balanced = split_toplevel(lines)
+    if not balanced:
+        return None
+    for i in plan_lines:
+        lines[i] = ""
+    target = max(MIN_CHUNK_LINES, len(lines) // (jobs * 4))  # a few chunks per worker, for balance
+    bounds = [0]
+    for cut in cuts:
+        if cut - bounds[-1] >= target:
+            bounds.append(cut)
+    bounds.append(len(lines))
+    return [(a + 1, "\n".join(lines[a:b]), optimize, filename) for a, b in zip(bounds, bounds[1:]) if a < b]
+
+
+def compile_plats_parallel_with_map(
+    plats_src: str, *, optimize: int = 0, filename: str = "<plats>", jobs: int | None = None
+) -> tuple[str, tuple[int, ...]]:
+    """Like `compile_plats_with_map()`, with the chunks compiled in `jobs` processes."""
+    from .errors import PlatsWarning
+
+    if optimize >= 2:
+        raise ValueError("optimize=2 (fast locals) needs the whole module; use compile_plats()")
+    _optimize(Module(), optimize)  # validate the level up front
+    jobs = jobs or os.cpu_count() or 1
+    lines = plats_src.splitlines()
+    chunks = _chunks(lines, jobs, filename, optimize)
+    if chunks is None:  # unclosed blocks: the sequential compiler reports them all
+        out, line_map = [], []
+        with _gc_paused():
+            _render_block(_build_ast(plats_src, optimize, filename).body, 0, out, line_map)
+        return "\n".join(out) + "\n", tuple(line_map)
+    if jobs == 1 or len(lines) < MIN_CHUNK_LINES * 2 or len(chunks) == 1:
+        results = list(map(_compile_chunk, chunks))
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as pool:
+            results = list(pool.map(_compile_chunk, chunks))
+
+    out: list[str] = []
+    line_map: list[int] = []
+    emitted: set[str] = set()
+    for text, chunk_map, spans, caught in results:
+        for message, lineno in caught:
+            warnings.warn_explicit(message, PlatsWarning, filename, lineno)
+        drop = sorted((start, count) for start, count, key in spans if key in emitted)
+        if drop:  # the module has these once, at their first use
+            chunk_lines = text.split("\n")
+            for start, count in reversed(drop):
+                del chunk_lines[start : start + count], chunk_map[start : start + count]
+            text = "\n".join(chunk_lines)
+        emitted.update(key for _, _, key in spans)
+        if text:
+            out.append(text)
+            line_map.extend(chunk_map)
+    return "\n".join(out) + "\n", tuple(line_map)
+
+
+def compile_plats_parallel(
+    plats_src: str, *, optimize: int = 0, filename: str = "<plats>", jobs: int | None = None
+) -> str:
+    """Compile Platskript source to Python source using `jobs` processes (default: CPU count).
+
+    The result equals `compile_plats(plats_src, optimize=optimize)` for any valid program.
+    """
+    return compile_plats_parallel_with_map(plats_src, optimize=optimize, filename=filename, jobs=jobs)[0]
@@ -0,0 +1,516 @@
+"""Platskript lexer + parser.
+
+The lexer turns source text into `(lineno, tokens)` pairs: Platskript is line oriented
+(one statement or block header per line), whitespace separated, with `#` comments.
+
+The parser consumes those lines one at a time and builds the syntax tree from
+`vlaamscodex.nodes`. Expressions are parsed with Python's operator precedence, so the
+tree means exactly what the old text-pasting compiler produced:
+
+    ofwel  <  enook  <  nie  <  comparisons  <  plakt/derbij/deraf  <  keer/gedeeld
+"""
+
+from __future__ import annotations
+
+import keyword
+import re
+from typing import Iterable, Iterator
+
+from .errors import PlatsSyntaxError
+from .nodes import (
+    Assign,
+    BinOp,
+    Block,
+    Break,
+    Call,
+    Compare,
+    Const,
+    Expr,
+    ExprStmt,
+    For,
+    ForEach,
+    FunctionDef,
+    If,
+    Module,
+    Name,
+    Num,
+    Plan,
+    Print,
+    Reduce,
+    Return,
+    Seq,
+    SeqRange,
+    Stmt,
+    Str,
+    UnaryOp,
+    While,
+    Yield,
+)
+
+OP_MAP = {
+    "plakt": "+",
+    "derbij": "+",
+    "deraf": "-",
+    "keer": "*",
+    "gedeeld": "/",
+    "isgelijk": "==",
+    "isniegelijk": "!=",
+    "isgroterdan": ">",
+    "iskleinerdan": "<",
+    "enook": "and",
+    "ofwel": "or",
+    "nie": "not",
+}
+
+_EXPR_STOP = {"dan", "doe", "amen"}
+
+# Cache size of `maak onthoud funksie ...` without an explicit size (as `functools.lru_cache`).
+DEFAULT_ONTHOUD_SIZE = 128
+
+# Binding power per binary operator keyword (higher binds tighter). `nie` is a prefix
+# operator sitting between `enook` and the comparisons, like Python's `not`.
+_BINARY_PREC = {
+    "ofwel": 1,
+    "enook": 2,
+    "isgelijk": 4,
+    "isniegelijk": 4,
+    "isgroterdan": 4,
+    "iskleinerdan": 4,
+    "plakt": 5,
+    "derbij": 5,
+    "deraf": 5,
+    "keer": 6,
+    "gedeeld": 6,
+}
+_NOT_PREC = 3
+_CMP_PREC = 4
+_ATOM_PREC = max(_BINARY_PREC.values()) + 1  # binds tighter than any operator: one operand only
+
+# `<name> van <expr>` reductions over a reeks (or any sequence of numbers).
+REDUCTIONS = ("som", "minimum", "maximum", "gemiddelde", "lengte")
+
+_NUM_RE = re.compile(r"-?\d+(\.\d+)?")
+
+
+def _is_identifier(token: str) -> bool:
+    return token.isidentifier() and not keyword.iskeyword(token)
+
+
+def _parse_number(token: str, line: int) -> Num:
+    if token.isdigit():
+        return Num(int(token), line)
+    if not _NUM_RE.fullmatch(token):
+        raise PlatsSyntaxError(f"invalid number literal: {token}", line)
+    return Num(float(token) if "." in token else int(token), line)
+
+
+# --- lexer -------------------------------------------------------------------
+
+
+def tokenize_line(raw: str) -> list[str]:
+    """Split one source line into tokens, dropping a trailing `# comment`."""
+    tokens = raw.split()
+    if "#" not in raw:
+        return tokens
+    for i, tok in enumerate(tokens):
+        if tok.startswith("#"):
+            return tokens[:i]
+    return tokens
+
+
+def tokenize(plats_src: str, first_lineno: int = 1) -> Iterator[tuple[int, list[str]]]:
+    """Yield `(lineno, tokens)` for every line that carries tokens."""
+    for lineno, raw in enumerate(plats_src.splitlines(), first_lineno):
+        tokens = tokenize_line(raw)
+        if tokens:
+            yield lineno, tokens
+
+
+# --- expressions -------------------------------------------------------------
+
+
+class _ExprParser:
+    """Precedence-climbing parser over the tokens of one expression."""
+
+    __slots__ = ("tokens", "pos", "line")
+
+    def __init__(self, tokens: list[str], line: int) -> None:
+        self.tokens = tokens
+        self.pos = 0
+        self.line = line
+
+    def _peek(self) -> str | None:
+        if self.pos < len(self.tokens):
+            tok = self.tokens[self.pos]
+            if tok not in _EXPR_STOP:
+                return tok
+        return None
+
+    def _operand(self, after: str, min_prec: int) -> Expr:
+        if self._peek() is None:
+            raise PlatsSyntaxError(f"expected expression after '{after}'", self.line)
+        return self.parse(min_prec)
+
+    def parse(self, min_prec: int = 0) -> Expr:
+        if self._peek() == "nie":
+            self.pos += 1
+            left: Expr = UnaryOp("nie", self._operand("nie", _NOT_PREC), self.line)
+        else:
+            left = self.parse_atom()
+
+        tokens = self.tokens
+        while self.pos < len(tokens):
+            tok = tokens[self.pos]
+            prec = _BINARY_PREC.get(tok)
+            if prec is None or prec < min_prec:
+                break
+            self.pos += 1
+            if prec == _CMP_PREC:
+                # Comparisons chain like Python's: a < b < c
+                ops = [tok]
+                comparators = [self._operand(tok, _CMP_PREC + 1)]
+                while self.pos < len(tokens) and _BINARY_PREC.get(tokens[self.pos]) == _CMP_PREC:
+                    ops.append(tokens[self.pos])
+                    self.pos += 1
+                    comparators.append(self._operand(ops[-1], _CMP_PREC + 1))
+                left = Compare(left, ops, comparators, self.line)
+                continue
+            left = BinOp(tok, left, self._operand(tok, prec + 1), self.line)
+        return left
+
+    def parse_atom(self) -> Expr:
+        tokens = self.tokens
+        line = self.line
+        if self.pos >= len(tokens) or tokens[self.pos] in _EXPR_STOP:
+            raise PlatsSyntaxError("expected expression", line)
+        tok = tokens[self.pos]
+        self.pos += 1
+
+        if tok == "da":
+            if self.pos >= len(tokens):
+                raise PlatsSyntaxError("da without identifier", line)
+            self.pos += 1
+            name = tokens[self.pos - 1]
+            if not _is_identifier(name):
+                raise PlatsSyntaxError(f"invalid identifier: {name}", line)
+            return Name(name, line)
+
+        if tok == "tekst":
+            start = self.pos
+            while (
+                self.pos < len(tokens)
+                and tokens[self.pos] not in OP_MAP
+                and tokens[self.pos] not in _EXPR_STOP
+                and tokens[self.pos] != "en"
+            ):
+                self.pos += 1
+            return Str(" ".join(tokens[start : self.pos]), line)
+
+        if tok == "getal":
+            if self.pos >= len(tokens):
+                raise PlatsSyntaxError("getal without value", line)
+            self.pos += 1
+            return _parse_number(tokens[self.pos - 1], line)
+
+        if tok == "spatie":
+            return Str(" ", line)
+
+        if tok == "roep":
+            # `roep NAME [met ARG en ARG ...]`: the arguments run to the end of the expression
+            if self.pos >= len(tokens) or not _is_identifier(tokens[self.pos]):
+                raise PlatsSyntaxError("roep missing function name", line)
+            func = tokens[self.pos]
+            self.pos += 1
+            if self._peek() != "met":
+                return Call(func, [], line)
+            end = self.pos + 1
+            while end < len(tokens) and tokens[end] not in _EXPR_STOP:
+                end += 1
+            args = [parse_expr(a, line) for a in _split_args(tokens[self.pos + 1 : end])]
+            self.pos = end
+            return Call(func, args, line)
+
+        if tok == "reeks" and self._peek() in ("met", "van"):
+            # `reeks met A en B ...` / `reeks van A tot B [stap C]`: runs to the end of the expression
+            form = tokens[self.pos]
+            end = self.pos + 1
+            while end < len(tokens) and tokens[end] not in _EXPR_STOP:
+                end += 1
+            rest = tokens[self.pos + 1 : end]
+            self.pos = end
+            if form == "met":
+                return Seq([parse_expr(a, line) for a in _split_args(rest)], line)
+            return SeqRange(*_range_parts(rest, "reeks", line), line)
+
+        if tok in REDUCTIONS and self._peek() == "van":
+            self.pos += 1
+            return Reduce(tok, self._operand("van", _ATOM_PREC), line)
+
+        if tok in OP_MAP:
+            raise PlatsSyntaxError(f"expected expression before '{tok}'", line)
+
+        # fallback: bare identifiers and numbers
+        if _is_identifier(tok):
+            return Name(tok, line)
+        if _NUM_RE.fullmatch(tok):
+            return _parse_number(tok, line)
+        raise PlatsSyntaxError(f"unexpected token: {tok}", line)
+
+
+def parse_expr(tokens: list[str], line: int) -> Expr:
+    """Parse a complete expression; an empty token list means `None`."""
+    if not tokens:
+        return Const(None, line)
+    p = _ExprParser(tokens, line)
+    expr = p.parse()
+    if p.pos < len(tokens):
+        raise PlatsSyntaxError(f"unexpected token in expression: {tokens[p.pos]}", line)
+    return expr
+
+
+def _split_args(tokens: list[str]) -> list[list[str]]:
+    """Split arguments separated by the token `en`."""
+    args: list[list[str]] = []
+    cur: list[str] = []
+    for t in tokens:
+        if t == "en":
+            if cur:
+                args.append(cur)
+                cur = []
+        else:
+            cur.append(t)
+    if cur:
+        args.append(cur)
+    return args
+
+
+def _range_parts(tokens: list[str], keyword: str, line: int) -> tuple[Expr, Expr, Expr | None]:
+    """`<start> tot <stop> [stap <step>]` (after `voor x van` / `reeks van`)."""
+    if "tot" not in tokens:
+        raise PlatsSyntaxError(f"{keyword} missing 'tot'", line)
+    i = tokens.index("tot")
+    start, rest = tokens[:i], tokens[i + 1 :]
+    step: list[str] | None = None
+    if "stap" in rest:
+        i = rest.index("stap")
+        rest, step = rest[:i], rest[i + 1 :]
+    for part, what in ((start, "van"), (rest, "tot"), (step, "stap")):
+        if part is not None and not part:
+            raise PlatsSyntaxError(f"expected expression after '{what}'", line)
+    return (
+        parse_expr(start, line),
+        parse_expr(rest, line),
+        parse_expr(step, line) if step is not None else None,
+    )
+
+
+# --- statements --------------------------------------------------------------
+
+
+_BLOCK_KINDS = {Plan: "plan", FunctionDef: "funksie", If: "als", While: "zolang", For: "voor", ForEach: "voor"}
+
+
+def _block_kind(node: Stmt) -> str:
+    return _BLOCK_KINDS[type(node)]
+
+
+class Parser:
+    """Line-driven parser: `feed()` one tokenized line at a time, then `finish()`."""
+
+    def __init__(self) -> None:
+        self.module = Module()
+        self.stack: list[Block] = []
+
+    @property
+    def body(self) -> list[Stmt]:
+        """The statement list new statements are appended to."""
+        if not self.stack:
+            return self.module.body
+        block = self.stack[-1]
+        if isinstance(block, If) and block.else_line:
+            return block.orelse
+        return block.body
+
+    def feed(self, lineno: int, tokens: list[str]) -> None:
+        # close block
+        if tokens == ["gedaan"]:
+            if not self.stack:
+                raise PlatsSyntaxError("gedaan without open block", lineno)
+            self.stack.pop().end_line = lineno
+            return
+
+        # start program
+        if tokens[:2] == ["plan", "doe"]:
+            self._open(Plan(lineno))
+            return
+
+        # function start: maak [onthoud [SIZE]] funksie NAME [met PARAMS...] doe
+        if tokens[0] == "maak" and tokens[-1] == "doe" and tokens[1:2] in (["funksie"], ["onthoud"]):
+            self._open(self._function_header(tokens, lineno))
+            return
+
+        # control flow: als / anders / zolang / voor
+        head = tokens[0]
+        if tokens[-1] == "doe" and head in ("als", "anders", "zolang", "voor"):
+            if head == "anders":
+                self._else(tokens, lineno)
+            elif head == "als":
+                cond = tokens[1:-2] if tokens[-2] == "dan" else tokens[1:-1]
+                self._open(If(self._condition(cond, "als", lineno), lineno))
+            elif head == "zolang":
+                self._open(While(self._condition(tokens[1:-1], "zolang", lineno), lineno))
+            elif tokens[1:2] == ["elk"] and tokens[2:3] != ["van"]:  # `voor elk van ...` is a range loop over `elk`
+                self._open(self._for_each_header(tokens, lineno))
+            else:
+                self._open(self._for_header(tokens, lineno))
+            return
+
+        # statements must end with 'amen'
+        if tokens[-1] != "amen":
+            raise PlatsSyntaxError(f"missing 'amen' statement terminator: {' '.join(tokens)}", lineno)
+        tokens = tokens[:-1]
+        if not tokens:
+            return
+
+        self.body.append(self._statement(tokens, lineno))
+
+    def finish(self) -> Module:
+        if self.stack:
+            kinds = [_block_kind(b) for b in self.stack]
+            raise PlatsSyntaxError(f"unclosed blocks: {kinds}", self.stack[-1].line)
+        return self.module
+
+    def _open(self, block: Block) -> None:
+        self.body.append(block)
+        self.stack.append(block)
+
+    def _condition(self, tokens: list[str], keyword: str, lineno: int) -> Expr:
+        if not tokens:
+            raise PlatsSyntaxError(f"{keyword} without condition", lineno)
+        return parse_expr(tokens, lineno)
+
+    def _else(self, tokens: list[str], lineno: int) -> None:
+        if tokens != ["anders", "doe"]:
+            raise PlatsSyntaxError(f"expected 'anders doe': {' '.join(tokens)}", lineno)
+        block = self.stack[-1] if self.stack else None
+        if not isinstance(block, If) or block.else_line:
+            raise PlatsSyntaxError("anders without matching als", lineno)
+        block.else_line = lineno
+
+    def _for_header(self, tokens: list[str], lineno: int) -> For:
+        # voor VAR van START tot STOP [stap STEP] doe
+        if len(tokens) < 3 or tokens[2] != "van":
+            raise PlatsSyntaxError("voor expects: voor <naam> van <start> tot <einde> [stap <stap>] doe", lineno)
+        target = tokens[1]
+        if not _is_identifier(target):
+            raise PlatsSyntaxError(f"invalid identifier: {target}", lineno)
+        return For(target, *_range_parts(tokens[3:-1], "voor", lineno), lineno)
+
+    def _for_each_header(self, tokens: list[str], lineno: int) -> ForEach:
+        # voor elk VAR uit EXPR doe
+        if len(tokens) < 6 or tokens[3] != "uit":
+            raise PlatsSyntaxError("voor elk expects: voor elk <naam> uit <expr> doe", lineno)
+        target = tokens[2]
+        if not _is_identifier(target):
+            raise PlatsSyntaxError(f"invalid identifier: {target}", lineno)
+        return ForEach(target, parse_expr(tokens[4:-1], lineno), lineno)
+
+    def _in_loop(self) -> bool:
+        for block in reversed(self.stack):
+            if isinstance(block, (While, For, ForEach)):
+                return True
+            if isinstance(block, (FunctionDef, Plan)):
+                return False
+        return False
+
+    def _function(self) -> FunctionDef | None:
+        """The innermost open funksie, or None outside of one."""
+        for block in reversed(self.stack):
+            if isinstance(block, FunctionDef):
+                return block
+        return None
+
+    def _function_header(self, tokens: list[str], lineno: int) -> FunctionDef:
+        memo_size = None
+        if tokens[1] == "onthoud":
+            rest = tokens[2:]
+            memo_size = DEFAULT_ONTHOUD_SIZE
+            if rest and rest[0].isdigit():
+                memo_size = int(rest[0])
+                if memo_size < 1:
+                    raise PlatsSyntaxError("onthoud size must be at least 1", lineno)
+                rest = rest[1:]
+            if rest[:1] != ["funksie"]:
+                raise PlatsSyntaxError("expected: maak onthoud [<grootte>] funksie <naam> ...", lineno)
+            tokens = ["maak", *rest]
+        if len(tokens) < 4:
+            raise PlatsSyntaxError("function missing name", lineno)
+        name = tokens[2]
+        if not _is_identifier(name):
+            raise PlatsSyntaxError(f"invalid function name: {name}", lineno)
+        if len(tokens) > 4 and tokens[3] != "met":
+            raise PlatsSyntaxError("function missing 'met'", lineno)
+        params = [t for t in tokens[4:-1] if t != "en"]
+        for p in params:
+            if not _is_identifier(p):
+                raise PlatsSyntaxError(f"invalid parameter name: {p}", lineno)
+        return FunctionDef(name, params, lineno, memo_size=memo_size)
+
+    def _statement(self, tokens: list[str], lineno: int) -> Stmt:
+        head = tokens[0]
+
+        if head == "klap":
+            return Print(parse_expr(tokens[1:], lineno), lineno)
+
+        if head == "zet":
+            if len(tokens) < 3 or tokens[2] != "op":
+                raise PlatsSyntaxError("zet missing 'op'", lineno)
+            var = tokens[1]
+            if not _is_identifier(var):
+                raise PlatsSyntaxError(f"invalid identifier: {var}", lineno)
+            return Assign(var, parse_expr(tokens[3:], lineno), lineno)
+
+        if head == "roep":
+            if len(tokens) < 2:
+                raise PlatsSyntaxError("roep missing function name", lineno)
+            func = tokens[1]
+            if not _is_identifier(func):
+                raise PlatsSyntaxError(f"invalid function name: {func}", lineno)
+            if len(tokens) > 2 and tokens[2] != "met":
+                raise PlatsSyntaxError(f"roep expects 'met' before arguments: {' '.join(tokens)} amen", lineno)
+            args = [parse_expr(a, lineno) for a in _split_args(tokens[3:])]
+            return ExprStmt(Call(func, args, lineno), lineno)
+
+        if head == "geeftterug":
+            return Return(parse_expr(tokens[1:], lineno), lineno)
+
+        if head == "lever":
+            fn = self._function()
+            if fn is None:
+                raise PlatsSyntaxError("lever outside of funksie", lineno)
+            if fn.memo_size is not None:
+                # the cache would hand every later caller the same, used-up generator
+                raise PlatsSyntaxError(f"onthoud funksie '{fn.name}' cannot lever", lineno)
+            if len(tokens) < 2:
+                raise PlatsSyntaxError("lever missing value", lineno)
+            fn.generator = True
+            return Yield(parse_expr(tokens[1:], lineno), lineno)
+
+        if head == "stop" and len(tokens) == 1:
+            if not self._in_loop():
+                raise PlatsSyntaxError("stop outside of zolang/voor", lineno)
+            return Break(lineno)
+
+        raise PlatsSyntaxError(f"unknown instruction: {' '.join(tokens)} amen", lineno)
+
+
+def parse_lines(lines: Iterable[tuple[int, list[str]]]) -> Module:
+    parser = Parser()
+    for lineno, tokens in lines:
+        parser.feed(lineno, tokens)
+    return parser.finish()
+
+
+def parse_plats(plats_src: str) -> Module:
+    """Parse Platskript source into a `nodes.Module`."""
+    return parse_lines(tokenize(plats_src))
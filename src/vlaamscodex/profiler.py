@@ -0,0 +1,280 @@
+"""`plats profile`: a line-level CPU profiler that reports in Platskript terms.
+
+Compiled Platskript code objects carry `.plats` line numbers (see `compiler.lower`), so
+every sample is attributed to the Plats line and funksie it came from; the generated
+Python is never shown. Only the program's own code objects are instrumented:
+
+- Python 3.12+: `sys.monitoring` with *local* events (`PY_START`, `PY_RESUME`,
+  `PY_RETURN`, `PY_YIELD`, `LINE`) on those code objects, so the standard library and
+  C code run at full speed;
+- older Pythons: `sys.settrace`, returning a local tracer only for the program's frames.
+  (`sys.setprofile` never sees line events, so it cannot attribute time to lines.)
+
+Time spent in library or C calls is charged to the Plats line that made the call. Self
+time excludes nested funksie calls; cumulative time includes them (counted once for
+recursive funksies).
+"""
+
+from __future__ import annotations
+
+import dis
+import sys
+import time
+from dataclasses import dataclass
+from types import CodeType, FrameType
+from typing import Any, Callable
+
+from .compiler import MAIN_FUNCTION, REEKS_CLASS, compile_plats_code
+
+_MAIN_NAMES = {"<module>", MAIN_FUNCTION}
+_RESUME = dis.opmap.get("RESUME")  # 3.11+
+
+
+@dataclass(frozen=True, slots=True)
+class FunctionStats:
+    name: str  # funksie name, or "plan" for the main program
+    line: int  # first .plats line
+    calls: int
+    self_ns: int
+    cum_ns: int
+
+
+@dataclass(frozen=True, slots=True)
+class LineStats:
+    line: int
+    hits: int
+    self_ns: int
+    cum_ns: int
+    source: str
+
+
+@dataclass(frozen=True, slots=True)
+class ProfileReport:
+    filename: str
+    backend: str  # "sys.monitoring" or "sys.settrace"
+    total_ns: int
+    functions: tuple[FunctionStats, ...]
+    lines: tuple[LineStats, ...]
+
+    def top_functions(self, n: int = 10, sort: str = "self") -> list[FunctionStats]:
+        return sorted(self.functions, key=lambda f: (getattr(f, f"{sort}_ns"), f.calls), reverse=True)[:n]
+
+    def top_lines(self, n: int = 10, sort: str = "self") -> list[LineStats]:
+        return sorted(self.lines, key=lambda s: (getattr(s, f"{sort}_ns"), s.hits), reverse=True)[:n]
+
+    def format(self, top: int = 10, sort: str = "self") -> str:
+        total = self.total_ns or 1
+        out = [f"{self.filename}: {self.total_ns / 1e6:.3f} ms total ({self.backend})", ""]
+        out.append(f"{'funksie':<24} {'line':>5} {'calls':>8} {'self ms':>10} {'cum ms':>10} {'self %':>7}")
+        for f in self.top_functions(top, sort):
+            out.append(
+                f"{f.name:<24} {f.line:>5} {f.calls:>8} {f.self_ns / 1e6:>10.3f} "
+                f"{f.cum_ns / 1e6:>10.3f} {100 * f.self_ns / total:>6.1f}%"
+            )
+        out.append("")
+        out.append(f"{'line':>5} {'hits':>8} {'self ms':>10} {'cum ms':>10} {'self %':>7}  source")
+        for s in self.top_lines(top, sort):
+            out.append(
+                f"{s.line:>5} {s.hits:>8} {s.self_ns / 1e6:>10.3f} {s.cum_ns / 1e6:>10.3f} "
+                f"{100 * s.self_ns / total:>6.1f}%  {s.source}"
+            )
+        return "\n".join(out)
+
+
+def _code_objects(code: CodeType) -> list[CodeType]:
+    """`code` and its nested code objects, without the generated `reeks` class: its time
+    counts towards the line that uses it."""
+    found = [code]
+    for const in code.co_consts:
+        if isinstance(const, CodeType) and const.co_name != REEKS_CLASS:  # its methods are nested in it
+            found.extend(_code_objects(const))
+    return found
+
+
+class _Frame:
+    __slots__ = ("code", "start", "child", "line", "line_start")
+
+    def __init__(self, code: CodeType, now: int) -> None:
+        self.code = code
+        self.start = now
+        self.child = 0
+        self.line = 0
+        self.line_start = now
+
+
+class _Collector:
+    """Turns enter/line/leave events into per-funksie and per-line totals."""
+
+    def __init__(self, clock: Callable[[], int] = time.perf_counter_ns) -> None:
+        self.clock = clock
+        self.stack: list[_Frame] = []
+        self.active: dict[CodeType, int] = {}  # recursion depth per code object
+        self.funcs: dict[CodeType, list[int]] = {}  # calls, self, cum
+        self.lines: dict[int, list[int]] = {}  # hits, self, cum
+        self.open_lines: dict[int, int] = {}  # lines that callers further up are waiting on
+
+    def _line(self, line: int) -> list[int]:
+        stats = self.lines.get(line)
+        if stats is None:
+            stats = self.lines[line] = [0, 0, 0]
+        return stats
+
+    def _charge_line(self, frame: _Frame, now: int) -> None:
+        if frame.line:
+            elapsed = now - frame.line_start
+            stats = self._line(frame.line)
+            stats[1] += elapsed
+            if not self.open_lines.get(frame.line):
+                stats[2] += elapsed
+        frame.line_start = now
+
+    def enter(self, code: CodeType, is_call: bool) -> None:
+        now = self.clock()
+        if self.stack:
+            caller = self.stack[-1]
+            self._charge_line(caller, now)
+            self.open_lines[caller.line] = self.open_lines.get(caller.line, 0) + 1
+        self.stack.append(_Frame(code, now))
+        self.active[code] = self.active.get(code, 0) + 1
+        stats = self.funcs.get(code)
+        if stats is None:
+            stats = self.funcs[code] = [0, 0, 0]
+        if is_call:
+            stats[0] += 1
+
+    def line(self, code: CodeType, line: int) -> None:
+        if not self.stack or self.stack[-1].code is not code:
+            return
+        frame = self.stack[-1]
+        self._charge_line(frame, self.clock())
+        frame.line = line
+        if line:  # line 0: generated code (the reeks class definition)
+            self._line(line)[0] += 1
+
+    def leave(self, code: CodeType) -> None:
+        if not self.stack or self.stack[-1].code is not code:
+            return
+        now = self.clock()
+        frame = self.stack.pop()
+        self._charge_line(frame, now)
+        elapsed = now - frame.start
+        stats = self.funcs[code]
+        stats[1] += elapsed - frame.child
+        self.active[code] -= 1
+        if not self.active[code]:
+            stats[2] += elapsed
+        if self.stack:
+            parent = self.stack[-1]
+            parent.child += elapsed
+            parent.line_start = now
+            self.open_lines[parent.line] -= 1
+            if parent.line and not self.open_lines[parent.line]:
+                self._line(parent.line)[2] += elapsed
+
+    def report(self, filename: str, backend: str, total_ns: int, source: str) -> ProfileReport:
+        src_lines = source.splitlines()
+        functions = tuple(
+            FunctionStats(
+                "plan" if code.co_name in _MAIN_NAMES else code.co_name, code.co_firstlineno, *stats
+            )
+            for code, stats in self.funcs.items()
+        )
+        lines = tuple(
+            LineStats(line, *stats, src_lines[line - 1].strip() if 0 < line <= len(src_lines) else "")
+            for line, stats in sorted(self.lines.items())
+        )
+        return ProfileReport(filename, backend, total_ns, functions, lines)
+
+
+def _run_monitoring(code: CodeType, namespace: dict[str, Any], collector: _Collector) -> None:
+    mon = sys.monitoring  # type: ignore[attr-defined]
+    tool = mon.PROFILER_ID
+    mon.use_tool_id(tool, "plats profile")
+    ev = mon.events
+    codes = _code_objects(code)
+    callbacks: dict[int, Callable[..., Any]] = {
+        ev.PY_START: lambda c, _off: collector.enter(c, True),
+        ev.PY_RESUME: lambda c, _off: collector.enter(c, False),
+        ev.PY_RETURN: lambda c, _off, _val: collector.leave(c),
+        ev.PY_YIELD: lambda c, _off, _val: collector.leave(c),
+        ev.PY_UNWIND: lambda c, _off, _exc: collector.leave(c),
+        ev.LINE: collector.line,
+    }
+    local = ev.PY_START | ev.PY_RESUME | ev.PY_RETURN | ev.PY_YIELD | ev.LINE
+    try:
+        for event, callback in callbacks.items():
+            mon.register_callback(tool, event, callback)
+        for c in codes:
+            mon.set_local_events(tool, c, local)
+        mon.set_events(tool, ev.PY_UNWIND)  # global-only event; `leave` ignores foreign code
+        exec(code, namespace)
+    finally:
+        mon.set_events(tool, 0)
+        for c in codes:
+            mon.set_local_events(tool, c, 0)
+        for event in callbacks:
+            mon.register_callback(tool, event, None)
+        mon.free_tool_id(tool)
+
+
+def _is_fresh_frame(frame: FrameType) -> bool:
+    """False when a "call" trace event is a generator being resumed."""
+    if frame.f_lasti < 0:  # 3.10
+        return True
+    co = frame.f_code.co_code
+    return _RESUME is not None and co[frame.f_lasti] == _RESUME and co[frame.f_lasti + 1] == 0
+
+
+def _run_settrace(code: CodeType, namespace: dict[str, Any], collector: _Collector) -> None:
+    codes = set(_code_objects(code))
+
+    def local(frame: FrameType, event: str, arg: Any) -> Any:
+        if event == "line":
+            collector.line(frame.f_code, frame.f_lineno)
+        elif event == "return":
+            collector.leave(frame.f_code)
+        return local
+
+    def global_(frame: FrameType, event: str, arg: Any) -> Any:
+        if frame.f_code not in codes:
+            return None  # no line events for library code
+        collector.enter(frame.f_code, _is_fresh_frame(frame))
+        return local
+
+    previous = sys.gettrace()
+    sys.settrace(global_)
+    try:
+        exec(code, namespace)
+    finally:
+        sys.settrace(previous)
+
+
+def profile_plats(
+    plats_src: str, filename: str = "<plats>", *, optimize: int = 0, backend: str | None = None
+) -> ProfileReport:
+    """Run a Platskript program under the profiler and return its report.
+
+    `backend` forces `"sys.monitoring"` or `"sys.settrace"`; by default the former is used
+    when available. The program's output goes wherever it normally would. When the program
+    raises, the exception propagates with the report so far as its `profile_report`.
+    """
+    if backend is None:
+        backend = "sys.monitoring" if hasattr(sys, "monitoring") else "sys.settrace"
+    if backend not in ("sys.monitoring", "sys.settrace"):
+        raise ValueError(f"unknown profiler backend: {backend!r}")
+    if backend == "sys.monitoring" and not hasattr(sys, "monitoring"):
+        raise ValueError("sys.monitoring needs Python 3.12+")
+
+    code = compile_plats_code(plats_src, filename, optimize=optimize)
+    collector = _Collector()
+    run = _run_monitoring if backend == "sys.monitoring" else _run_settrace
+    start = time.perf_counter_ns()
+    try:
+        run(code, {"__name__": "__main__"}, collector)
+    except BaseException as e:
+        # A failing run is when a profile helps most: hand it over with the exception.
+        total = time.perf_counter_ns() - start
+        e.profile_report = collector.report(filename, backend, total, plats_src)  # type: ignore[attr-defined]
+        raise
+    total = time.perf_counter_ns() - start
+    return collector.report(filename, backend, total, plats_src)
@@ -16,7 +16,7 @@ import code
 import sys
 from typing import TextIO
 
-from .compiler import compile_plats
+from .compiler import compile_plats, compile_plats_code
 
 # REPL command aliases (Multi-Vlaams!)
 REPL_ALIASES = {
@@ -173,10 +173,10 @@ Language Quick Reference:
     def run_platskript(self, plats_code: str) -> None:
         """Compile Platskript to Python and run it."""
         try:
-            py_code = compile_plats(plats_code)
+            codeobj = compile_plats_code(plats_code, "<platskript>")
             self.last_code = plats_code
-            # Use InteractiveConsole to run the Python code safely
-            self.console.runsource(py_code, "<platskript>", "exec")
+            # Use InteractiveConsole to run the code object safely
+            self.console.runcode(codeobj)
         except Exception as e:
             self.write(f"\n❌ Fout: {e}\n")
 
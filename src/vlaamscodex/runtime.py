@@ -0,0 +1,61 @@
+"""Runtime helpers for compiled Platskript programs.
+
+Only depends on the standard library, so it can ship next to generated code.
+
+`maak onthoud [N] funksie f ...` compiles to a `functools.lru_cache(maxsize=N)`
+wrapper. These helpers inspect and reset those caches from the host program:
+
+    ns = {}
+    exec(compile_plats_code(src), ns)
+    onthoud_info(ns["fib"])        # OnthoudInfo(hits=78, misses=81, size=64, maxsize=64)
+    onthoud_stats(ns)              # {"fib": OnthoudInfo(...)} for every onthoud funksie
+    onthoud_clear(ns["fib"])
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Mapping
+
+__all__ = ["OnthoudInfo", "is_onthoud", "onthoud_clear", "onthoud_info", "onthoud_stats"]
+
+
+@dataclass(frozen=True, slots=True)
+class OnthoudInfo:
+    hits: int
+    misses: int
+    size: int
+    maxsize: int | None
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def is_onthoud(fn: object) -> bool:
+    """True for functions memoized with `onthoud` (any `lru_cache` wrapper)."""
+    return callable(getattr(fn, "cache_info", None)) and callable(getattr(fn, "cache_clear", None))
+
+
+def _check(fn: object) -> Any:
+    if not is_onthoud(fn):
+        name = getattr(fn, "__name__", type(fn).__name__)
+        raise TypeError(f"{name} is not an onthoud funksie")
+    return fn
+
+
+def onthoud_info(fn: Callable[..., Any]) -> OnthoudInfo:
+    """Hits, misses and current/maximum size of an `onthoud` funksie's cache."""
+    info = _check(fn).cache_info()
+    return OnthoudInfo(info.hits, info.misses, info.currsize, info.maxsize)
+
+
+def onthoud_clear(fn: Callable[..., Any]) -> None:
+    """Empty the cache and reset its counters."""
+    _check(fn).cache_clear()
+
+
+def onthoud_stats(namespace: Mapping[str, object]) -> dict[str, OnthoudInfo]:
+    """`onthoud_info()` for every `onthoud` funksie in a module namespace."""
+    return {name: onthoud_info(obj) for name, obj in namespace.items() if is_onthoud(obj)}  # type: ignore[arg-type]
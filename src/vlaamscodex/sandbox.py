@@ -0,0 +1,391 @@
+"""Run untrusted Platskript programs in a pool of pre-forked, resource-limited workers.
+
+    with SandboxPool(workers=4, limits=Limits(cpu_seconds=1)) as pool:
+        result = pool.run(plats_src)           # or pool.submit(...) -> Future
+        result.status, result.stdout
+
+Workers are started ahead of time from a fork server that has the compiler imported, so
+a submission never waits for a process start or an import. Every program is compiled and
+executed inside a worker with:
+
+- `RLIMIT_AS` (address space) and a per-run `RLIMIT_CPU` budget (`SIGXCPU` stops the run);
+- a wall-clock timeout enforced by the pool, which kills the worker (e.g. a long C-level
+  computation that never returns to the interpreter);
+- stdout/stderr captured in memory, capped at `Limits.max_output` characters;
+- restricted builtins: no `open`, `__import__` (except the stdlib modules generated code
+  imports, see `ALLOWED_MODULES`), `eval`/`exec`, `input`, `getattr`, ... Platskript has
+  no attribute syntax, so that is all a program can reach.
+
+A worker is replaced after `max_runs` programs, and immediately after a run hit a limit or
+crashed. Submissions go through a bounded queue: `submit()` raises `SandboxBusy` instead of
+queueing without limit, so callers can shed load.
+
+Unix only (`resource`, fork server).
+"""
+
+from __future__ import annotations
+
+import builtins
+import io
+import linecache
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from multiprocessing.connection import Connection
+from typing import Any
+
+from .errors import format_program_traceback
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+# Result statuses
+OK = "ok"
+ERROR = "error"  # uncaught exception in the program
+SYNTAX_ERROR = "syntax_error"
+TIMEOUT = "timeout"  # wall clock
+CPU_LIMIT = "cpu_limit"
+MEMORY_LIMIT = "memory_limit"
+OUTPUT_LIMIT = "output_limit"
+CRASHED = "crashed"  # the worker died without reporting
+
+# Modules that compiled Platskript itself imports (`onthoud` -> functools.lru_cache,
+# the `reeks` class -> array, itertools, operator).
+ALLOWED_MODULES = frozenset({"functools", "array", "itertools", "operator"})
+
+_SAFE_BUILTINS = (
+    "__build_class__", "staticmethod", "super",  # the generated `reeks` class
+    "abs", "all", "any", "bool", "chr", "dict", "divmod", "enumerate", "filter", "float", "format",
+    "frozenset", "int", "isinstance", "iter", "len", "list", "map", "max", "min", "next", "ord",
+    "print", "range", "repr", "reversed", "round", "set", "sorted", "str", "sum", "tuple", "zip",
+    "ArithmeticError", "AssertionError", "Exception", "IndexError", "KeyError", "NameError",
+    "OverflowError", "RecursionError", "StopIteration", "TypeError", "ValueError", "ZeroDivisionError",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Limits:
+    cpu_seconds: int = 2  # per run; RLIMIT_CPU has whole-second granularity
+    memory_bytes: int = 256 * 1024 * 1024  # address space on top of the worker's own
+    wall_seconds: float = 5.0
+    max_output: int = 64 * 1024  # characters, stdout and stderr each
+
+
+@dataclass(frozen=True, slots=True)
+class RunResult:
+    status: str
+    stdout: str
+    stderr: str
+    duration: float  # wall-clock seconds, as seen by the pool
+    truncated: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.status == OK
+
+
+class SandboxBusy(RuntimeError):
+    """The submission queue is full."""
+
+
+# --- worker ------------------------------------------------------------------
+
+
+class _LimitHit(BaseException):
+    """Stops a program; BaseException so `except Exception` in generated code cannot catch it."""
+
+    def __init__(self, status: str) -> None:
+        super().__init__(status)
+        self.status = status
+
+
+class _CappedWriter(io.TextIOBase):
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.parts: list[str] = []
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        room = self.limit - self.size
+        if len(s) > room:
+            self.parts.append(s[: max(room, 0)])
+            self.size = self.limit
+            raise _LimitHit(OUTPUT_LIMIT)
+        self.parts.append(s)
+        self.size += len(s)
+        return len(s)
+
+    def getvalue(self) -> str:
+        return "".join(self.parts)
+
+
+def _safe_import(name: str, globals: Any = None, locals: Any = None, fromlist: Any = (), level: int = 0) -> Any:
+    if level or name not in ALLOWED_MODULES:
+        raise ImportError(f"import of {name!r} is not allowed in the sandbox")
+    return __import__(name, globals, locals, fromlist, level)
+
+
+def _sandbox_builtins() -> dict[str, Any]:
+    safe = {name: getattr(builtins, name) for name in _SAFE_BUILTINS}
+    safe["__import__"] = _safe_import
+    return safe
+
+
+def _on_sigxcpu(signum: int, frame: Any) -> None:
+    raise _LimitHit(CPU_LIMIT)
+
+
+def _address_space() -> int:
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+def _apply_worker_limits(limits: Limits) -> None:
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+    _soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    cap = _address_space() + limits.memory_bytes
+    if hard != resource.RLIM_INFINITY:
+        cap = min(cap, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (cap, hard))
+    except (ValueError, OSError):  # e.g. macOS does not enforce RLIMIT_AS
+        pass
+    signal.signal(signal.SIGXCPU, _on_sigxcpu)
+
+
+def _cpu_budget(seconds: int) -> None:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    _soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = int(usage.ru_utime + usage.ru_stime) + 1 + seconds
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _execute(job: dict[str, Any], limits: Limits) -> dict[str, Any]:
+    from .compiler import compile_plats_code
+    from .errors import PlatsSyntaxError
+
+    filename = job["filename"]
+    # Lets tracebacks quote the offending `.plats` line.
+    linecache.cache[filename] = (len(job["source"]), None, job["source"].splitlines(True), filename)
+    out, err = _CappedWriter(limits.max_output), _CappedWriter(limits.max_output)
+    status = OK
+    saved = sys.stdout, sys.stderr
+    sys.stdout, sys.stderr = out, err
+    try:
+        _cpu_budget(limits.cpu_seconds)
+        code = compile_plats_code(job["source"], filename, optimize=job["optimize"])
+        exec(code, {"__name__": "__main__", "__builtins__": _sandbox_builtins()})
+    except _LimitHit as e:
+        status = e.status
+    except PlatsSyntaxError as e:
+        status = SYNTAX_ERROR
+        err.parts.append(f"{filename}:{e.line}: error: {e.message}\n")
+    except MemoryError:
+        status = MEMORY_LIMIT
+    except RecursionError as e:
+        status = ERROR
+        err.parts.append(f"RecursionError: {e}\n")
+    except BaseException as e:  # the program's own error, reported like an uncaught exception
+        status = ERROR
+        err.parts.append(format_program_traceback(e, filename))
+    finally:
+        sys.stdout, sys.stderr = saved
+        linecache.cache.pop(filename, None)
+    return {
+        "status": status,
+        "stdout": out.getvalue(),
+        "stderr": err.getvalue(),
+        "truncated": status == OUTPUT_LIMIT,
+    }
+
+
+def _worker_main(conn: Connection, limits: Limits) -> None:
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the pool owner handles Ctrl-C
+    _apply_worker_limits(limits)
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        result = _execute(job, limits)
+        try:
+            conn.send(result)
+        except MemoryError:  # nothing left to even pickle the result
+            os._exit(1)
+        if result["status"] not in (OK, ERROR, SYNTAX_ERROR):
+            return  # a limit was hit: let the pool start a clean worker
+
+
+# --- pool --------------------------------------------------------------------
+
+
+@dataclass
+class _Job:
+    source: str
+    filename: str
+    optimize: int
+    future: Future
+
+
+class _Slot:
+    """One worker process, driven by one dispatcher thread."""
+
+    def __init__(self, pool: SandboxPool) -> None:
+        self.pool = pool
+        self.process: Any = None
+        self.conn: Connection | None = None
+        self.runs = 0
+        self.start()
+
+    def start(self) -> None:
+        parent, child = self.pool._ctx.Pipe()
+        self.process = self.pool._ctx.Process(
+            target=_worker_main, args=(child, self.pool.limits), name="plats-sandbox", daemon=True
+        )
+        self.process.start()
+        child.close()
+        self.conn = parent
+        self.runs = 0
+
+    def stop(self, kill: bool = False) -> None:
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+    def run(self, job: _Job) -> tuple[RunResult, bool]:
+        """Run one job; the flag says whether the worker must be replaced."""
+        limits = self.pool.limits
+        started = time.monotonic()
+        self.runs += 1
+        try:
+            self.conn.send({"source": job.source, "filename": job.filename, "optimize": job.optimize})
+            if not self.conn.poll(limits.wall_seconds):
+                return RunResult(TIMEOUT, "", "", time.monotonic() - started), True
+            reply = self.conn.recv()
+        except (EOFError, OSError):
+            self.process.join(timeout=1)
+            code = self.process.exitcode
+            return RunResult(CRASHED, "", f"worker exited ({code})\n", time.monotonic() - started), True
+        result = RunResult(reply["status"], reply["stdout"], reply["stderr"], time.monotonic() - started, reply["truncated"])
+        replace = result.status not in (OK, ERROR, SYNTAX_ERROR) or self.runs >= self.pool.max_runs
+        return result, replace
+
+    def serve(self) -> None:
+        pool = self.pool
+        while True:
+            job = pool._queue.get()
+            if job is None:
+                self.stop()
+                return
+            if not job.future.set_running_or_notify_cancel():
+                continue
+            result, replace = self.run(job)
+            pool._count(result.status, replace)
+            job.future.set_result(result)
+            if replace:  # start the next worker now, not when the next job arrives
+                self.stop(kill=result.status in (TIMEOUT, CRASHED))
+                self.start()
+
+
+class SandboxPool:
+    """A fixed number of pre-forked sandbox workers behind a bounded submission queue."""
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        *,
+        limits: Limits | None = None,
+        max_runs: int = 100,
+        queue_size: int | None = None,
+    ) -> None:
+        if resource is None or "forkserver" not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("the sandbox needs Unix (resource limits and a fork server)")
+        self.workers = workers or os.cpu_count() or 1
+        self.limits = limits or Limits()
+        self.max_runs = max_runs
+        self._queue: queue.Queue[_Job | None] = queue.Queue(maxsize=queue_size or 4 * self.workers)
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "rejected": 0, "recycled": 0}
+        self._closed = False
+        self._ctx = multiprocessing.get_context("forkserver")
+        self._ctx.set_forkserver_preload(["vlaamscodex.compiler", "vlaamscodex.sandbox"])
+        self._slots = [_Slot(self) for _ in range(self.workers)]
+        self._threads = [
+            threading.Thread(target=slot.serve, name=f"plats-sandbox-{i}", daemon=True)
+            for i, slot in enumerate(self._slots)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, plats_src: str, filename: str = "<plats>", *, optimize: int = 0) -> Future:
+        """Queue a program; returns a `Future[RunResult]`. Raises `SandboxBusy` when full."""
+        if self._closed:
+            raise RuntimeError("SandboxPool is closed")
+        job = _Job(plats_src, filename, optimize, Future())
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            with self._lock:
+                self._stats["rejected"] += 1
+            raise SandboxBusy(f"sandbox queue is full ({self._queue.maxsize} waiting)") from None
+        with self._lock:
+            self._stats["submitted"] += 1
+        return job.future
+
+    def run(self, plats_src: str, filename: str = "<plats>", *, optimize: int = 0) -> RunResult:
+        """`submit()` and wait for the result."""
+        return self.submit(plats_src, filename, optimize=optimize).result()
+
+    def stats(self) -> dict[str, int]:
+        """Counters: submitted, rejected, recycled, plus one per result status."""
+        with self._lock:
+            return dict(self._stats)
+
+    def _count(self, status: str, recycled: bool) -> None:
+        with self._lock:
+            self._stats[status] = self._stats.get(status, 0) + 1
+            if recycled:
+                self._stats["recycled"] += 1
+
+    def close(self) -> None:
+        """Finish queued submissions, then stop the workers."""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self) -> SandboxPool:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -0,0 +1,383 @@
+"""`plats serve`: compile/run/check/transform over HTTP, for tools that embed VlaamsCodex.
+
+    plats serve --port 8765 --workers 4
+
+    POST /compile     {"source": "...", "optimize": 0}          -> {"python": "..."}
+    POST /run         {"source": "...", "filename": "x.plats"}  -> {"status", "stdout", "stderr", ...}
+    POST /check       {"source": "...", "dialect": "default"}   -> {"ok": bool, "issues": [...]}
+    POST /transform   {"text": "...", "dialect": "antwerps"}    -> {"text": "..."}
+    POST /<endpoint>/batch  {"items": [<request>, ...]}         -> {"results": [<response>, ...]}
+    GET  /stats       latency per endpoint, cache and sandbox counters
+    GET  /health
+
+Stdlib only (`http.server`, one thread per connection, HTTP/1.1 keep-alive). One process
+serves every request, so the caches are shared: compiled code lives in the compiler's
+in-process LRU (`compiler.compile_cache_stats()`), dialect packs are loaded once at
+start, and transform results get an LRU of their own. `/run` executes in a
+`sandbox.SandboxPool` (pre-forked, resource-limited workers); a batch submits all its
+programs at once, so they run in parallel. Errors are `{"error": {"code", "message"}}`;
+in a batch, per item, without failing the other items.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import http.server
+import json
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from . import __version__
+from .memo import LRUCache
+
+DEFAULT_PORT = 8765
+MAX_BODY = 4 * 1024 * 1024  # bytes
+MAX_BATCH = 256  # items per batch request
+_SAMPLES = 1024  # latency samples kept per endpoint for the percentiles
+
+
+class _RequestError(Exception):
+    def __init__(self, status: int, code: str, message: str, **extra: Any) -> None:
+        super().__init__(message)
+        self.status = status
+        self.payload = {"error": {"code": code, "message": message, **extra}}
+
+
+class LatencyStats:
+    """Request count, error count and latency per endpoint (the last 1024 for percentiles)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._data: dict[str, dict[str, Any]] = {}
+
+    def record(self, endpoint: str, seconds: float, error: bool) -> None:
+        with self._lock:
+            entry = self._data.get(endpoint)
+            if entry is None:
+                entry = self._data[endpoint] = {"count": 0, "errors": 0, "total": 0.0, "max": 0.0}
+                entry["samples"] = deque(maxlen=_SAMPLES)
+            entry["count"] += 1
+            entry["errors"] += error
+            entry["total"] += seconds
+            entry["max"] = max(entry["max"], seconds)
+            entry["samples"].append(seconds)
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        out: dict[str, dict[str, float]] = {}
+        with self._lock:
+            for endpoint, entry in sorted(self._data.items()):
+                samples = sorted(entry["samples"])
+
+                def pct(q: float) -> float:
+                    return round(samples[min(len(samples) - 1, int(q * len(samples)))] * 1e3, 3)
+
+                out[endpoint] = {
+                    "count": entry["count"],
+                    "errors": entry["errors"],
+                    "mean_ms": round(entry["total"] / entry["count"] * 1e3, 3),
+                    "p50_ms": pct(0.50),
+                    "p90_ms": pct(0.90),
+                    "p99_ms": pct(0.99),
+                    "max_ms": round(entry["max"] * 1e3, 3),
+                }
+        return out
+
+
+def _field(body: dict[str, Any], name: str, kind: type, default: Any = None) -> Any:
+    value = body.get(name, default)
+    if value is None:
+        raise _RequestError(400, "BAD_REQUEST", f"missing field `{name}`")
+    if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+        raise _RequestError(400, "BAD_REQUEST", f"`{name}` must be {kind.__name__}")
+    return value
+
+
+def _optimize_level(body: dict[str, Any]) -> int:
+    level = _field(body, "optimize", int, 0)
+    if level not in (0, 1, 2):
+        raise _RequestError(400, "BAD_REQUEST", "`optimize` must be 0, 1 or 2")
+    return level
+
+
+class PlatsService:
+    """The endpoints as plain methods (`dict` in, `dict` out); `make_server` puts HTTP on top.
+
+    `run_workers=0` disables `/run` (no sandbox processes are started).
+    """
+
+    def __init__(
+        self,
+        *,
+        run_workers: int | None = None,
+        limits: Any = None,
+        transform_cache_size: int = 1024,
+    ) -> None:
+        from .dialects.transformer import _default_registry, available_packs
+
+        registry = _default_registry()
+        for pack in available_packs():  # load every pack up front; threads then only read
+            registry.resolve(pack.id)
+        self.latency = LatencyStats()
+        self._transforms: LRUCache[tuple[str, bytes, str], str] = LRUCache(transform_cache_size)
+        self.pool = None
+        if run_workers != 0:
+            from .sandbox import SandboxPool
+
+            self.pool = SandboxPool(run_workers, limits=limits)
+        self.endpoints: dict[str, Callable[[dict[str, Any]], dict[str, Any]]] = {
+            "/compile": self.compile,
+            "/run": self.run,
+            "/check": self.check,
+            "/transform": self.transform,
+        }
+
+    # --- endpoints ---------------------------------------------------------------
+
+    def compile(self, body: dict[str, Any]) -> dict[str, Any]:
+        from .compiler import compile_plats, compile_plats_code
+        from .errors import PlatsSyntaxError
+
+        source = _field(body, "source", str)
+        optimize = _optimize_level(body)
+        try:
+            # `compile_plats` only renders text; the code object is what Python would reject
+            # (e.g. `geeftterug` outside a funksie). Its line numbers are `.plats` lines.
+            compile_plats_code(source, optimize=optimize)
+            return {"python": compile_plats(source, optimize=optimize)}
+        except PlatsSyntaxError as e:
+            raise _RequestError(422, "SYNTAX_ERROR", e.message, line=e.line) from None
+        except SyntaxError as e:  # rejected by Python's own compiler
+            raise _RequestError(422, "SYNTAX_ERROR", str(e.msg), line=e.lineno) from None
+
+    def run(self, body: dict[str, Any]) -> dict[str, Any]:
+        return self._run_result(self._submit(body))
+
+    def check(self, body: dict[str, Any]) -> dict[str, Any]:
+        from .checker import check_syntax
+
+        issues = check_syntax(_field(body, "source", str), _field(body, "dialect", str, "default"))
+        return {
+            "ok": not issues,
+            "issues": [
+                {"line": i.line_number, "type": i.issue_type, "message": i.message, "suggestion": i.suggestion}
+                for i in issues
+            ],
+        }
+
+    def transform(self, body: dict[str, Any]) -> dict[str, Any]:
+        from .dialects.transformer import transform
+
+        text = _field(body, "text", str)
+        dialect = _field(body, "dialect", str)
+        options = body.get("options") or {}
+        if not isinstance(options, dict):
+            raise _RequestError(400, "BAD_REQUEST", "`options` must be an object")
+
+        def compute() -> str:
+            try:
+                return transform(text, dialect, **options)
+            except KeyError:
+                raise _RequestError(404, "UNKNOWN_DIALECT", f"no dialect pack `{dialect}`") from None
+            except (TypeError, ValueError) as e:
+                raise _RequestError(400, "BAD_REQUEST", str(e)) from None
+
+        if options.get("deterministic") is False:  # random output: nothing to cache
+            return {"text": compute()}
+        key = (dialect, hashlib.sha256(text.encode("utf-8", "surrogatepass")).digest(), json.dumps(options, sort_keys=True))
+        return {"text": self._transforms.get_or_compute(key, compute)}
+
+    def batch(self, endpoint: str, body: dict[str, Any]) -> dict[str, Any]:
+        items = _field(body, "items", list)
+        if len(items) > MAX_BATCH:
+            raise _RequestError(413, "TOO_MANY_ITEMS", f"at most {MAX_BATCH} items per batch")
+        if endpoint == "/run":
+            return {"results": self._run_batch(items)}
+        handler = self.endpoints[endpoint]
+        return {"results": [self._guard(item, handler) for item in items]}
+
+    def stats(self) -> dict[str, Any]:
+        from .compiler import compile_cache_stats
+
+        def cache(stats: Any) -> dict[str, Any]:
+            return {"hits": stats.hits, "misses": stats.misses, "size": stats.size, "maxsize": stats.maxsize}
+
+        return {
+            "version": __version__,
+            "endpoints": self.latency.snapshot(),
+            "compile_cache": cache(compile_cache_stats()),
+            "transform_cache": cache(self._transforms.stats()),
+            "sandbox": self.pool.stats() if self.pool is not None else None,
+        }
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.close()
+
+    # --- helpers -----------------------------------------------------------------
+
+    def _submit(self, body: dict[str, Any]) -> Future:
+        from .sandbox import SandboxBusy
+
+        try:
+            return self._submit_or_raise(body)
+        except SandboxBusy as e:
+            raise _RequestError(503, "BUSY", str(e)) from None
+
+    def _submit_or_raise(self, body: dict[str, Any]) -> Future:
+        if self.pool is None:
+            raise _RequestError(501, "RUN_DISABLED", "this server does not run programs")
+        source = _field(body, "source", str)
+        filename = _field(body, "filename", str, "<plats>")
+        return self.pool.submit(source, filename, optimize=_optimize_level(body))
+
+    def _run_batch(self, items: list[Any]) -> list[Any]:
+        """Submit everything up front so the programs run in parallel.
+
+        When the sandbox queue is full, wait for this batch's oldest program instead of
+        failing the rest: a batch only gets BUSY items if it has nothing in flight.
+        """
+        from .sandbox import SandboxBusy
+
+        pending: list[Any] = []
+        in_flight: deque[Future] = deque()
+        for item in items:
+            while True:
+                try:
+                    submitted = self._guard(item, self._submit_or_raise)
+                except SandboxBusy as e:
+                    if not in_flight:
+                        submitted = {"error": {"code": "BUSY", "message": str(e)}}
+                        break
+                    in_flight.popleft().result()
+                    continue
+                break
+            if isinstance(submitted, Future):
+                in_flight.append(submitted)
+            pending.append(submitted)
+        return [self._guard(p, self._run_result) if isinstance(p, Future) else p for p in pending]
+
+    @staticmethod
+    def _run_result(future: Future) -> dict[str, Any]:
+        r = future.result()
+        return {
+            "status": r.status,
+            "stdout": r.stdout,
+            "stderr": r.stderr,
+            "duration_ms": round(r.duration * 1e3, 3),
+            "truncated": r.truncated,
+        }
+
+    @staticmethod
+    def _guard(item: Any, handler: Callable[[Any], Any]) -> Any:
+        """One batch item: its result, or its error payload."""
+        if not isinstance(item, (dict, Future)):
+            return {"error": {"code": "BAD_REQUEST", "message": "batch items must be objects"}}
+        try:
+            return handler(item)
+        except _RequestError as e:
+            return e.payload
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive: clients reuse one connection
+    # Headers and body are separate writes; with Nagle on, every keep-alive response
+    # would wait for the client's delayed ACK (~40 ms).
+    disable_nagle_algorithm = True
+    server_version = f"plats-serve/{__version__}"
+    service: PlatsService  # set by make_server
+
+    def log_message(self, fmt: str, *args: object) -> None:
+        return  # quiet; /stats has the numbers
+
+    def _send_json(self, status: int, payload: object) -> None:
+        raw = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def _read_json_body(self) -> dict[str, Any]:
+        raw = self.headers.get("Content-Length") or "0"
+        try:
+            length = int(raw)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True  # no way to tell where the body ends
+            raise _RequestError(400, "BAD_REQUEST", f"invalid Content-Length {raw!r}")
+        if length > MAX_BODY:
+            self.close_connection = True  # the body stays unread
+            raise _RequestError(413, "TOO_LARGE", f"request body over {MAX_BODY} bytes")
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            raise _RequestError(400, "BAD_JSON", "request body is not valid JSON") from None
+        if not isinstance(body, dict):
+            raise _RequestError(400, "BAD_REQUEST", "request body must be a JSON object")
+        return body
+
+    def _respond(self, endpoint: str, handle: Callable[[], dict[str, Any]]) -> None:
+        started = time.perf_counter()
+        try:
+            status, payload = 200, handle()
+        except _RequestError as e:
+            status, payload = e.status, e.payload
+        except Exception as e:  # a bug, not the client's fault; keep serving
+            print(f"plats serve: {endpoint}: {type(e).__name__}: {e}", file=sys.stderr)
+            status, payload = 500, {"error": {"code": "INTERNAL", "message": f"{type(e).__name__}: {e}"}}
+        self._send_json(status, payload)
+        self.service.latency.record(endpoint, time.perf_counter() - started, status >= 400)
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path == "/stats":
+            self._send_json(200, self.service.stats())
+        elif self.path == "/health":
+            self._send_json(200, {"ok": True, "version": __version__})
+        else:
+            self._send_json(404, {"error": {"code": "NOT_FOUND", "message": f"no such endpoint: {self.path}"}})
+
+    def do_POST(self) -> None:  # noqa: N802
+        endpoint = self.path.split("?", 1)[0].rstrip("/")
+        base = endpoint.removesuffix("/batch")
+        handler = self.service.endpoints.get(base)
+        if handler is None:
+            self._respond("unknown", lambda: self._not_found(endpoint))
+        elif base != endpoint:
+            self._respond(endpoint, lambda: self.service.batch(base, self._read_json_body()))
+        else:
+            self._respond(endpoint, lambda: handler(self._read_json_body()))
+
+    @staticmethod
+    def _not_found(endpoint: str) -> dict[str, Any]:
+        raise _RequestError(404, "NOT_FOUND", f"no such endpoint: {endpoint}")
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+def make_server(service: PlatsService, host: str = "127.0.0.1", port: int = DEFAULT_PORT) -> _Server:
+    """An HTTP server for `service`; `port=0` picks a free port (see `server.server_address`)."""
+    handler = type("_PlatsServiceHandler", (_Handler,), {"service": service})
+    return _Server((host, port), handler)
+
+
+def serve(host: str = "127.0.0.1", port: int = DEFAULT_PORT, *, run_workers: int | None = None) -> None:
+    """Serve until interrupted (Ctrl-C / SIGINT)."""
+    service = PlatsService(run_workers=run_workers)
+    try:
+        with make_server(service, host, port) as httpd:
+            host, port = httpd.server_address[:2]
+            print(f"plats serve {__version__}: http://{host}:{port}/ (POST /compile /run /check /transform)", file=sys.stderr)
+            try:
+                httpd.serve_forever()
+            except KeyboardInterrupt:
+                pass
+    finally:
+        service.close()
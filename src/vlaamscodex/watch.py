@@ -0,0 +1,291 @@
+"""`plats run --watch`: keep a program alive and hot-swap its funksies on every save.
+
+    plats run script.plats --watch
+
+The first run executes the whole program. After that the file is polled every
+`POLL_INTERVAL` seconds, and each save is compared with the last good version, one
+top-level piece at a time. A piece is a top-level funksie or a statement (the statements
+directly inside `plan` count as top-level).
+
+- A funksie whose text changed, or that is new, is compiled on its own. Its `maak
+  funksie` is executed again in the live namespace, which replaces the function object.
+- A funksie that only moved keeps its function object. The line numbers of its code are
+  shifted, so tracebacks stay right.
+- A removed funksie is deleted from the namespace.
+- The entry is everything that is not a funksie. It runs again only when its own text
+  changed, or when it can reach a changed funksie through calls. Global variables keep
+  their values between runs.
+
+`onthoud` caches are cleared whenever a funksie changes, because a cached result may
+depend on it. A save with a syntax error is reported and ignored, and the namespace keeps
+the last good version. Every reload reports what it did and how long it took. The time to
+compile and swap and the time of the entry run are reported separately.
+
+Not for `optimize=2`: fast locals put funksies defined in `plan` inside a closure.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import CodeType, FunctionType
+from typing import Any, Callable, TextIO
+
+from . import nodes as n
+from .compiler import _referenced_names, compile_plats_code, lower
+from .errors import PlatsSyntaxError, format_program_traceback
+from .optimizer import optimize as _optimize
+from .parser import parse_plats
+
+POLL_INTERVAL = 0.1  # seconds between checks of the file's mtime and size
+
+
+@dataclass(frozen=True, slots=True)
+class Reload:
+    """What one (re)load did."""
+
+    recompiled: tuple[str, ...] = ()  # funksies compiled and swapped in (changed or new)
+    moved: tuple[str, ...] = ()  # funksies whose code only got new line numbers
+    removed: tuple[str, ...] = ()
+    entry_run: bool = False
+    reload_seconds: float = 0.0  # parse, diff, compile and swap
+    run_seconds: float = 0.0  # the entry run, if any
+    error: str | None = None  # syntax error (nothing changed) or the entry's traceback
+
+    def format(self, number: int) -> str:
+        """One report line (plus the traceback, if the entry failed); `number` 0 is the first run."""
+        what = "run" if number == 0 else f"reload {number}"
+        if self.error is not None and not self.entry_run:
+            return f"[watch] {what}: {self.error} (keeping the previous version)"
+        parts = []
+        if self.recompiled:
+            parts.append("recompiled " + ", ".join(self.recompiled))
+        if self.moved:
+            parts.append(f"{len(self.moved)} moved")
+        if self.removed:
+            parts.append("removed " + ", ".join(self.removed))
+        if self.entry_run:
+            failed = " (failed)" if self.error else ""
+            parts.append(f"entry {'ran' if number == 0 else 're-run'} in {self.run_seconds * 1e3:.1f} ms{failed}")
+        else:
+            parts.append("entry not affected")
+        timing = f"{'compile' if number == 0 else 'reload'} {self.reload_seconds * 1e3:.1f} ms"
+        report = f"[watch] {what}: {'; '.join(parts)} ({timing})"
+        return report + "\n" + self.error.rstrip() if self.error else report
+
+
+@dataclass(slots=True)
+class _Funksie:
+    node: n.FunctionDef
+    text: str  # its source lines, to detect edits
+    refs: set[str]  # names it uses, for the call graph
+
+
+@dataclass(slots=True)
+class _Version:
+    """One parsed version of the program, split into funksies and the entry."""
+
+    funksies: dict[str, _Funksie] = field(default_factory=dict)
+    entry: list[n.Stmt] = field(default_factory=list)
+    entry_text: tuple[str, ...] = ()
+    entry_lines: tuple[int, ...] = ()
+    entry_refs: set[str] = field(default_factory=set)
+
+
+def _split(source: str) -> _Version:
+    lines = source.splitlines()
+    version = _Version()
+    entry_text: list[str] = []
+    entry_lines: list[int] = []
+
+    def visit(stmts: list[n.Stmt]) -> None:
+        for stmt in stmts:
+            if isinstance(stmt, n.Plan):  # no scope of its own: its statements are top-level
+                visit(stmt.body)
+                continue
+            text = "\n".join(lines[stmt.line - 1 : (getattr(stmt, "end_line", None) or stmt.line)])
+            if isinstance(stmt, n.FunctionDef):
+                version.funksies[stmt.name] = _Funksie(stmt, text, _referenced_names([stmt]) - {stmt.name})
+            else:
+                version.entry.append(stmt)
+                entry_text.append(text)
+                entry_lines.append(stmt.line)
+
+    visit(parse_plats(source).body)
+    version.entry_text = tuple(entry_text)
+    version.entry_lines = tuple(entry_lines)
+    version.entry_refs = _referenced_names(version.entry)
+    return version
+
+
+def _shift_lines(code: CodeType, delta: int) -> CodeType:
+    """`code` with every line number (nested code objects included) moved by `delta`."""
+    consts = tuple(_shift_lines(c, delta) if isinstance(c, CodeType) else c for c in code.co_consts)
+    return code.replace(co_firstlineno=code.co_firstlineno + delta, co_consts=consts)
+
+
+class HotProgram:
+    """A program kept alive across edits: its namespace plus the version it was built from."""
+
+    def __init__(self, filename: str, *, optimize: int = 0) -> None:
+        if optimize >= 2:
+            raise ValueError("--watch does not support -O2 (fast locals); use -O1")
+        self.filename = filename
+        self.optimize = optimize
+        self.namespace: dict[str, Any] = {}
+        self._version: _Version | None = None
+        self._entry_code: CodeType | None = None
+
+    def load(self, source: str) -> Reload:
+        """Run `source` for the first time, or apply it as an edit of the running version."""
+        started = time.perf_counter()
+        try:
+            new = _split(source)
+            if self._version is None:
+                return self._first_run(source, new, started)
+            return self._reload(new, started)
+        except (PlatsSyntaxError, SyntaxError) as e:
+            line = e.line if isinstance(e, PlatsSyntaxError) else e.lineno
+            message = e.message if isinstance(e, PlatsSyntaxError) else e.msg
+            return Reload(reload_seconds=time.perf_counter() - started, error=f"{self.filename}:{line}: {message}")
+
+    def _compile(self, stmts: list[n.Stmt]) -> CodeType:
+        module = lower(_optimize(n.Module(list(stmts)), self.optimize, self.filename))
+        return compile(module, self.filename, "exec", dont_inherit=True)
+
+    def _first_run(self, source: str, new: _Version, started: float) -> Reload:
+        code = compile_plats_code(source, self.filename, optimize=self.optimize)  # exactly like `plats run`
+        self._entry_code = self._compile(new.entry)
+        self._version = new
+        return self._run(code, Reload(), started)
+
+    def _reload(self, new: _Version, started: float) -> Reload:
+        old = self._version
+        assert old is not None
+        changed = [
+            name for name, f in new.funksies.items() if name not in old.funksies or old.funksies[name].text != f.text
+        ]
+        moved = [
+            name
+            for name, f in new.funksies.items()
+            if name not in changed and old.funksies[name].node.line != f.node.line
+        ]
+        removed = [name for name in old.funksies if name not in new.funksies]
+        entry_changed = new.entry_text != old.entry_text
+
+        # Compile everything first, so a Python-level error leaves the namespace untouched.
+        codes = [self._compile([new.funksies[name].node]) for name in changed]
+        entry_code = self._entry_code
+        if entry_changed or new.entry_lines != old.entry_lines:
+            entry_code = self._compile(new.entry)
+
+        for code in codes:
+            exec(code, self.namespace)
+        for name in moved:
+            self._move(name, new.funksies[name].node.line - old.funksies[name].node.line)
+        for name in removed:
+            self.namespace.pop(name, None)
+        if changed or removed:
+            self._clear_onthoud_caches()
+        self._version, self._entry_code = new, entry_code
+
+        result = Reload(recompiled=tuple(changed), moved=tuple(moved), removed=tuple(removed))
+        if entry_changed or self._reachable(new) & {*changed, *removed}:
+            return self._run(entry_code, result, started)
+        return Reload(**{**_fields(result), "reload_seconds": time.perf_counter() - started})
+
+    def _run(self, code: CodeType | None, result: Reload, started: float) -> Reload:
+        reloaded = time.perf_counter()
+        error = None
+        try:
+            if code is not None:
+                exec(code, self.namespace)
+        except Exception as e:
+            error = format_program_traceback(e, self.filename)
+        finally:
+            sys.stdout.flush()
+        return Reload(
+            **{
+                **_fields(result),
+                "entry_run": True,
+                "reload_seconds": reloaded - started,
+                "run_seconds": time.perf_counter() - reloaded,
+                "error": error,
+            }
+        )
+
+    def _move(self, name: str, delta: int) -> None:
+        fn = self.namespace.get(name)
+        fn = getattr(fn, "__wrapped__", fn)  # `onthoud`: the lru_cache wrapper
+        if isinstance(fn, FunctionType):
+            fn.__code__ = _shift_lines(fn.__code__, delta)
+
+    def _clear_onthoud_caches(self) -> None:
+        for value in self.namespace.values():
+            if hasattr(value, "cache_clear") and hasattr(value, "__wrapped__"):
+                value.cache_clear()
+
+    @staticmethod
+    def _reachable(version: _Version) -> set[str]:
+        """Funksie names the entry can reach through calls (directly or transitively)."""
+        seen: set[str] = set()
+        todo = list(version.entry_refs)
+        while todo:
+            name = todo.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            funksie = version.funksies.get(name)
+            if funksie is not None:
+                todo.extend(funksie.refs)
+        return seen
+
+
+def _fields(result: Reload) -> dict[str, Any]:
+    return {name: getattr(result, name) for name in Reload.__slots__}
+
+
+def watch(
+    path: Path,
+    *,
+    optimize: int = 0,
+    read: Callable[[], str] | None = None,
+    interval: float = POLL_INTERVAL,
+    stop: threading.Event | None = None,
+    report: TextIO | None = None,
+) -> int:
+    """Run `path`, then reload it on every change until Ctrl-C (or `stop` is set).
+
+    `read` returns the current source (default: the file as UTF-8); reports go to
+    `report` (default: stderr).
+    """
+    read = read or (lambda: path.read_text(encoding="utf-8"))
+    out = report or sys.stderr
+    program = HotProgram(str(path), optimize=optimize)
+    stop = stop or threading.Event()
+
+    def stamp() -> tuple[int, int] | None:
+        try:
+            st = path.stat()
+        except FileNotFoundError:  # editors that save by rename: try again next poll
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    last = stamp()
+    print(program.load(read()).format(0), file=out)
+    print(f"[watch] watching {path} (Ctrl-C to stop)", file=out)
+    reloads = 0
+    try:
+        while not stop.wait(interval):
+            now = stamp()
+            if now is None or now == last:
+                continue
+            last = now
+            reloads += 1
+            print(program.load(read()).format(reloads), file=out)
+    except KeyboardInterrupt:
+        pass
+    return 0
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from vlaamscodex import bench
+from vlaamscodex.cli import main
+from vlaamscodex.compiler import compile_cache_stats, compile_plats
+from vlaamscodex.platsweb import build_platsweb
+
+
+def test_parse_size() -> None:
+    assert [bench.parse_size(s) for s in ("1k", "10K", "1m", "250", "5k")] == [1_000, 10_000, 1_000_000, 250, 5_000]
+    for bad in ("", "0", "1g", "-3", "k"):
+        with pytest.raises(ValueError):
+            bench.parse_size(bad)
+
+
+@pytest.mark.parametrize("lines", [100, 1000])
+def test_corpora_have_the_requested_size_and_are_valid(lines: int) -> None:
+    src = bench.plats_corpus(lines)
+    assert src.count("\n") == lines
+    compile(compile_plats(src), "<bench>", "exec")
+    assert bench.dialect_corpus(lines).count("\n") == lines
+    sfc = bench.sfc_corpus(lines)
+    assert abs(sfc.count("\n") - lines) <= 30
+    assert "#k0" in build_platsweb(sfc).app_js
+    assert len(bench.chat_corpus(lines)) == lines
+
+
+def test_run_suite_covers_every_case_and_restores_caches() -> None:
+    maxsize = compile_cache_stats().maxsize
+    results = bench.run_suite(["60"], repeat=1)
+    assert [r.case for r in results] == list(bench.CASES)
+    assert all(r.lines == 60 and r.seconds > 0 for r in results)
+    assert compile_cache_stats().maxsize == maxsize
+    with pytest.raises(KeyError):
+        bench.run_suite(["60"], ["bestaat_niet"])
+
+
+def test_compare_flags_regressions_beyond_the_threshold() -> None:
+    results = [bench.Result("compile_plats", "1k", 1000, 0.12), bench.Result("transform", "1k", 1000, 0.05)]
+    current = bench.to_json(results, repeat=1)
+    baseline = bench.to_json([bench.Result("compile_plats", "1k", 1000, 0.10)], repeat=1)
+    [comparison] = bench.compare(current, baseline, threshold=0.15)  # transform is new: skipped
+    assert comparison.key == "compile_plats@1k"
+    assert comparison.change == pytest.approx(0.2)
+    assert comparison.regressed
+    assert not bench.compare(current, baseline, threshold=0.25)[0].regressed
+    assert bench.unmatched(current, baseline) == (["transform@1k"], [])
+    assert bench.unmatched(baseline, current) == ([], ["transform@1k"])
+    with pytest.raises(ValueError):
+        bench.compare(current, {"schema": 99, "results": {}})
+
+
+def test_cli_writes_json_and_fails_on_regression(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    base = tmp_path / "base.json"
+    args = ["bench", "--sizes", "50", "--cases", "compile_plats", "--repeat", "1"]
+    assert main([*args, "--save-baseline", str(base)]) == 0
+    doc = json.loads(base.read_text(encoding="utf-8"))
+    assert set(doc["results"]) == {"compile_plats@50"}
+
+    doc["results"]["compile_plats@50"]["seconds"] = 1e-9  # a baseline nothing can match
+    base.write_text(json.dumps(doc), encoding="utf-8")
+    capsys.readouterr()
+    code = main([*args, "--baseline", str(base), "--json", "-"])
+    out, err = capsys.readouterr()
+    assert code == 1
+    assert json.loads(out)["schema"] == bench.SCHEMA  # stdout is pure JSON with --json -
+    assert "REGRESSION" in err and "slower than the baseline" in err
+
+
+def test_cli_warns_about_cases_on_one_side_only(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    base = tmp_path / "base.json"
+    args = ["bench", "--sizes", "50", "--repeat", "1"]
+    assert main([*args, "--cases", "compile_plats,transform", "--save-baseline", str(base)]) == 0
+    doc = json.loads(base.read_text(encoding="utf-8"))
+    doc["results"]["compile_plats@50"]["seconds"] = 1e9  # compile_plats cannot regress
+    base.write_text(json.dumps(doc), encoding="utf-8")
+    capsys.readouterr()
+
+    assert main([*args, "--cases", "compile_plats,codec_decode", "--baseline", str(base)]) == 0
+    err = capsys.readouterr().err
+    assert "codec_decode@50 is not in the baseline" in err
+    assert "transform@50 is in the baseline but was not run" in err
+
+    assert main([*args, "--cases", "codec_decode", "--baseline", str(base)]) == 2
+    assert "no case in common with the baseline" in capsys.readouterr().err
+
+
+def test_cli_rejects_unknown_cases_and_sizes(capsys: pytest.CaptureFixture[str]) -> None:
+    assert main(["bench", "--cases", "nope"]) == 2
+    assert main(["bench", "--sizes", "veel"]) == 2
+    assert "unknown case" in capsys.readouterr().err
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PTH = REPO_ROOT / "data" / "vlaamscodex_autoload.pth"
+
+CHECK = """\
+import site, sys
+before = set(sys.modules)
+site.addsitedir({site_dir!r})
+print(sorted(set(sys.modules) - before))
+import codecs
+codecs.lookup("utf-8")
+print("vlaamscodex.codec" in sys.modules)
+import runpy
+runpy.run_path({script!r})
+print("vlaamscodex.compiler" in sys.modules)
+"""
+
+
+def test_pth_hook_defers_the_compiler_until_plats_is_decoded(tmp_path: Path) -> None:
+    site_dir = tmp_path / "site"
+    site_dir.mkdir()
+    (site_dir / "vlaamscodex_autoload.pth").write_text(PTH.read_text(encoding="utf-8"), encoding="utf-8")
+    env = {**os.environ, "PYTHONPATH": str(REPO_ROOT / "src")}
+    code = CHECK.format(site_dir=str(site_dir), script=str(REPO_ROOT / "examples" / "hello.plats"))
+
+    # -S: no real site-packages, so only this hook (not an installed one) is active.
+    p = subprocess.run([sys.executable, "-S", "-c", code], env=env, capture_output=True, text=True, check=False)
+    assert p.returncode == 0, p.stderr
+    loaded, codec_loaded, greeting, compiler_loaded = p.stdout.splitlines()
+    assert loaded == "['vlaamscodex', 'vlaamscodex._bootstrap']"
+    assert codec_loaded == "False"
+    assert greeting == "gdag aan weeireld"
+    assert compiler_loaded == "True"
+
+
+def test_bootstrap_search_matches_the_codec() -> None:
+    from vlaamscodex import _bootstrap
+
+    assert _bootstrap._search("utf-8") is None
+    for name in ("vlaamsplats", "plats", "VlaamsPlats"):
+        info = _bootstrap._search(name)
+        assert info is not None
+        assert info.decode(b"plan doe\n  klap tekst hallo amen\ngedaan\n")[0].startswith("# coding: utf-8")
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from vlaamscodex import build
+from vlaamscodex.build import MANIFEST_NAME, build_tree
+from vlaamscodex.cli import main
+
+
+def _program(n: int) -> str:
+    return f"# coding: vlaamsplats\nplan doe\n  klap getal {n} amen\ngedaan\n"
+
+
+def _tree(root: Path, count: int = 6) -> Path:
+    src = root / "src"
+    for i in range(count):
+        sub = src / f"pkg{i % 2}"
+        sub.mkdir(parents=True, exist_ok=True)
+        (sub / f"mod{i}.plats").write_text(_program(i), encoding="utf-8")
+    return src
+
+
+@pytest.mark.parametrize("jobs", [1, 3])
+def test_build_tree_compiles_every_file(tmp_path: Path, jobs: int) -> None:
+    src = _tree(tmp_path)
+    out = tmp_path / "build"
+
+    result = build_tree(src, out, jobs=jobs)
+
+    assert result.ok and len(result.compiled) == 6
+    assert (out / "pkg1" / "mod3.py").read_text(encoding="utf-8") == "print(3)\n"
+    manifest = json.loads((out / MANIFEST_NAME).read_text(encoding="utf-8"))
+    assert sorted(manifest["files"]) == sorted(f"pkg{i % 2}/mod{i}.py" for i in range(6))
+
+
+def test_rebuild_only_touches_changed_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    src = _tree(tmp_path)
+    out = tmp_path / "build"
+    build_tree(src, out, jobs=1)
+    untouched = out / "pkg0" / "mod0.py"
+    mtime = untouched.stat().st_mtime_ns
+
+    (src / "pkg1" / "mod1.plats").write_text(_program(41), encoding="utf-8")
+    # Same Python output from a different source: recompiled but not rewritten.
+    (src / "pkg0" / "mod2.plats").write_text(_program(2) + "\n", encoding="utf-8")
+    (src / "pkg1" / "mod5.plats").unlink()
+
+    compiled: list[str] = []
+    real = build._compile_job
+    monkeypatch.setattr(build, "_compile_job", lambda job: compiled.append(job[0]) or real(job))
+    result = build_tree(src, out, jobs=1)
+
+    assert sorted(compiled) == ["pkg0/mod2.py", "pkg1/mod1.py"]
+    assert result.compiled == [out / "pkg1" / "mod1.py"]
+    assert result.unchanged == [out / "pkg0" / "mod2.py"]
+    assert result.removed == [out / "pkg1" / "mod5.py"] and not (out / "pkg1" / "mod5.py").exists()
+    assert len(result.skipped) == 3
+    assert untouched.stat().st_mtime_ns == mtime
+
+
+def test_optimize_level_change_rebuilds_everything(tmp_path: Path) -> None:
+    src = _tree(tmp_path, count=2)
+    out = tmp_path / "build"
+    build_tree(src, out, jobs=1)
+    result = build_tree(src, out, jobs=1, optimize=1)
+    assert not result.skipped and len(result.unchanged) == 2
+
+
+def test_errors_are_reported_and_retried(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    src = _tree(tmp_path, count=2)
+    (src / "kapot.plats").write_text("plan doe\n  klap getal 1 amen\n", encoding="utf-8")
+    out = tmp_path / "build"
+
+    assert main(["build", str(src), "--out", str(out), "-j", "2"]) == 1
+    err = capsys.readouterr().err
+    assert "kapot.plats" in err and "error" in err
+
+    (src / "kapot.plats").write_text(_program(7), encoding="utf-8")
+    assert main(["build", str(src), "--out", str(out)]) == 0
+    assert "1 written, 0 unchanged, 2 up to date" in capsys.readouterr().out
+
+
+def test_output_of_a_broken_then_deleted_source_is_pruned(tmp_path: Path) -> None:
+    src = _tree(tmp_path, count=2)
+    out = tmp_path / "build"
+    build_tree(src, out, jobs=1)
+    stale = out / "pkg1" / "mod1.py"
+
+    (src / "pkg1" / "mod1.plats").write_text("plan doe\n  klap getal 1 amen\n", encoding="utf-8")
+    result = build_tree(src, out, jobs=1)
+    assert not result.ok and stale.is_file()
+    manifest = json.loads((out / MANIFEST_NAME).read_text(encoding="utf-8"))
+    assert manifest["files"]["pkg1/mod1.py"]["failed"] == "true"
+    assert not build_tree(src, out, jobs=1).ok  # still retried
+
+    (src / "pkg1" / "mod1.plats").unlink()
+    result = build_tree(src, out, jobs=1)
+    assert result.ok and result.removed == [stale] and not stale.exists()
+    assert "pkg1/mod1.py" not in json.loads((out / MANIFEST_NAME).read_text(encoding="utf-8"))["files"]
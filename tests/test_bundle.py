@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from vlaamscodex.bundle import MAIN_ENTRY, bundle
+from vlaamscodex.cli import main
+from vlaamscodex.errors import PlatsSyntaxError
+
+APP = """\
+# coding: vlaamsplats
+maak onthoud funksie kwadraat met x doe
+  geeftterug da x keer da x amen
+gedaan
+
+plan doe
+  klap roep kwadraat met getal 12 amen
+gedaan
+"""
+
+
+def _python(*args: str) -> subprocess.CompletedProcess[str]:
+    # -S: no site-packages, so the installed `.pth` hook cannot import vlaamscodex for us.
+    return subprocess.run([sys.executable, "-S", *args], capture_output=True, text=True, check=False)
+
+
+def test_bundle_runs_without_the_toolchain(tmp_path: Path) -> None:
+    (tmp_path / "app.plats").write_text(APP, encoding="utf-8")
+    assert main(["bundle", str(tmp_path / "app.plats"), "-o", str(tmp_path / "app.pyz"), "-O1"]) == 0
+
+    p = _python("-X", "importtime", str(tmp_path / "app.pyz"))
+    assert p.returncode == 0, p.stderr
+    assert p.stdout == "144\n"
+    assert "vlaamscodex" not in p.stderr
+
+
+def test_bundled_modules_are_importable(tmp_path: Path) -> None:
+    (tmp_path / "app.plats").write_text(APP, encoding="utf-8")
+    (tmp_path / "helpers.plats").write_text(APP.replace("getal 12", "getal 3"), encoding="utf-8")
+    out = bundle(tmp_path / "app.plats", tmp_path / "app.pyz", modules=[tmp_path / "helpers.plats"])
+
+    p = _python("-c", f"import sys; sys.path.insert(0, {str(out)!r}); import helpers; print(helpers.kwadraat(5))")
+    assert p.returncode == 0, p.stderr
+    assert p.stdout == "9\n25\n"
+
+
+def test_bundle_is_reproducible(tmp_path: Path) -> None:
+    (tmp_path / "app.plats").write_text(APP, encoding="utf-8")
+    first = bundle(tmp_path / "app.plats", tmp_path / "a.pyz").read_bytes()
+    assert bundle(tmp_path / "app.plats", tmp_path / "b.pyz").read_bytes() == first
+
+
+def test_wrong_interpreter_gets_a_clear_message(tmp_path: Path) -> None:
+    (tmp_path / "app.plats").write_text(APP, encoding="utf-8")
+    out = bundle(tmp_path / "app.plats", tmp_path / "app.pyz")
+    with zipfile.ZipFile(out) as zf:
+        entries = {name: zf.read(name) for name in zf.namelist()}
+    entries[MAIN_ENTRY] = b"\0\0\r\n" + entries[MAIN_ENTRY][4:]
+    with zipfile.ZipFile(out, "w") as zf:
+        for name, data in entries.items():
+            zf.writestr(name, data)
+
+    p = _python(str(out))
+    assert p.returncode == 1
+    assert "rebuild it with `plats bundle`" in p.stderr
+
+
+def test_syntax_errors_write_nothing(tmp_path: Path) -> None:
+    (tmp_path / "app.plats").write_text("plan doe\n", encoding="utf-8")
+    with pytest.raises(PlatsSyntaxError):
+        bundle(tmp_path / "app.plats", tmp_path / "app.pyz")
+    assert not (tmp_path / "app.pyz").exists()
+
+
+def test_cli_reports_syntax_errors(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    (tmp_path / "app.plats").write_text("plan doe\n  klap\ngedaan\n", encoding="utf-8")
+    assert main(["bundle", str(tmp_path / "app.plats")]) == 1
+    assert "app.plats:2: error" in capsys.readouterr().err
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from vlaamscodex import cache
+from vlaamscodex.cli import main
+
+HELLO = "plan doe\n  klap tekst gdag plakt spatie plakt tekst wereld amen\ngedaan\n"
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("VLAAMSCODEX_CACHE_DIR", raising=False)
+    monkeypatch.delenv("VLAAMSCODEX_NO_CACHE", raising=False)
+    monkeypatch.setattr("sys.dont_write_bytecode", False)
+
+
+def _entry(script: Path, kind: str) -> Path:
+    return next((script.parent / "__pycache__").glob(f"{script.stem}.*.{kind}"))
+
+
+def test_run_writes_and_reuses_pycache_entry(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    script = tmp_path / "hallo.plats"
+    script.write_text(HELLO, encoding="utf-8")
+
+    assert main(["run", str(script)]) == 0
+    entry = _entry(script, cache.KIND_CODE)
+    mtime = entry.stat().st_mtime_ns
+
+    assert main(["run", str(script)]) == 0
+    assert entry.stat().st_mtime_ns == mtime
+    assert capsys.readouterr().out == "gdag wereld\n" * 2
+
+
+def test_changed_source_invalidates_entry(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    script = tmp_path / "hallo.plats"
+    script.write_text(HELLO, encoding="utf-8")
+    main(["show-python", str(script)])
+    script.write_text(HELLO.replace("wereld", "Gent"), encoding="utf-8")
+    main(["show-python", str(script)])
+
+    out = capsys.readouterr().out
+    assert "'wereld'" in out and "'Gent'" in out
+    assert b"'Gent'" in _entry(script, cache.KIND_PYTHON).read_bytes()
+
+
+def test_corrupt_entry_is_recompiled(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    script = tmp_path / "hallo.plats"
+    script.write_text(HELLO, encoding="utf-8")
+    main(["run", str(script)])
+    _entry(script, cache.KIND_CODE).write_bytes(cache.CACHE_MAGIC + b"garbage")
+
+    assert main(["run", str(script)]) == 0
+    assert capsys.readouterr().out == "gdag wereld\n" * 2
+
+
+def test_no_cache_flag_and_env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    script = tmp_path / "hallo.plats"
+    script.write_text(HELLO, encoding="utf-8")
+    assert main(["run", "--no-cache", str(script)]) == 0
+    assert not (tmp_path / "__pycache__").exists()
+
+    monkeypatch.setenv("VLAAMSCODEX_NO_CACHE", "1")
+    assert main(["run", str(script)]) == 0
+    assert not (tmp_path / "__pycache__").exists()
+
+
+def test_shared_cache_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("VLAAMSCODEX_CACHE_DIR", str(tmp_path / "shared"))
+    first = cache.load_python(HELLO)
+    (entry,) = (tmp_path / "shared").rglob(f"*.{cache.KIND_PYTHON}")
+    assert cache.load_python(HELLO) == first
+    assert entry.name.startswith(cache.cache_key(HELLO, cache.KIND_PYTHON).hex())
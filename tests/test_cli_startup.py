@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Cumulative `-X importtime` budget for `import vlaamscodex.cli` (warm bytecode cache).
+# Generous on purpose: the module lists below catch regressions deterministically, this
+# catches a new import that is merely slow. Override for very slow CI machines.
+BUDGET_US = int(os.getenv("VLAAMSCODEX_IMPORT_BUDGET_MS", "60")) * 1000
+
+# Never needed to start the CLI or to `plats run` a program.
+HEAVY = {
+    "http.server",
+    "socketserver",
+    "vlaamscodex.platsweb",
+    "vlaamscodex.platsweb.builder",
+    "vlaamscodex.repl",
+    "vlaamscodex.fortune",
+    "vlaamscodex.init",
+    "vlaamscodex.checker",
+    "vlaamscodex.examples",
+    "vlaamscodex.dialects",
+    "vlaamscodex.dialects.transformer",
+}
+
+
+def _importtime(code: str, pycache: Path) -> dict[str, int]:
+    """Run `code` in a fresh interpreter; return {module: cumulative microseconds}."""
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+    env["PYTHONPATH"] = str(REPO_ROOT / "src")
+    # -S: leave out site-packages (and any installed `.pth` hook); measure only our imports.
+    p = subprocess.run(
+        [sys.executable, "-S", "-X", "importtime", "-X", f"pycache_prefix={pycache}", "-c", code],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules: dict[str, int] = {}
+    for line in p.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+@pytest.fixture(scope="module")
+def pycache(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    return tmp_path_factory.mktemp("pycache")
+
+
+def test_cli_import_is_lean(pycache: Path) -> None:
+    _importtime("import vlaamscodex.cli", pycache)  # warm the bytecode cache
+    runs = [_importtime("import vlaamscodex.cli", pycache) for _ in range(3)]
+
+    modules = runs[0]
+    assert not HEAVY & modules.keys()
+    assert "vlaamscodex.compiler" not in modules
+    best = min(r["vlaamscodex.cli"] for r in runs)
+    assert best <= BUDGET_US, f"import vlaamscodex.cli took {best} us (budget {BUDGET_US} us)"
+
+
+def test_plats_run_imports_only_the_compiler(pycache: Path) -> None:
+    code = "from vlaamscodex.cli import main; main(['run', 'examples/hello.plats', '--no-cache'])"
+    modules = _importtime(code, pycache)
+    assert "vlaamscodex.compiler" in modules
+    assert not HEAVY & modules.keys()
+
+
+def test_dialect_registry_is_built_on_first_use(monkeypatch: pytest.MonkeyPatch) -> None:
+    from vlaamscodex.dialects import transformer
+
+    monkeypatch.setattr(transformer, "_DEFAULT_REGISTRY", None)
+    assert transformer.available_packs()
+    assert transformer._DEFAULT_REGISTRY is not None
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from vlaamscodex import client, daemon
+
+pytestmark = pytest.mark.skipif(
+    not client.daemon_supported() or not hasattr(os, "fork"), reason="needs Unix sockets and fork()"
+)
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+HELLO = "plan doe\n  klap tekst gdag amen\ngedaan\n"
+BROKEN = "plan doe\n  klap tekst eerst amen\n  klap roep bestaatnie amen\ngedaan\n"
+
+
+@pytest.fixture
+def sock(tmp_path: Path) -> Iterator[str]:
+    (tmp_path / "run").mkdir(mode=0o700)
+    path = str(tmp_path / "run" / "d.sock")
+    env = {**os.environ, "PYTHONPATH": str(REPO_ROOT / "src")}
+    cmd = [sys.executable, "-m", "vlaamscodex.cli", "daemon", "start", "--foreground", "--socket", path]
+    proc = subprocess.Popen([*cmd, "--idle-timeout", "60"], env=env, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while daemon.status(path) is None:
+        assert proc.poll() is None and time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.02)
+    yield path
+    daemon.stop(path)
+    proc.wait(timeout=10)
+
+
+def test_run_streams_into_the_clients_stdio(
+    sock: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capfd: pytest.CaptureFixture[str]
+) -> None:
+    (tmp_path / "hello.plats").write_text(HELLO, encoding="utf-8")
+    monkeypatch.chdir(tmp_path)  # the worker resolves paths against the client's cwd
+
+    assert client.run(["run", "hello.plats", "--no-cache"], path=sock) == 0
+    assert capfd.readouterr().out == "gdag\n"
+
+
+def test_failures_keep_their_exit_status_and_traceback(
+    sock: str, tmp_path: Path, capfd: pytest.CaptureFixture[str]
+) -> None:
+    (tmp_path / "broken.plats").write_text(BROKEN, encoding="utf-8")
+
+    assert client.run(["run", str(tmp_path / "broken.plats"), "--no-cache"], path=sock) == 1
+    out, err = capfd.readouterr()
+    assert out == "eerst\n"
+    assert "NameError" in err and "broken.plats" in err
+    assert client.run(["run", "--bogus"], path=sock) == 2  # argparse's SystemExit
+    assert daemon.status(sock)["jobs"] == 0
+
+
+def test_stop_removes_the_socket(sock: str) -> None:
+    assert daemon.stop(sock)
+    deadline = time.monotonic() + 10
+    while os.path.exists(sock) and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert daemon.status(sock) is None
+
+
+def test_a_silent_client_does_not_hold_up_others(sock: str) -> None:
+    silent = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    halfway = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with silent, halfway:
+        silent.connect(sock)
+        halfway.connect(sock)
+        halfway.sendall(b"\x00\x00\x00\x40{")  # a header and one byte of a 64-byte request
+        time.sleep(0.1)  # both are accepted before the next request arrives
+        started = time.monotonic()
+        assert daemon.status(sock)["jobs"] == 0
+        assert time.monotonic() - started < daemon._REQUEST_TIMEOUT / 2
+
+
+def test_client_falls_back_to_in_process(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    (tmp_path / "hello.plats").write_text(HELLO, encoding="utf-8")
+    monkeypatch.setenv(client.ENV_SOCKET, str(tmp_path / "nobody-listens.sock"))
+
+    assert client.main(["run", str(tmp_path / "hello.plats"), "--no-cache"]) == 0
+    assert capsys.readouterr().out == "gdag\n"
+
+
+def test_client_ignores_a_socket_in_a_directory_others_can_enter(sock: str, tmp_path: Path) -> None:
+    (tmp_path / "hello.plats").write_text(HELLO, encoding="utf-8")
+    run_dir = os.path.dirname(sock)
+    os.chmod(run_dir, 0o755)
+    try:
+        assert "accessible to other users" in (client.socket_dir_problem(sock) or "")
+        assert daemon.status(sock) is None
+        assert client.run(["run", str(tmp_path / "hello.plats"), "--no-cache"], path=sock) is None
+    finally:
+        os.chmod(run_dir, 0o700)
+    assert daemon.status(sock) is not None
+
+
+def test_daemon_refuses_to_bind_in_an_unsafe_directory(tmp_path: Path) -> None:
+    shared = tmp_path / "shared"
+    shared.mkdir(mode=0o777)
+    os.chmod(shared, 0o777)  # regardless of the umask
+    with pytest.raises(RuntimeError, match="accessible to other users"):
+        daemon._listen(str(shared / "d.sock"))
+
+    private = tmp_path / "private"
+    private.mkdir(mode=0o700)
+    (tmp_path / "link").symlink_to(private)
+    with pytest.raises(RuntimeError, match="not a directory"):
+        daemon._listen(str(tmp_path / "link" / "d.sock"))
+
+    if os.getuid() == 0:  # only root can hand a directory to another user
+        os.chown(private, 12345, -1)
+        with pytest.raises(RuntimeError, match="owned by uid 12345"):
+            daemon._listen(str(private / "d.sock"))
+    assert not (shared / "d.sock").exists() and not (private / "d.sock").exists()
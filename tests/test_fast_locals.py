@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import contextlib
+import io
+from pathlib import Path
+
+import pytest
+
+from vlaamscodex.cli import main
+from vlaamscodex.compiler import MAIN_FUNCTION, compile_plats, compile_plats_code
+
+EXAMPLES = sorted((Path(__file__).resolve().parents[1] / "examples").glob("*.plats"))
+
+MIXED = """\
+maak funksie toon doe
+  klap da teller amen
+gedaan
+
+plan doe
+  zet teller op getal 1 amen
+  zet a op getal 2 amen
+  maak funksie dubbel met x doe
+    klap da x keer da a amen
+  gedaan
+  zet a op getal 3 amen
+  roep dubbel met getal 4 amen
+  roep toon amen
+gedaan
+"""
+
+
+def _run(code: object) -> tuple[str, dict[str, object]]:
+    ns: dict[str, object] = {}
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        exec(code, ns)
+    return buf.getvalue(), ns
+
+
+def test_plan_variables_become_fast_locals() -> None:
+    out, ns = _run(compile_plats_code(MIXED, optimize=2))
+    assert out == "12\n1\n"
+
+    # funksies and names used outside the plan stay module globals, the rest is local
+    assert {"toon", "dubbel", "teller"} <= ns.keys()
+    assert "a" not in ns
+    consts = compile_plats_code(MIXED, optimize=2).co_consts
+    main_code = next(c for c in consts if getattr(c, "co_name", "") == MAIN_FUNCTION)
+    assert "a" in main_code.co_cellvars or "a" in main_code.co_varnames
+
+
+def test_rendered_python() -> None:
+    py = compile_plats("plan doe\n  zet x op getal 1 amen\n  klap da x amen\ngedaan\n", optimize=2)
+    assert py == f"def {MAIN_FUNCTION}():\n    x = 1\n    print(x)\n{MAIN_FUNCTION}()\n"
+
+
+def test_module_level_statements_share_plan_globals() -> None:
+    src = "plan doe\n  zet x op getal 5 amen\ngedaan\nklap da x amen\n"
+    assert _run(compile_plats_code(src, optimize=2))[0] == "5\n"
+
+
+def test_tracebacks_keep_plats_lines() -> None:
+    src = "plan doe\n  zet x op getal 1 amen\n  klap da nope amen\ngedaan\n"
+    with pytest.raises(NameError) as exc:
+        _run(compile_plats_code(src, "t.plats", optimize=2))
+    assert exc.traceback[-1].lineno + 1 == 3
+
+
+@pytest.mark.parametrize("path", EXAMPLES, ids=lambda p: p.name)
+def test_examples_behave_the_same(path: Path) -> None:
+    src = path.read_text(encoding="utf-8")
+    assert _run(compile_plats_code(src, optimize=2))[0] == _run(compile_plats_code(src))[0]
+
+
+def test_run_flag_uses_its_own_cache_entry(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv("VLAAMSCODEX_CACHE_DIR", raising=False)
+    monkeypatch.delenv("VLAAMSCODEX_NO_CACHE", raising=False)
+    monkeypatch.setattr("sys.dont_write_bytecode", False)
+    script = tmp_path / "hallo.plats"
+    script.write_text("plan doe\n  zet x op tekst gdag amen\n  klap da x amen\ngedaan\n", encoding="utf-8")
+
+    assert main(["run", "-O2", str(script)]) == 0
+    assert main(["run", str(script)]) == 0
+    assert capsys.readouterr().out == "gdag\ngdag\n"
+    names = sorted(p.name for p in (tmp_path / "__pycache__").iterdir())
+    assert len(names) == 2 and any(".opt-2." in name for name in names)
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import tracemalloc
+import warnings
+
+import pytest
+
+from vlaamscodex import nodes as n
+from vlaamscodex import parallel
+from vlaamscodex.compiler import compile_plats, compile_plats_code, compile_plats_with_map
+from vlaamscodex.errors import PlatsSyntaxError, PlatsWarning
+from vlaamscodex.parallel import compile_plats_parallel_with_map
+from vlaamscodex.parser import parse_plats
+
+PIPELINE = """\
+maak funksie tel met n doe
+  zet i op getal 0 amen
+  zolang da i iskleinerdan da n doe
+    klap da i keer getal 100 amen
+    lever da i amen
+    zet i op da i derbij getal 1 amen
+  gedaan
+gedaan
+
+maak funksie kwadraten met bron doe
+  voor elk x uit da bron doe
+    lever da x keer da x amen
+  gedaan
+gedaan
+
+plan doe
+  voor elk k uit roep kwadraten met roep tel met getal 3 doe
+    klap da k amen
+  gedaan
+  klap som van roep kwadraten met reeks van getal 0 tot getal 4 amen
+  klap gemiddelde van roep tel met getal 3 amen
+gedaan
+"""
+
+
+def _run(src: str, optimize: int = 0) -> str:
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        exec(compile_plats_code(src, optimize=optimize), {})
+    return buf.getvalue()
+
+
+def test_parse_lever_and_voor_elk() -> None:
+    mod = parse_plats(PIPELINE)
+    tel, kwadraten, plan = mod.body
+    assert tel.generator and kwadraten.generator
+    loop = plan.body[0]
+    assert isinstance(loop, n.ForEach) and loop.target == "k" and isinstance(loop.iter, n.Call)
+    assert isinstance(kwadraten.body[0].body[0], n.Yield)
+
+    # `elk` is still a valid loop variable for a range loop
+    rng = parse_plats("plan doe\n  voor elk van getal 0 tot getal 2 doe\n  gedaan\ngedaan\n").body[0].body[0]
+    assert isinstance(rng, n.For) and rng.target == "elk"
+
+
+@pytest.mark.parametrize("optimize", [0, 1, 2])
+def test_values_are_produced_on_demand(optimize: int) -> None:
+    out = _run(PIPELINE, optimize).split()
+    # each value is printed by `tel` right before the loop body receives its square
+    assert out[:6] == ["0", "0", "100", "1", "200", "4"]
+    assert out[6:] == ["14.0", "0", "100", "200", "1.0"]
+
+
+def test_generated_python() -> None:
+    py_src = compile_plats(PIPELINE)
+    assert "        yield i" in py_src
+    assert "for k in kwadraten(tel(3)):" in py_src
+    _, line_map = compile_plats_with_map(PIPELINE)
+    assert line_map[py_src.splitlines().index("        yield i")] == 5
+
+
+@pytest.mark.parametrize(
+    ("src", "message"),
+    [
+        ("plan doe\n  lever getal 1 amen\ngedaan\n", "lever outside of funksie"),
+        ("maak onthoud funksie f doe\n  lever getal 1 amen\ngedaan\n", "onthoud funksie 'f' cannot lever"),
+        ("maak funksie f doe\n  lever amen\ngedaan\n", "lever missing value"),
+        ("plan doe\n  voor elk x van da y doe\n  gedaan\ngedaan\n", "voor elk expects"),
+    ],
+)
+def test_syntax_errors(src: str, message: str) -> None:
+    with pytest.raises(PlatsSyntaxError, match=message):
+        compile_plats(src)
+
+
+def test_generators_are_not_rewritten_by_tail_call_elimination() -> None:
+    src = (
+        "maak funksie aftellen met n doe\n"
+        "  als da n isgelijk getal 0 doe\n"
+        "    geeftterug getal 0 amen\n"
+        "  gedaan\n"
+        "  lever da n amen\n"
+        "  geeftterug roep aftellen met da n deraf getal 1 amen\n"
+        "gedaan\n"
+        "plan doe\n"
+        "  voor elk x uit roep aftellen met getal 3 doe\n"
+        "    klap da x amen\n"
+        "  gedaan\n"
+        "gedaan\n"
+    )
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", PlatsWarning)
+        assert _run(src, optimize=1) == _run(src) == "3\n"  # `geeftterug` ends the generator
+
+
+def test_memory_stays_flat_through_a_pipeline() -> None:
+    src = (
+        "maak funksie getallen met n doe\n"
+        "  voor i van getal 0 tot da n doe\n"
+        "    lever da i amen\n"
+        "  gedaan\n"
+        "gedaan\n"
+        "maak funksie dubbel met bron doe\n"
+        "  voor elk x uit da bron doe\n"
+        "    lever da x keer getal 2 amen\n"
+        "  gedaan\n"
+        "gedaan\n"
+        "plan doe\n"
+        "  klap gemiddelde van roep dubbel met roep getallen met getal 200000 amen\n"
+        "gedaan\n"
+    )
+    code = compile_plats_code(src)
+    buf = io.StringIO()
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(buf):
+            exec(code, {})
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert buf.getvalue() == "199999.0\n"
+    assert peak < 200_000  # a list of 200000 numbers alone would take over 1.6 MB
+
+
+def test_parallel_compile_matches(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(parallel, "MIN_CHUNK_LINES", 20)
+    blocks = "".join(
+        f"maak funksie g{i} met bron doe\n  voor elk x uit da bron doe\n    lever da x derbij getal {i} amen\n"
+        "  gedaan\ngedaan\n"
+        for i in range(20)
+    )
+    src = blocks + PIPELINE
+    assert compile_plats_parallel_with_map(src, jobs=2) == compile_plats_with_map(src)
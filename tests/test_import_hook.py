@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import sys
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+import vlaamscodex
+from vlaamscodex import importer
+
+REKEN = """\
+# coding: vlaamsplats
+maak funksie dubbel met x doe
+  geeftterug da x keer getal 2 amen
+gedaan
+
+plan doe
+  zet naam op tekst reken amen
+gedaan
+"""
+
+
+@pytest.fixture
+def plats_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr("sys.dont_write_bytecode", False)
+    vlaamscodex.install_import_hook()
+    yield tmp_path
+    vlaamscodex.uninstall_import_hook()
+    for name in ("reken", "pakket", "pakket.binnen"):
+        sys.modules.pop(name, None)
+
+
+def test_import_plats_module_writes_hash_based_pyc(plats_path: Path) -> None:
+    (plats_path / "reken.plats").write_text(REKEN, encoding="utf-8")
+
+    reken = importlib.import_module("reken")
+    assert reken.dubbel(21) == 42
+    assert reken.naam == "reken"
+
+    pyc = Path(importer.cache_from_plats(str(plats_path / "reken.plats")))
+    data = pyc.read_bytes()
+    assert pyc.name.startswith("reken.plats.")
+    assert data[:4] == importlib.util.MAGIC_NUMBER
+    assert int.from_bytes(data[4:8], "little") == 0b11
+
+
+def test_second_import_uses_pyc_until_source_changes(plats_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    src = plats_path / "reken.plats"
+    src.write_text(REKEN, encoding="utf-8")
+    importlib.import_module("reken")
+    sys.modules.pop("reken")
+
+    def fail(*_args: object) -> None:
+        raise AssertionError("recompiled although the .pyc is fresh")
+
+    monkeypatch.setattr(importer, "compile_plats_code", fail)
+    assert importlib.import_module("reken").dubbel(2) == 4
+    sys.modules.pop("reken")
+
+    monkeypatch.undo()
+    monkeypatch.syspath_prepend(str(plats_path))
+    src.write_text(REKEN.replace("getal 2", "getal 3"), encoding="utf-8")
+    assert importlib.import_module("reken").dubbel(2) == 6
+
+
+def test_plats_package(plats_path: Path) -> None:
+    pkg = plats_path / "pakket"
+    pkg.mkdir()
+    (pkg / "__init__.plats").write_text("zet versie op getal 1 amen\n", encoding="utf-8")
+    (pkg / "binnen.plats").write_text(REKEN, encoding="utf-8")
+
+    binnen = importlib.import_module("pakket.binnen")
+    assert sys.modules["pakket"].versie == 1
+    assert binnen.dubbel(5) == 10
+
+
+def test_python_modules_win(plats_path: Path) -> None:
+    (plats_path / "reken.plats").write_text(REKEN, encoding="utf-8")
+    (plats_path / "reken.py").write_text("naam = 'python'\n", encoding="utf-8")
+    assert importlib.import_module("reken").naam == "python"
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import contextlib
+import io
+
+import pytest
+
+from vlaamscodex.checker import check_syntax
+from vlaamscodex.compiler import compile_plats, compile_plats_code
+from vlaamscodex.errors import PlatsSyntaxError
+
+LOOPS = """\
+plan doe
+  zet som op getal 0 amen
+  voor i van getal 0 tot getal 10 doe
+    als da i isgelijk getal 7 dan doe
+      stop amen
+    anders doe
+      zet som op da som derbij da i amen
+    gedaan
+  gedaan
+  zet n op getal 3 amen
+  zolang da n isgroterdan getal 0 doe
+    klap da n amen
+    zet n op da n deraf getal 1 amen
+  gedaan
+  voor j van getal 10 tot getal 0 stap getal -5 doe
+    klap da j amen
+  gedaan
+  klap da som amen
+gedaan
+"""
+
+
+def _run(src: str, optimize: int = 0) -> str:
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        exec(compile_plats_code(src, optimize=optimize), {})
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize("optimize", [0, 1, 2])
+def test_loops_run(optimize: int) -> None:
+    assert _run(LOOPS, optimize) == "3\n2\n1\n10\n5\n21\n"
+
+
+def test_loops_render_as_native_python() -> None:
+    py = compile_plats(LOOPS)
+    assert "for i in range(0, 10):\n    if i == 7:\n        break\n    else:\n        som = som + i\n" in py
+    assert "while n > 0:\n" in py
+    assert "for j in range(10, 0, -5):\n" in py
+
+
+def test_loops_inside_funksie_and_als_without_dan() -> None:
+    src = (
+        "maak funksie aftellen met n doe\n"
+        "  zolang da n doe\n"
+        "    als da n iskleinerdan getal 3 doe\n"
+        "      klap da n amen\n"
+        "    gedaan\n"
+        "    zet n op da n deraf getal 1 amen\n"
+        "  gedaan\n"
+        "gedaan\n"
+        "plan doe\n"
+        "  roep aftellen met getal 5 amen\n"
+        "gedaan\n"
+    )
+    assert _run(src) == "2\n1\n"
+
+
+def test_loop_deeper_than_recursion_limit() -> None:
+    src = (
+        "plan doe\n"
+        "  zet s op getal 0 amen\n"
+        "  voor i van getal 0 tot getal 100000 doe\n"
+        "    zet s op da s derbij da i amen\n"
+        "  gedaan\n"
+        "  klap da s amen\n"
+        "gedaan\n"
+    )
+    assert _run(src, optimize=2) == f"{sum(range(100000))}\n"
+
+
+@pytest.mark.parametrize(
+    ("src", "line", "message"),
+    [
+        ("plan doe\n  anders doe\ngedaan\n", 2, "anders without matching als"),
+        ("plan doe\n  stop amen\ngedaan\n", 2, "stop outside"),
+        ("plan doe\n  voor i van getal 1 doe\n  gedaan\ngedaan\n", 2, "voor missing 'tot'"),
+        ("plan doe\n  zolang doe\n  gedaan\ngedaan\n", 2, "zolang without condition"),
+        ("plan doe\n  zolang da x doe\n    klap da x amen\n", 2, "unclosed blocks: ['plan', 'zolang']"),
+        (
+            "maak funksie f doe\n  zolang da x doe\n    maak funksie g doe\n      stop amen\n"
+            "    gedaan\n  gedaan\ngedaan\n",
+            4,
+            "stop outside",
+        ),
+    ],
+)
+def test_errors(src: str, line: int, message: str) -> None:
+    with pytest.raises(PlatsSyntaxError) as exc:
+        compile_plats(src)
+    assert exc.value.line == line
+    assert message in exc.value.message
+
+
+def test_checker_counts_loop_blocks() -> None:
+    assert check_syntax(LOOPS) == []
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import io
+import json
+from typing import Any
+
+from vlaamscodex.lsp import SEVERITY_INFORMATION, Document, read_message, serve
+
+PROGRAM = """\
+maak funksie dubbel met x doe
+  geeftterug da x keer getal 2 amen
+gedaan
+
+plan doe
+  klap roep dubbel met getal 21 amen
+gedaan
+"""
+
+
+def _edit(line: int, start: int, end_line: int, end: int, text: str) -> dict[str, Any]:
+    return {"range": {"start": {"line": line, "character": start}, "end": {"line": end_line, "character": end}}, "text": text}
+
+
+def test_incremental_edits_reanalyse_only_the_changed_block() -> None:
+    doc = Document(PROGRAM)
+    assert doc.diagnostics() == []
+    assert doc.analysed_chunks == 2
+
+    doc.apply(_edit(5, 2, 5, 6, "klapp"))  # typo in the plan block
+    [diagnostic] = doc.diagnostics()
+    assert diagnostic.line == 5 and "unknown instruction" in diagnostic.message
+    assert doc.analysed_chunks == 3
+
+    doc.apply(_edit(0, 0, 0, 0, "# bovenaan\n\n"))  # shifts every block down
+    [diagnostic] = doc.diagnostics()
+    assert diagnostic.line == 7
+    assert doc.analysed_chunks == 3  # moved, not changed: served from the cache
+
+
+def test_every_error_in_a_block_is_reported() -> None:
+    src = "plan doe\n  klap tekst a\n  als dan doe\n    klap tekst b amen\n  gedaan\n  geeftterug getal 1 amen\ngedaan\n"
+    diagnostics = Document(src).diagnostics()
+    assert [(d.line, d.message) for d in diagnostics] == [
+        (1, "missing 'amen' statement terminator: klap tekst a"),
+        (2, "als without condition"),
+        (5, "'return' outside function"),
+    ]
+
+
+def test_checker_findings_do_not_duplicate_compiler_errors() -> None:
+    assert Document("plan doe\n  klap tekst a amen  # uitleg\ngedaan\n").diagnostics() == []
+    [error, note] = Document("maak funksie f met x\n").diagnostics()
+    assert (error.line, error.source) == (0, "plats")
+    assert (note.code, note.severity) == ("missing_plan_doe", SEVERITY_INFORMATION)
+
+
+def test_utf16_positions() -> None:
+    doc = Document("plan doe\n  klap tekst 😀x amen\ngedaan\n")
+    doc.apply(_edit(1, 15, 1, 16, "y"))  # the emoji counts as two UTF-16 code units
+    assert doc.lines[1] == "  klap tekst 😀y amen"
+
+
+def _frame(message: dict[str, Any]) -> bytes:
+    body = json.dumps(message).encode("utf-8")
+    return b"Content-Length: %d\r\n\r\n" % len(body) + body
+
+
+def test_stdio_session() -> None:
+    uri = "file:///tmp/app.plats"
+    messages = [
+        {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {"capabilities": {}}},
+        {"jsonrpc": "2.0", "method": "initialized", "params": {}},
+        {"jsonrpc": "2.0", "method": "textDocument/didOpen",
+         "params": {"textDocument": {"uri": uri, "languageId": "platskript", "version": 1, "text": PROGRAM}}},
+        {"jsonrpc": "2.0", "method": "textDocument/didChange",
+         "params": {"textDocument": {"uri": uri, "version": 2}, "contentChanges": [_edit(5, 32, 5, 36, "")]}},
+        {"jsonrpc": "2.0", "id": 2, "method": "textDocument/hover", "params": {}},
+        {"jsonrpc": "2.0", "id": 3, "method": "shutdown"},
+        {"jsonrpc": "2.0", "method": "exit"},
+    ]
+    stdin = io.BytesIO(b"".join(_frame(m) for m in messages))
+    stdout = io.BytesIO()
+
+    assert serve(stdin, stdout) == 0
+
+    stdout.seek(0)
+    replies = []
+    while (message := read_message(stdout)) is not None:
+        replies.append(message)
+    by_id = {m["id"]: m for m in replies if "id" in m}
+    assert by_id[1]["result"]["capabilities"]["textDocumentSync"]["change"] == 2
+    assert by_id[2]["error"]["code"] == -32601
+    assert by_id[3]["result"] is None
+    [published] = [m["params"] for m in replies if m.get("method") == "textDocument/publishDiagnostics"]
+    assert published["version"] == 2
+    [diagnostic] = published["diagnostics"]
+    assert diagnostic["range"]["start"] == {"line": 5, "character": 2}
+    assert "amen" in diagnostic["message"]
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import pytest
+
+from vlaamscodex import compiler
+from vlaamscodex.memo import LRUCache
+
+
+def test_lru_evicts_least_recently_used() -> None:
+    c: LRUCache[str, int] = LRUCache(maxsize=2)
+    c.put("a", 1)
+    c.put("b", 2)
+    assert c.get("a") == 1
+    c.put("c", 3)
+
+    assert c.get("b") is None
+    assert c.get("a") == 1 and c.get("c") == 3
+    stats = c.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size, stats.maxsize) == (3, 1, 1, 2, 2)
+
+
+def test_lru_resize_and_disable() -> None:
+    c: LRUCache[int, int] = LRUCache(maxsize=4)
+    for i in range(4):
+        c.put(i, i)
+    c.resize(1)
+    assert len(c) == 1 and c.stats().evictions == 3
+    c.resize(0)
+    c.put(9, 9)
+    assert len(c) == 0
+    with pytest.raises(ValueError):
+        c.resize(-1)
+
+
+def test_compile_plats_is_memoized() -> None:
+    compiler.clear_compile_cache()
+    src = "plan doe\n  klap getal 42 amen\ngedaan\n"
+
+    first = compiler.compile_plats(src)
+    assert compiler.compile_plats(src) is first
+    code = compiler.compile_plats_code(src, "a.plats")
+    assert compiler.compile_plats_code(src, "a.plats") is code
+    assert compiler.compile_plats_code(src, "b.plats") is not code
+
+    stats = compiler.compile_cache_stats()
+    assert (stats.hits, stats.misses) == (2, 3)
+
+
+def test_compile_errors_are_not_cached() -> None:
+    compiler.clear_compile_cache()
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            compiler.compile_plats("plan doe\n  klap\n")
+    assert compiler.compile_cache_stats().size == 0
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from vlaamscodex.cli import main
+from vlaamscodex.memprof import memprofile_plats
+
+PROGRAM = """\
+maak funksie bouw met n doe
+  zet s op tekst x amen
+  voor i van getal 0 tot da n doe
+    zet s op da s plakt tekst abcdefghij amen
+  gedaan
+  geeftterug da s amen
+gedaan
+
+plan doe
+  zet groot op roep bouw met getal 40000 amen
+  zet groot op tekst klein amen
+  zet blijft op roep bouw met getal 5000 amen
+  klap tekst gedaan amen
+gedaan
+"""
+
+
+def test_peak_and_retained_memory_are_attributed_to_lines(capsys: pytest.CaptureFixture[str]) -> None:
+    report = memprofile_plats(PROGRAM, "bouw.plats")
+    assert capsys.readouterr().out == "gedaan\n"
+
+    top = report.at_peak[0]
+    assert (top.line, top.funksie, top.source) == (4, "bouw", "zet s op da s plakt tekst abcdefghij amen")
+    assert top.size >= 350_000
+    assert report.peak_bytes >= top.size
+
+    # `groot` was overwritten; only the 50 KB string in `blijft` survives.
+    assert 45_000 <= sum(s.size for s in report.at_end) < 200_000
+    assert report.at_end[0].line == 4
+    assert next(iter(report.by_funksie())) == "bouw"
+    assert not tracemalloc.is_tracing()
+
+
+def test_reeks_allocations_are_charged_to_the_line_that_uses_it(capsys: pytest.CaptureFixture[str]) -> None:
+    src = (
+        "plan doe\n"
+        "  zet r op reeks van getal 0 tot getal 50000 amen\n"
+        "  zet s op da r keer getal 2 amen\n"
+        "  klap gemiddelde van da s amen\n"
+        "gedaan\n"
+    )
+    report = memprofile_plats(src, "reeks.plats")
+    assert capsys.readouterr().out == "49999.0\n"
+    at_end = {s.line: s for s in report.at_end}
+    assert at_end[2].size >= 400_000 and at_end[3].size >= 400_000  # 50000 doubles each
+    assert {s.funksie for s in report.at_end} == {"plan"}
+
+
+def test_json_report_is_diffable(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    script = tmp_path / "bouw.plats"
+    script.write_text(PROGRAM, encoding="utf-8")
+    out = tmp_path / "mem.json"
+
+    assert main(["memprof", str(script), "--top", "3", "--json", str(out)]) == 0
+    assert "at peak" in capsys.readouterr().err
+
+    data = json.loads(out.read_text(encoding="utf-8"))
+    assert data["version"] == 1 and data["filename"] == str(script)
+    assert data["at_end"][0]["line"] == 4
+    assert set(data["at_end"][0]) == {"line", "funksie", "size", "count", "source"}
+    assert list(data["funksies_at_end"])[0] == "bouw"
+    assert data["approximate"]["at_peak"][0]["line"] == 4
+    assert list(data["approximate"]["funksies_at_peak"])[0] == "bouw"
+
+    # Everything outside "approximate" is the same from run to run.
+    assert main(["memprof", str(script), "--json", str(out)]) == 0
+    again = json.loads(out.read_text(encoding="utf-8"))
+    del data["approximate"], again["approximate"]
+    assert again == data
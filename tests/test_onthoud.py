@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import warnings
+
+import pytest
+
+from vlaamscodex.compiler import compile_plats, compile_plats_code
+from vlaamscodex.errors import PlatsSyntaxError
+from vlaamscodex.runtime import is_onthoud, onthoud_clear, onthoud_info, onthoud_stats
+
+FIB = """\
+maak onthoud 64 funksie fib met n doe
+  als da n iskleinerdan getal 2 dan doe
+    geeftterug da n amen
+  gedaan
+  zet a op roep fib met da n deraf getal 1 amen
+  zet b op roep fib met da n deraf getal 2 amen
+  geeftterug da a derbij da b amen
+gedaan
+plan doe
+  klap roep fib met getal 80 amen
+gedaan
+"""
+
+
+def _exec(src: str, optimize: int = 0) -> tuple[str, dict[str, object]]:
+    ns: dict[str, object] = {}
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        exec(compile_plats_code(src, optimize=optimize), ns)
+    return buf.getvalue(), ns
+
+
+def test_onthoud_compiles_to_lru_cache() -> None:
+    py = compile_plats(FIB)
+    assert py.startswith("from functools import lru_cache\n@lru_cache(maxsize=64)\ndef fib(n):\n")
+    assert "maxsize=128" in compile_plats("maak onthoud funksie f doe\n  geeftterug getal 1 amen\ngedaan\n")
+    assert "lru_cache" not in compile_plats("maak funksie f doe\n  geeftterug getal 1 amen\ngedaan\n")
+
+
+@pytest.mark.parametrize("optimize", [0, 1, 2])
+def test_exponential_fib_becomes_linear(optimize: int) -> None:
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # the tail-call pass leaves onthoud funksies alone
+        out, ns = _exec(FIB, optimize)
+    assert out == "23416728348467685\n"
+
+    info = onthoud_info(ns["fib"])  # type: ignore[arg-type]
+    assert (info.misses, info.hits, info.size, info.maxsize) == (81, 78, 64, 64)
+    assert onthoud_stats(ns) == {"fib": info}
+
+    onthoud_clear(ns["fib"])  # type: ignore[arg-type]
+    assert onthoud_info(ns["fib"]).size == 0  # type: ignore[arg-type]
+
+
+def test_runtime_rejects_plain_functions() -> None:
+    _, ns = _exec("maak funksie f doe\n  geeftterug getal 1 amen\ngedaan\n")
+    assert not is_onthoud(ns["f"])
+    with pytest.raises(TypeError, match="not an onthoud funksie"):
+        onthoud_info(ns["f"])  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize(
+    "header",
+    ["maak onthoud 0 funksie f doe", "maak onthoud groot funksie f doe", "maak onthoud doe"],
+)
+def test_invalid_headers(header: str) -> None:
+    with pytest.raises(PlatsSyntaxError) as exc:
+        compile_plats(f"{header}\ngedaan\n")
+    assert exc.value.line == 1
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import contextlib
+import io
+from pathlib import Path
+
+import pytest
+
+from vlaamscodex.cli import main
+from vlaamscodex.compiler import compile_plats, compile_plats_code
+
+EXAMPLES = sorted((Path(__file__).resolve().parents[1] / "examples").glob("*.plats"))
+
+
+def _run(code: object) -> str:
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        exec(code, {})
+    return buf.getvalue()
+
+
+def test_constant_folding() -> None:
+    py = compile_plats(
+        "plan doe\n"
+        "  zet x op getal 2 keer getal 3 derbij getal 1 amen\n"
+        "  zet y op getal 1 gedeeld getal 0 amen\n"
+        "  zet z op nie getal 1 isgroterdan getal 2 amen\n"
+        "  zet w op getal 0 enook da x amen\n"
+        "gedaan\n",
+        optimize=1,
+    )
+    assert py.splitlines() == ["x = 7", "y = 1 / 0", "z = True", "w = 0"]
+
+
+def test_plakt_chain_fuses_text_runs() -> None:
+    src = "plan doe\n  klap tekst gdag plakt spatie plakt da wie plakt tekst ! plakt spatie amen\ngedaan\n"
+    assert compile_plats(src, optimize=1) == "print('gdag ' + wie + '! ')\n"
+    assert compile_plats(src, optimize=0) == "print('gdag' + ' ' + wie + '!' + ' ')\n"
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        "tekst a plakt getal 1",
+        "getal 1 plakt getal 2 plakt tekst a",
+        "tekst a plakt spatie plakt da n plakt tekst b",
+        "da n plakt tekst a plakt tekst b",
+        "da t plakt tekst a plakt spatie plakt da t",
+        "tekst a plakt roep f plakt tekst b",
+    ],
+)
+def test_plakt_with_mixed_operands_behaves_the_same_at_every_level(expr: str) -> None:
+    src = (
+        "maak funksie f doe\n  geeftterug getal 7 amen\ngedaan\n"
+        f"plan doe\n  zet n op getal 3 amen\n  zet t op tekst x amen\n  klap {expr} amen\ngedaan\n"
+    )
+
+    def outcome(level: int) -> str:
+        try:
+            return _run(compile_plats_code(src, optimize=level))
+        except TypeError as e:
+            return f"TypeError: {e}"
+
+    assert outcome(1) == outcome(2) == outcome(0)
+
+
+def test_plakt_without_text_literal_stays_addition() -> None:
+    src = "plan doe\n  klap da a plakt da b amen\n  klap getal 1 plakt getal 2 amen\ngedaan\n"
+    assert compile_plats(src, optimize=1) == "print(a + b)\nprint(3)\n"
+
+
+def test_code_after_geeftterug_is_dropped() -> None:
+    src = (
+        "maak funksie f doe\n"
+        "  geeftterug getal 1 amen\n"
+        "  klap tekst nooit amen\n"
+        "gedaan\n"
+    )
+    assert compile_plats(src, optimize=1) == "def f():\n    return 1\n"
+
+
+@pytest.mark.parametrize("optimize", [0, 1, 2])
+def test_dropping_an_unreachable_lever_keeps_the_generator(optimize: int) -> None:
+    src = (
+        "maak funksie g met a doe\n"
+        "  geeftterug getal 1 amen\n"
+        "  lever getal 2 amen\n"
+        "gedaan\n"
+        "plan doe\n"
+        "  voor elk x uit roep g met getal 0 doe\n"
+        "    klap da x amen\n"
+        "  gedaan\n"
+        "  klap tekst klaar amen\n"
+        "gedaan\n"
+    )
+    assert _run(compile_plats_code(src, optimize=optimize)) == "klaar\n"  # `roep g` is an empty generator
+    if optimize:
+        assert "    return 1\n    yield None\n" in compile_plats(src, optimize=optimize)
+
+
+def test_optimized_code_keeps_plats_line_numbers() -> None:
+    src = "plan doe\n  zet a op tekst x amen\n\n  klap da a plakt spatie plakt da nope amen\ngedaan\n"
+    with pytest.raises(NameError) as exc:
+        _run(compile_plats_code(src, "t.plats", optimize=1))
+    assert exc.traceback[-1].lineno + 1 == 4
+
+
+@pytest.mark.parametrize("path", EXAMPLES, ids=lambda p: p.name)
+def test_examples_behave_the_same(path: Path) -> None:
+    src = path.read_text(encoding="utf-8")
+    assert _run(compile_plats_code(src, optimize=1)) == _run(compile_plats_code(src, optimize=0))
+
+
+def test_invalid_level() -> None:
+    with pytest.raises(ValueError):
+        compile_plats("plan doe\ngedaan\n", optimize=5)
+
+
+def test_build_flag(tmp_path: Path) -> None:
+    script = tmp_path / "hallo.plats"
+    script.write_text("plan doe\n  klap tekst gdag plakt spatie plakt tekst wereld amen\ngedaan\n", encoding="utf-8")
+    assert main(["build", str(script), "-O1"]) == 0
+    assert (tmp_path / "hallo.py").read_text(encoding="utf-8") == "print('gdag wereld')\n"
+    assert main(["build", str(script), "-O0"]) == 0
+    assert (tmp_path / "hallo.py").read_text(encoding="utf-8") == "print('gdag' + ' ' + 'wereld')\n"
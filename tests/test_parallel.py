@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import warnings
+
+import pytest
+
+from vlaamscodex import parallel
+from vlaamscodex.compiler import compile_plats, compile_plats_with_map
+from vlaamscodex.errors import PlatsSyntaxError, PlatsWarning
+from vlaamscodex.parallel import compile_plats_parallel, compile_plats_parallel_with_map, split_toplevel
+
+
+def _program(funksies: int) -> str:
+    out = []
+    for i in range(funksies):
+        memo = "onthoud " if i % 3 == 0 else ""
+        out += [
+            f"maak {memo}funksie f{i} met a en b doe",
+            f"  zet t op da a keer getal {i} derbij da b amen",
+            "  als da t isgroterdan getal 3 doe",
+            "    klap tekst groot plakt spatie plakt da t amen  # commentaar",
+            "  anders doe",
+            "    klap tekst klein amen",
+            "  gedaan",
+            "  geeftterug da t amen",
+            "gedaan",
+            "",
+        ]
+    out.append("plan doe")
+    out += [f"  zet x{i} op roep f{i} met getal {i} en getal 1 amen" for i in range(funksies)]
+    out.append("  voor i van getal 0 tot getal 3 doe")
+    out.append("    klap da i amen")
+    out.append("  gedaan")
+    out.append("gedaan")
+    return "\n".join(out) + "\n"
+
+
+@pytest.fixture
+def small_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(parallel, "MIN_CHUNK_LINES", 20)
+
+
+def test_split_cuts_between_funksies_and_inside_plan() -> None:
+    lines = _program(2).splitlines()
+    cuts, plan_lines, balanced = split_toplevel(lines)
+    assert balanced
+    assert cuts == [0, 10, 21, 22, 23]  # f0, f1, the two plan statements, the voor loop
+    assert [lines[i].strip() for i in plan_lines] == ["plan doe", "gedaan"]
+
+
+@pytest.mark.parametrize("optimize", [0, 1])
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_output_and_line_map_match_the_sequential_compiler(small_chunks: None, optimize: int, jobs: int) -> None:
+    src = _program(40)
+    expected = compile_plats_with_map(src, optimize=optimize)
+    assert compile_plats_parallel_with_map(src, optimize=optimize, jobs=jobs) == expected
+    assert expected[0].count("from functools import lru_cache") == 1
+
+
+def test_small_and_empty_inputs() -> None:
+    for src in ("", "# enkel commentaar\n", "plan doe\n  klap tekst hallo amen\ngedaan\n"):
+        assert compile_plats_parallel(src, jobs=4) == compile_plats(src)
+
+
+def test_errors_point_at_the_original_line(small_chunks: None) -> None:
+    lines = _program(40).splitlines()
+    lines[251] = "  zet t amen"
+    lines[301] = "  klap tekst ook kapot"
+    src = "\n".join(lines)
+    with pytest.raises(PlatsSyntaxError) as exc:
+        compile_plats_parallel(src, jobs=2)
+    assert exc.value.line == 252  # the first error in the file, not the first chunk to fail
+    with pytest.raises(PlatsSyntaxError) as expected:
+        compile_plats(src)
+    assert str(exc.value) == str(expected.value)
+
+
+def test_python_level_errors_are_reported_with_plats_lines(small_chunks: None) -> None:
+    lines = _program(40).splitlines()
+    lines.insert(300, "geeftterug getal 1 amen")
+    with pytest.raises(SyntaxError) as exc:
+        compile_plats_parallel("\n".join(lines), filename="groot.plats", jobs=2)
+    assert (exc.value.filename, exc.value.lineno) == ("groot.plats", 301)
+
+
+def test_unclosed_blocks_report_like_the_sequential_compiler() -> None:
+    src = "plan doe\n  maak funksie f doe\n    klap tekst a amen\n"
+    with pytest.raises(PlatsSyntaxError) as expected:
+        compile_plats(src)
+    with pytest.raises(PlatsSyntaxError) as exc:
+        compile_plats_parallel(src)
+    assert str(exc.value) == str(expected.value)
+
+
+def test_optimizer_warnings_reach_the_caller(small_chunks: None) -> None:
+    src = _program(10) + "maak funksie fac met n doe\n  geeftterug da n keer roep fac met da n deraf getal 1 amen\ngedaan\n"
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        compile_plats_parallel(src, optimize=1, filename="fac.plats", jobs=2)
+    [warning] = [w for w in caught if issubclass(w.category, PlatsWarning)]
+    assert (warning.filename, warning.lineno) == ("fac.plats", src.count("\n") - 1)
+
+
+def test_fast_locals_are_not_supported() -> None:
+    with pytest.raises(ValueError):
+        compile_plats_parallel("plan doe\ngedaan\n", optimize=2)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import re
+import traceback
+
+import pytest
+
+from vlaamscodex import nodes as n
+from vlaamscodex.compiler import compile_plats, compile_plats_code
+from vlaamscodex.errors import PlatsSyntaxError
+from vlaamscodex.parser import parse_expr, parse_plats
+
+
+def test_expr_precedence_matches_python() -> None:
+    expr = parse_expr("da a derbij da b keer getal 2".split(), 1)
+    assert isinstance(expr, n.BinOp) and expr.op == "derbij"
+    assert isinstance(expr.right, n.BinOp) and expr.right.op == "keer"
+
+    expr = parse_expr("nie da a isgelijk da b enook da c".split(), 1)
+    assert isinstance(expr, n.BinOp) and expr.op == "enook"
+    assert isinstance(expr.left, n.UnaryOp) and isinstance(expr.left.operand, n.Compare)
+
+
+def test_tekst_stops_at_operators() -> None:
+    expr = parse_expr("tekst gdag da wereld plakt spatie".split(), 1)
+    assert expr == n.BinOp("plakt", n.Str("gdag da wereld", 1), n.Str(" ", 1), 1)
+
+
+def test_comments_and_cookie_are_ignored() -> None:
+    mod = parse_plats(
+        "# coding: vlaamsplats\n"
+        "plan doe  # begin\n"
+        "  # commentaar\n"
+        "  klap getal 1 amen # inline\n"
+        "gedaan\n"
+    )
+    (plan,) = mod.body
+    assert isinstance(plan, n.Plan)
+    assert plan.body == [n.Print(n.Num(1, 4), 4)]
+
+
+def test_funksie_without_met() -> None:
+    py = compile_plats("plan doe\n  maak funksie hallo doe\n    klap tekst hallo amen\n  gedaan\ngedaan\n")
+    assert "def hallo():" in py
+
+
+@pytest.mark.parametrize(
+    ("src", "line", "fragment"),
+    [
+        ("plan doe\n  klap tekst x\ngedaan", 2, "missing 'amen'"),
+        ("plan doe\n  zet x tekst y amen\ngedaan", 2, "zet missing 'op'"),
+        ("plan doe\n\n  klap da x plakt amen\ngedaan", 3, "expected expression after 'plakt'"),
+        ("plan doe\n  klap getal 1x amen\ngedaan", 2, "invalid number literal"),
+        ("plan doe\n  klap tekst x amen\n", 1, "unclosed blocks"),
+        ("gedaan", 1, "gedaan without open block"),
+    ],
+)
+def test_errors_carry_plats_line(src: str, line: int, fragment: str) -> None:
+    with pytest.raises(PlatsSyntaxError) as exc:
+        compile_plats(src)
+    assert exc.value.line == line
+    assert fragment in exc.value.message
+    assert isinstance(exc.value, ValueError)
+
+
+@pytest.mark.parametrize(
+    ("stmt", "fragment"),
+    [
+        # The old string-pasting compiler copied any unknown token into the Python output.
+        ("klap len(x) amen", "unexpected token: len(x)"),
+        ("klap x.y amen", "unexpected token: x.y"),
+        # ... and silently dropped everything after a `dan`/`doe`/`amen` inside an expression.
+        ("klap da x dan da y amen", "unexpected token in expression: dan"),
+        ("zet a op da x doe da y amen", "unexpected token in expression: doe"),
+    ],
+)
+def test_forms_the_old_compiler_accepted_are_rejected(stmt: str, fragment: str) -> None:
+    with pytest.raises(PlatsSyntaxError, match=re.escape(fragment)):
+        compile_plats(f"plan doe\n  {stmt}\ngedaan\n")
+
+
+def test_code_object_reports_plats_lines() -> None:
+    src = "plan doe\n  maak funksie boem doe\n    geeftterug getal 1 gedeeld getal 0 amen\n  gedaan\n  roep boem amen\ngedaan\n"
+    code = compile_plats_code(src, "boem.plats")
+    with pytest.raises(ZeroDivisionError) as exc:
+        exec(code, {})
+    frames = traceback.extract_tb(exc.value.__traceback__)
+    assert [(f.filename, f.lineno) for f in frames[-2:]] == [("boem.plats", 5), ("boem.plats", 3)]
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from types import CodeType
+
+import pytest
+
+from vlaamscodex.cli import main
+from vlaamscodex.compiler import compile_plats, compile_plats_code, compile_plats_with_map
+from vlaamscodex.profiler import _code_objects, profile_plats
+
+PROGRAM = """\
+maak funksie fib met n doe
+  als da n iskleinerdan getal 2 dan doe
+    geeftterug da n amen
+  gedaan
+  zet a op roep fib met da n deraf getal 1 amen
+  zet b op roep fib met da n deraf getal 2 amen
+  geeftterug da a derbij da b amen
+gedaan
+
+plan doe
+  zet t op getal 0 amen
+  voor i van getal 0 tot getal 500 doe
+    zet t op da t derbij da i amen
+  gedaan
+  klap roep fib met getal 10 amen
+gedaan
+"""
+
+BACKENDS = [
+    "sys.settrace",
+    pytest.param(
+        "sys.monitoring",
+        marks=pytest.mark.skipif(not hasattr(sys, "monitoring"), reason="sys.monitoring needs Python 3.12+"),
+    ),
+]
+
+
+def test_line_map_points_at_plats_lines() -> None:
+    py, line_map = compile_plats_with_map(PROGRAM)
+    assert py == compile_plats(PROGRAM)
+    py_lines = py.splitlines()
+    assert len(line_map) == len(py_lines)
+    assert line_map[py_lines.index("    a = fib(n - 1)")] == 5
+    assert line_map[py_lines.index("print(fib(10))")] == 15
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_profile_attributes_time_to_plats_lines(backend: str, capsys: pytest.CaptureFixture[str]) -> None:
+    report = profile_plats(PROGRAM, "fib.plats", backend=backend)
+    assert capsys.readouterr().out == "55\n"
+
+    funcs = {f.name: f for f in report.functions}
+    assert funcs["fib"].calls == 177 and funcs["fib"].line == 1
+    assert funcs["plan"].calls == 1
+    assert funcs["plan"].cum_ns >= funcs["fib"].cum_ns >= funcs["fib"].self_ns > 0
+
+    lines = {s.line: s for s in report.lines}
+    assert lines[13].hits == 500 and lines[13].source == "zet t op da t derbij da i amen"
+    assert lines[5].hits == 88
+    assert lines[15].cum_ns >= funcs["fib"].cum_ns  # the call site includes the whole recursion
+    assert lines[5].cum_ns <= funcs["fib"].cum_ns  # recursive calls are counted once
+    assert report.top_lines(1)[0].line in lines
+
+
+REEKS = """\
+plan doe
+  zet r op reeks van getal 0 tot getal 200000 amen
+  zet s op da r keer getal 2 amen
+  klap som van da s amen
+gedaan
+"""
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_reeks_work_is_charged_to_the_line_that_uses_it(backend: str, capsys: pytest.CaptureFixture[str]) -> None:
+    report = profile_plats(REEKS, "reeks.plats", backend=backend)
+    assert capsys.readouterr().out == "39999800000.0\n"
+
+    assert {f.name for f in report.functions} == {"plan"}  # no `__new__`, `_map`, `__mul__`, ...
+    lines = {s.line: s for s in report.lines}
+    assert set(lines) == {2, 3, 4}
+    assert lines[3].self_ns > lines[2].self_ns / 4  # the element-wise `keer` is not charged to line 2
+
+
+def _blank_qualnames(code: CodeType) -> CodeType:
+    consts = tuple(_blank_qualnames(c) if isinstance(c, CodeType) else c for c in code.co_consts)
+    if hasattr(code, "co_qualname"):  # Python 3.11+; 3.10 code objects have no qualname at all
+        return code.replace(co_consts=consts, co_qualname="?")
+    return code.replace(co_consts=consts)
+
+
+def test_reeks_code_is_found_without_qualnames() -> None:
+    src = "maak funksie schaal met xs doe\n  geeftterug da xs keer getal 2 amen\ngedaan\n" + REEKS
+    code = _blank_qualnames(compile_plats_code(src, "reeks.plats"))
+    assert sorted(c.co_name for c in _code_objects(code)) == ["<module>", "schaal"]
+
+
+def test_cli_prints_report_to_stderr(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    script = tmp_path / "fib.plats"
+    script.write_text(PROGRAM, encoding="utf-8")
+    assert main(["profile", str(script), "--top", "3", "--sort", "cum"]) == 0
+    out, err = capsys.readouterr()
+    assert out == "55\n"
+    assert "funksie" in err and "fib" in err and "roep fib met getal 10" in err
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_a_failing_program_keeps_its_report(backend: str, capsys: pytest.CaptureFixture[str]) -> None:
+    src = PROGRAM + "plan doe\n  roep boem amen\ngedaan\n"  # a second plan block, after the first ran
+    with pytest.raises(NameError) as exc:
+        profile_plats(src, "fib.plats", backend=backend)
+    assert capsys.readouterr().out == "55\n"
+    report = exc.value.profile_report  # type: ignore[attr-defined]
+    assert {f.name for f in report.functions} == {"plan", "fib"}
+    assert {15, 18} <= {s.line for s in report.lines}
+
+
+def test_cli_prints_the_report_of_a_failing_program(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    script = tmp_path / "boem.plats"
+    script.write_text("plan doe\n  klap tekst eerst amen\n  roep boem amen\ngedaan\n", encoding="utf-8")
+    with pytest.raises(NameError):
+        main(["profile", str(script)])
+    out, err = capsys.readouterr()
+    assert out == "eerst\n"
+    assert "roep boem amen" in err
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from vlaamscodex import nodes as n
+from vlaamscodex import parallel
+from vlaamscodex.cli import main
+from vlaamscodex.compiler import compile_plats, compile_plats_code, compile_plats_with_map
+from vlaamscodex.errors import PlatsSyntaxError
+from vlaamscodex.parallel import compile_plats_parallel_with_map
+from vlaamscodex.parser import parse_plats
+
+REEKS = """\
+plan doe
+  zet r op reeks van getal 0 tot getal 5 amen
+  zet s op da r keer getal 2 derbij getal 1 amen
+  klap da s amen
+  klap getal 10 deraf da r amen
+  klap da r derbij da s amen
+  klap getal 1 gedeeld reeks met getal 2 en getal 4 amen
+  klap som van da s amen
+  klap gemiddelde van da s amen
+  klap minimum van da s amen
+  klap maximum van da s amen
+  klap lengte van reeks van getal 0 tot getal 10 stap getal 3 amen
+gedaan
+"""
+
+EXPECTED = (
+    "reeks([1.0, 3.0, 5.0, 7.0, 9.0])\n"
+    "reeks([10.0, 9.0, 8.0, 7.0, 6.0])\n"
+    "reeks([1.0, 4.0, 7.0, 10.0, 13.0])\n"
+    "reeks([0.5, 0.25])\n"
+    "25.0\n"
+    "5.0\n"
+    "1.0\n"
+    "9.0\n"
+    "4\n"
+)
+
+
+def _run(src: str, optimize: int = 0) -> str:
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        exec(compile_plats_code(src, optimize=optimize), {})
+    return buf.getvalue()
+
+
+def test_parse_sequences_and_reductions() -> None:
+    mod = parse_plats("plan doe\n  klap som van reeks met getal 1 en da x derbij getal 2 amen\ngedaan\n")
+    value = mod.body[0].body[0].value
+    assert isinstance(value, n.Reduce) and value.func == "som"
+    assert isinstance(value.value, n.Seq)
+    assert [type(i) for i in value.value.items] == [n.Num, n.BinOp]  # `derbij` binds inside the item
+
+    mod = parse_plats("plan doe\n  zet r op reeks van getal 0 tot da n stap getal 2 amen\ngedaan\n")
+    rng = mod.body[0].body[0].value
+    assert isinstance(rng, n.SeqRange) and isinstance(rng.step, n.Num)
+
+    # a reduction binds tighter than the operators around it
+    mod = parse_plats("plan doe\n  klap som van da r derbij getal 1 amen\ngedaan\n")
+    expr = mod.body[0].body[0].value
+    assert isinstance(expr, n.BinOp) and isinstance(expr.left, n.Reduce)
+
+
+def test_reduction_names_stay_usable_as_variables() -> None:
+    src = "plan doe\n  zet som op getal 3 amen\n  klap da som derbij getal 1 amen\ngedaan\n"
+    assert _run(src) == "4\n"
+    assert "__plats_reeks__" not in compile_plats(src)
+
+
+@pytest.mark.parametrize("optimize", [0, 1, 2])
+def test_element_wise_operators_and_reductions(optimize: int) -> None:
+    assert _run(REEKS, optimize) == EXPECTED
+
+
+def test_reeks_passed_to_a_funksie() -> None:
+    src = (
+        "maak funksie schaal met xs en f doe\n"
+        "  geeftterug da xs keer da f amen\n"
+        "gedaan\n"
+        "plan doe\n"
+        "  zet r op reeks met getal 1 en getal 2 en getal 3 amen\n"
+        "  klap roep schaal met da r en getal 3 amen\n"
+        "gedaan\n"
+    )
+    assert _run(src) == "reeks([3.0, 6.0, 9.0])\n"
+
+
+def test_runtime_errors() -> None:
+    src = (
+        "plan doe\n"
+        "  zet a op reeks met getal 1 amen\n"
+        "  zet b op reeks met getal 1 en getal 2 amen\n"
+        "  klap da a derbij da b amen\n"
+        "gedaan\n"
+    )
+    with pytest.raises(ValueError, match="verschillende lengte: 1 en 2"):
+        _run(src)
+    empty = "plan doe\n  klap gemiddelde van reeks van getal 0 tot getal 0 amen\ngedaan\n"
+    with pytest.raises(ValueError, match="lege reeks"):
+        _run(empty)
+    with pytest.raises(PlatsSyntaxError, match="missing 'tot'"):
+        compile_plats("plan doe\n  zet r op reeks van getal 3 amen\ngedaan\n")
+
+
+def test_prelude_is_emitted_once_with_plats_line_numbers() -> None:
+    py_src, line_map = compile_plats_with_map(REEKS)
+    assert py_src.count("class __plats_reeks__(__plats_array__):") == 1
+    assert py_src.splitlines()[0] == "from array import array as __plats_array__"
+    prelude = py_src.splitlines().index("r = __plats_reeks__(range(0, 5))")
+    assert set(line_map[:prelude]) == {0}  # generated, not user code
+    assert line_map[prelude] == 2
+
+
+def test_built_program_runs_without_vlaamscodex(tmp_path: Path) -> None:
+    src = tmp_path / "data.plats"
+    src.write_text(REEKS, encoding="utf-8")
+    out = tmp_path / "data.py"
+    assert main(["build", str(src), "--out", str(out)]) == 0
+    proc = subprocess.run([sys.executable, "-I", str(out)], capture_output=True, text=True, cwd=tmp_path)
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout == EXPECTED
+
+
+def test_parallel_compile_keeps_one_prelude(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(parallel, "MIN_CHUNK_LINES", 20)
+    blocks = []
+    for i in range(20):
+        blocks += [
+            f"maak onthoud funksie f{i} met x doe",
+            f"  zet r op reeks met da x en getal {i} amen",
+            "  geeftterug som van da r keer getal 2 amen",
+            "gedaan",
+        ]
+    plan = [f"  zet x{i} op getal {i} amen" for i in range(40)]  # the reeks is first used in a later chunk
+    plan.append("  klap reeks met da x1 en da x2 keer getal 2 amen")
+    src = "\n".join(["plan doe", *plan, "gedaan", *blocks]) + "\n"
+    expected = compile_plats_with_map(src, optimize=1)
+    assert compile_plats_parallel_with_map(src, optimize=1, jobs=2) == expected
+    assert expected[0].count("class __plats_reeks__") == 1
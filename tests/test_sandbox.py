@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import multiprocessing
+from typing import Iterator
+
+import pytest
+
+from vlaamscodex import sandbox
+from vlaamscodex.sandbox import Limits, SandboxBusy, SandboxPool
+
+pytestmark = pytest.mark.skipif(
+    sandbox.resource is None or "forkserver" not in multiprocessing.get_all_start_methods(),
+    reason="needs resource limits and a fork server (Unix)",
+)
+
+LIMITS = Limits(cpu_seconds=1, memory_bytes=64 * 1024 * 1024, wall_seconds=3.0, max_output=1000)
+
+FOREVER = "plan doe\n  zolang getal 1 doe\n    zet x op getal 1 amen\n  gedaan\ngedaan\n"
+
+
+@pytest.fixture(scope="module")
+def pool() -> Iterator[SandboxPool]:
+    with SandboxPool(1, limits=LIMITS) as p:
+        yield p
+
+
+def test_runs_program_and_captures_output(pool: SandboxPool) -> None:
+    src = (
+        "maak onthoud funksie dubbel met x doe\n"
+        "  geeftterug da x keer getal 2 amen\n"
+        "gedaan\n"
+        "plan doe\n"
+        "  klap roep dubbel met getal 21 amen\n"
+        "gedaan\n"
+    )
+    result = pool.run(src, "dubbel.plats")
+    assert result.ok
+    assert result.stdout == "42\n"
+    assert result.stderr == ""
+
+
+def test_reeks_programs_run(pool: SandboxPool) -> None:
+    src = "plan doe\n  zet r op reeks van getal 1 tot getal 4 amen\n  klap gemiddelde van da r keer getal 2 amen\n"
+    result = pool.run(src + "gedaan\n", "reeks.plats")
+    assert result.ok, result.stderr
+    assert result.stdout == "4.0\n"
+
+
+def test_error_traceback_shows_only_plats_frames(pool: SandboxPool) -> None:
+    src = "plan doe\n  klap tekst eerst amen\n  klap roep bestaatnie amen\ngedaan\n"
+    result = pool.run(src, "kapot.plats")
+    assert result.status == sandbox.ERROR
+    assert result.stdout == "eerst\n"
+    assert 'File "kapot.plats", line 3' in result.stderr
+    assert "klap roep bestaatnie amen" in result.stderr
+    assert "NameError" in result.stderr
+    assert "sandbox.py" not in result.stderr
+
+
+def test_syntax_error(pool: SandboxPool) -> None:
+    result = pool.run("plan doe\n  klap\ngedaan\n", "syntax.plats")
+    assert result.status == sandbox.SYNTAX_ERROR
+    assert "syntax.plats" in result.stderr
+
+
+@pytest.mark.parametrize("name", ["open", "__import__", "eval"])
+def test_dangerous_builtins_are_unavailable(pool: SandboxPool, name: str) -> None:
+    result = pool.run(f"plan doe\n  klap roep {name} met tekst os amen\ngedaan\n")
+    assert result.status == sandbox.ERROR
+    assert "NameError" in result.stderr or "ImportError" in result.stderr
+
+
+def test_output_is_capped(pool: SandboxPool) -> None:
+    src = "plan doe\n  zolang getal 1 doe\n    klap tekst spam amen\n  gedaan\ngedaan\n"
+    result = pool.run(src)
+    assert result.status == sandbox.OUTPUT_LIMIT
+    assert result.truncated
+    assert len(result.stdout) == LIMITS.max_output
+
+
+def test_cpu_limit_stops_a_busy_loop_and_the_pool_recovers(pool: SandboxPool) -> None:
+    result = pool.run(FOREVER)
+    assert result.status == sandbox.CPU_LIMIT
+    assert pool.run("plan doe\n  klap tekst nog daar amen\ngedaan\n").stdout == "nog daar\n"
+
+
+def test_memory_limit(pool: SandboxPool) -> None:
+    src = "plan doe\n  zet x op tekst a amen\n  zolang getal 1 doe\n    zet x op da x plakt da x amen\n  gedaan\ngedaan\n"
+    assert pool.run(src).status == sandbox.MEMORY_LIMIT
+
+
+def test_wall_timeout_kills_the_worker() -> None:
+    with SandboxPool(1, limits=Limits(cpu_seconds=30, wall_seconds=0.3)) as p:
+        result = p.run(FOREVER)
+        assert result.status == sandbox.TIMEOUT
+        assert p.run("plan doe\n  klap tekst ok amen\ngedaan\n").ok
+        assert p.stats()["recycled"] == 1
+
+
+def test_workers_are_recycled_after_max_runs() -> None:
+    hello = "plan doe\n  klap tekst hallo amen\ngedaan\n"
+    with SandboxPool(1, limits=LIMITS, max_runs=2) as p:
+        results = [p.run(hello) for _ in range(5)]
+        stats = p.stats()
+    assert all(r.stdout == "hallo\n" for r in results)
+    assert stats["recycled"] == 2
+    assert stats["ok"] == 5
+
+
+def test_full_queue_rejects_submissions() -> None:
+    with SandboxPool(1, limits=Limits(cpu_seconds=30, wall_seconds=1.0), queue_size=1) as p:
+        futures = []
+        with pytest.raises(SandboxBusy):
+            for _ in range(3):  # one running, one queued, then the queue is full
+                futures.append(p.submit(FOREVER))
+        assert p.stats()["rejected"] == 1
+        assert all(f.result().status == sandbox.TIMEOUT for f in futures)
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import http.client
+import json
+import multiprocessing
+import threading
+from typing import Any, Iterator
+
+import pytest
+
+from vlaamscodex import sandbox
+from vlaamscodex.sandbox import Limits
+from vlaamscodex.service import PlatsService, make_server
+
+HAS_SANDBOX = sandbox.resource is not None and "forkserver" in multiprocessing.get_all_start_methods()
+needs_sandbox = pytest.mark.skipif(not HAS_SANDBOX, reason="needs resource limits and a fork server (Unix)")
+
+HELLO = "plan doe\n  klap tekst gdag amen\ngedaan\n"
+
+
+@pytest.fixture(scope="module")
+def server() -> Iterator[tuple[str, int]]:
+    service = PlatsService(run_workers=2 if HAS_SANDBOX else 0, limits=Limits(cpu_seconds=1, wall_seconds=3))
+    httpd = make_server(service, "127.0.0.1", 0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address[:2]
+    httpd.shutdown()
+    httpd.server_close()
+    service.close()
+
+
+def _call(server: tuple[str, int], method: str, path: str, body: Any = None) -> tuple[int, Any]:
+    conn = http.client.HTTPConnection(*server, timeout=10)
+    try:
+        raw = body if isinstance(body, bytes) else json.dumps(body).encode() if body is not None else None
+        conn.request(method, path, body=raw, headers={"Content-Type": "application/json"})
+        resp = conn.getresponse()
+        return resp.status, json.loads(resp.read())
+    finally:
+        conn.close()
+
+
+def test_compile_and_syntax_errors(server: tuple[str, int]) -> None:
+    status, body = _call(server, "POST", "/compile", {"source": HELLO})
+    assert status == 200
+    assert "print('gdag')" in body["python"]
+
+    status, body = _call(server, "POST", "/compile", {"source": "plan doe\n  klap\ngedaan\n"})
+    assert status == 422
+    assert body["error"]["code"] == "SYNTAX_ERROR"
+    assert body["error"]["line"] == 2
+
+    # valid Platskript, but Python rejects the generated code
+    source = "plan doe\n  klap tekst a amen\n  geeftterug getal 1 amen\ngedaan\n"
+    status, body = _call(server, "POST", "/compile", {"source": source})
+    assert status == 422
+    assert body["error"] == {"code": "SYNTAX_ERROR", "message": "'return' outside function", "line": 3}
+
+
+def test_check_and_transform(server: tuple[str, int]) -> None:
+    status, body = _call(server, "POST", "/check", {"source": HELLO})
+    assert (status, body) == (200, {"ok": True, "issues": []})
+
+    status, body = _call(server, "POST", "/check", {"source": "plan doe\n  klap tekst a\ngedaan\n"})
+    assert status == 200 and not body["ok"]
+    assert body["issues"][0]["line"] == 2
+
+    status, body = _call(server, "POST", "/transform", {"text": "Hallo wereld.", "dialect": "vlaams/antwerps"})
+    assert status == 200 and isinstance(body["text"], str)
+
+    status, body = _call(server, "POST", "/transform", {"text": "x", "dialect": "bestaatnie"})
+    assert status == 404 and body["error"]["code"] == "UNKNOWN_DIALECT"
+
+
+def test_batch_reports_errors_per_item(server: tuple[str, int]) -> None:
+    items = [{"source": HELLO}, {"source": "plan doe\n  klap\ngedaan\n"}, {"sorce": HELLO}, "nope"]
+    status, body = _call(server, "POST", "/compile/batch", {"items": items})
+    assert status == 200
+    ok, syntax, missing, bad = body["results"]
+    assert "python" in ok
+    assert syntax["error"]["code"] == "SYNTAX_ERROR"
+    assert missing["error"]["code"] == "BAD_REQUEST"
+    assert bad["error"]["code"] == "BAD_REQUEST"
+
+
+@needs_sandbox
+def test_run_and_run_batch(server: tuple[str, int]) -> None:
+    status, body = _call(server, "POST", "/run", {"source": HELLO})
+    assert status == 200
+    assert (body["status"], body["stdout"]) == ("ok", "gdag\n")
+
+    programs = [f"plan doe\n  klap getal {i} amen\ngedaan\n" for i in range(12)]  # more than the queue holds
+    programs.append("plan doe\n  klap roep open met tekst x amen\ngedaan\n")
+    status, body = _call(server, "POST", "/run/batch", {"items": [{"source": p} for p in programs]})
+    assert status == 200
+    results = body["results"]
+    assert [r["stdout"] for r in results[:-1]] == [f"{i}\n" for i in range(12)]
+    assert results[-1]["status"] == "error" and "NameError" in results[-1]["stderr"]
+
+
+def test_bad_requests(server: tuple[str, int]) -> None:
+    assert _call(server, "POST", "/compile", b"{nope")[1]["error"]["code"] == "BAD_JSON"
+    assert _call(server, "POST", "/compile", [1, 2])[0] == 400
+    assert _call(server, "POST", "/compile", {"source": HELLO, "optimize": 3})[0] == 400
+    assert _call(server, "POST", "/elders", {})[0] == 404
+    assert _call(server, "GET", "/health")[1]["ok"] is True
+
+
+@pytest.mark.parametrize("length", ["abc", "-5"])
+def test_invalid_content_length_is_rejected(server: tuple[str, int], length: str) -> None:
+    conn = http.client.HTTPConnection(*server, timeout=10)
+    try:
+        conn.putrequest("POST", "/compile")
+        conn.putheader("Content-Length", length)
+        conn.endheaders()
+        resp = conn.getresponse()
+        assert resp.status == 400
+        assert json.loads(resp.read())["error"]["code"] == "BAD_REQUEST"
+    finally:
+        conn.close()
+
+
+def test_stats_count_latency_per_endpoint(server: tuple[str, int]) -> None:
+    for _ in range(3):
+        _call(server, "POST", "/compile", {"source": HELLO + "# stats\n"})
+    status, stats = _call(server, "GET", "/stats")
+    assert status == 200
+    compile_stats = stats["endpoints"]["/compile"]
+    assert compile_stats["count"] >= 3
+    assert 0 < compile_stats["p50_ms"] <= compile_stats["max_ms"]
+    assert stats["compile_cache"]["hits"] >= 2  # the same source, compiled once
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import io
+from typing import Iterator
+
+import pytest
+
+from vlaamscodex import codec
+from vlaamscodex.compiler import compile_plats, compile_plats_iter
+
+PROGRAM = """\
+# coding: vlaamsplats
+maak onthoud funksie dubbel met x doe
+  geeftterug da x keer getal 2 amen
+gedaan
+
+plan doe
+  zet som op getal 0 amen
+  voor i van getal 0 tot getal 10 doe
+    als da i isgelijk getal 7 dan doe
+      stop amen
+    anders doe
+      zet som op da som derbij roep dubbel met da i amen
+    gedaan
+  gedaan
+  klap da som amen
+gedaan
+"""
+
+
+def _big_program(blocks: int) -> str:
+    parts = ["# coding: vlaamsplats\n"]
+    for i in range(blocks):
+        parts.append(f"plan doe\n  zet x{i} op getal {i} amen\n  klap da x{i} amen\ngedaan\n")
+    return "".join(parts)
+
+
+def _run(py_src: str) -> list[str]:
+    printed: list[str] = []
+    exec(compile(py_src, "<test>", "exec"), {"print": lambda *a: printed.append(" ".join(map(str, a)))})
+    return printed
+
+
+@pytest.mark.parametrize("optimize", [0, 1])
+def test_iter_matches_compile_plats(optimize: int) -> None:
+    streamed = "".join(compile_plats_iter(PROGRAM.splitlines(), optimize=optimize))
+    assert streamed == compile_plats(PROGRAM, optimize=optimize)
+    assert _run(streamed) == ["42"]
+
+
+def test_iter_is_lazy() -> None:
+    consumed = 0
+
+    def lines() -> Iterator[str]:
+        nonlocal consumed
+        for line in _big_program(1000).splitlines():
+            consumed += 1
+            yield line
+
+    first = next(iter(compile_plats_iter(lines())))
+    assert first == "x0 = 0\n"
+    assert consumed < 10
+
+
+def test_iter_rejects_fast_locals() -> None:
+    with pytest.raises(ValueError):
+        next(compile_plats_iter(["plan doe"], optimize=2))
+
+
+def test_incremental_decoder_byte_by_byte() -> None:
+    data = PROGRAM.replace("\n", "\r\n").encode("utf-8")
+    decoder = codec._search("vlaamsplats").incrementaldecoder()
+    out = "".join(decoder.decode(data[i : i + 1]) for i in range(len(data))) + decoder.decode(b"", final=True)
+    assert out == codec._compile_plats_bytes(PROGRAM.encode("utf-8"), "strict")[0]
+
+
+def test_large_input_streams_with_bounded_output(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(codec, "STREAM_THRESHOLD", 256)
+    src = _big_program(200)
+    decoder = codec._search("vlaamsplats").incrementaldecoder()
+    chunks = [decoder.decode(src[i : i + 64].encode()) for i in range(0, len(src), 64)]
+    chunks.append(decoder.decode(b"", final=True))
+
+    assert sum(1 for c in chunks[:20] if c) > 5  # output arrives while input is still coming in
+    assert "".join(chunks) == codec._compile_plats_bytes(src.encode(), "strict")[0]
+
+
+def test_stream_reader_reads_lines_and_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(codec, "STREAM_THRESHOLD", 128)
+    monkeypatch.setattr(codec, "_READ_CHUNK", 50)
+    src = _big_program(30)
+    expected = codec._compile_plats_bytes(src.encode(), "strict")[0]
+
+    reader = codec._search("vlaamsplats").streamreader(io.BytesIO(src.encode()))
+    assert reader.readline() == "# coding: utf-8\n"
+    assert reader.read(chars=5) == "x0 = "
+    assert reader.readline(keepends=False) == "0"
+    assert reader.readline() + reader.read() == expected.split("\n", 2)[2]
+
+    reader.reset()
+    reader.stream.seek(0)
+    assert "".join(reader) == expected
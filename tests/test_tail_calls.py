@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import warnings
+
+import pytest
+
+from vlaamscodex import nodes as n
+from vlaamscodex.compiler import compile_plats, compile_plats_code
+from vlaamscodex.errors import PlatsWarning
+from vlaamscodex.parser import parse_expr
+
+SOM = """\
+maak funksie som met i en n en acc doe
+  als da i isgelijk da n dan doe
+    geeftterug da acc amen
+  gedaan
+  geeftterug roep som met da i derbij getal 1 en da n en da acc derbij da i amen
+gedaan
+plan doe
+  klap roep som met getal 0 en getal 100000 en getal 0 amen
+gedaan
+"""
+
+
+def _run(code: object) -> str:
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        exec(code, {})
+    return buf.getvalue()
+
+
+def _warnings(src: str) -> list[warnings.WarningMessage]:
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        compile_plats_code(src, "t.plats", optimize=1)
+    return [w for w in caught if issubclass(w.category, PlatsWarning)]
+
+
+def test_roep_is_an_expression() -> None:
+    expr = parse_expr("da n keer roep f met da n deraf getal 1 en getal 2".split(), 1)
+    assert isinstance(expr, n.BinOp) and isinstance(expr.right, n.Call)
+    assert expr.right.func == "f" and len(expr.right.args) == 2
+    assert parse_expr(["roep", "g"], 1) == n.Call("g", [], 1)
+
+
+def test_tail_recursion_becomes_a_loop() -> None:
+    py = compile_plats(SOM, optimize=1)
+    assert "    while True:\n" in py
+    assert "i, n, acc = (i + 1, n, acc + i)" in py
+    assert "return som(" not in py
+    assert _run(compile_plats_code(SOM, optimize=1)) == f"{sum(range(100000))}\n"
+
+
+def test_without_optimizer_deep_recursion_fails() -> None:
+    with pytest.raises(RecursionError):
+        _run(compile_plats_code(SOM))
+
+
+def test_fall_through_returns_none() -> None:
+    src = (
+        "maak funksie f met n doe\n"
+        "  als da n isgroterdan getal 0 dan doe\n"
+        "    geeftterug roep f met da n deraf getal 1 amen\n"
+        "  gedaan\n"
+        "gedaan\n"
+        "plan doe\n"
+        "  klap roep f met getal 5000 amen\n"
+        "gedaan\n"
+    )
+    assert _run(compile_plats_code(src, optimize=1)) == "None\n"
+
+
+@pytest.mark.parametrize(
+    ("body", "line", "message"),
+    [
+        ("  geeftterug da n keer roep f met da n amen\n", 2, "not in tail position"),
+        ("  roep f met da n amen\n", 2, "not in tail position"),
+        ("  geeftterug roep f met da n en getal 1 amen\n", 2, "passes 2 argument(s), expected 1"),
+        ("  zolang da n doe\n    geeftterug roep f met da n amen\n  gedaan\n", 3, "not in tail position"),
+        (
+            "  maak funksie g doe\n    geeftterug da n amen\n  gedaan\n  geeftterug roep f met da n amen\n",
+            1,
+            "nested funksie",
+        ),
+    ],
+)
+def test_diagnostics(body: str, line: int, message: str) -> None:
+    (w,) = _warnings(f"maak funksie f met n doe\n{body}gedaan\n")
+    assert w.filename == "t.plats" and w.lineno == line
+    assert message in str(w.message)
+
+
+def test_no_diagnostic_for_rewritten_or_non_recursive_code() -> None:
+    assert _warnings(SOM) == []
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import io
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from vlaamscodex.watch import HotProgram, watch
+
+PROGRAM = """\
+maak funksie groet met naam doe
+  klap tekst hallo plakt spatie plakt da naam amen
+gedaan
+
+maak funksie los doe
+  klap tekst los amen
+gedaan
+
+plan doe
+  zet teller op getal 0 amen
+  roep groet met tekst wereld amen
+gedaan
+"""
+
+
+def test_first_run_executes_the_whole_program(capsys: pytest.CaptureFixture[str]) -> None:
+    program = HotProgram("w.plats")
+    result = program.load(PROGRAM)
+    assert result.entry_run and result.error is None
+    assert capsys.readouterr().out == "hallo wereld\n"
+    assert callable(program.namespace["groet"])
+
+
+def test_changed_funksie_is_swapped_and_entry_rerun(capsys: pytest.CaptureFixture[str]) -> None:
+    program = HotProgram("w.plats")
+    program.load(PROGRAM)
+    old_los = program.namespace["los"]
+    result = program.load(PROGRAM.replace("hallo", "dag"))
+    assert result.recompiled == ("groet",)
+    assert result.entry_run
+    assert program.namespace["los"] is old_los  # untouched funksies keep their function object
+    assert capsys.readouterr().out == "hallo wereld\ndag wereld\n"
+
+
+def test_unreachable_change_does_not_rerun_entry(capsys: pytest.CaptureFixture[str]) -> None:
+    program = HotProgram("w.plats")
+    program.load(PROGRAM)
+    result = program.load(PROGRAM.replace("tekst los", "tekst vast"))
+    assert result.recompiled == ("los",) and not result.entry_run
+    program.namespace["los"]()
+    assert capsys.readouterr().out == "hallo wereld\nvast\n"
+
+
+def test_moved_funksie_keeps_its_object_with_new_line_numbers() -> None:
+    program = HotProgram("w.plats")
+    program.load(PROGRAM)
+    groet = program.namespace["groet"]
+    result = program.load("# nieuw\n# commentaar\n" + PROGRAM)
+    assert set(result.moved) == {"groet", "los"} and not result.recompiled
+    assert not result.entry_run  # only the entry's line numbers changed
+    assert program.namespace["groet"] is groet
+    assert groet.__code__.co_firstlineno == 3
+
+
+def test_removed_funksie_leaves_the_namespace() -> None:
+    program = HotProgram("w.plats")
+    program.load(PROGRAM)
+    result = program.load(PROGRAM.replace("maak funksie los doe\n  klap tekst los amen\ngedaan\n", ""))
+    assert result.removed == ("los",)
+    assert "los" not in program.namespace
+
+
+def test_syntax_error_keeps_the_last_good_version(capsys: pytest.CaptureFixture[str]) -> None:
+    program = HotProgram("w.plats")
+    program.load(PROGRAM)
+    result = program.load(PROGRAM.replace("roep groet met", "roep groet"))
+    assert result.error is not None and result.error.startswith("w.plats:11:")
+    assert not result.entry_run
+    assert "keeping the previous version" in result.format(1)
+    result = program.load(PROGRAM.replace("wereld", "Vlaanderen"))  # diffed against the last good one
+    assert result.recompiled == () and result.entry_run
+    assert capsys.readouterr().out == "hallo wereld\nhallo Vlaanderen\n"
+
+
+def test_runtime_error_shows_only_program_frames() -> None:
+    program = HotProgram("w.plats")
+    program.load(PROGRAM)
+    broken = PROGRAM.replace("klap tekst hallo plakt spatie plakt da naam", "geeftterug da naam gedeeld getal 0")
+    result = program.load(broken)
+    assert result.entry_run and result.error is not None
+    assert 'File "w.plats", line 2, in groet' in result.error
+    assert "watch.py" not in result.error
+    assert result.format(1).startswith("[watch] reload 1: recompiled groet; entry re-run in")
+
+
+def test_onthoud_caches_are_cleared_on_change(capsys: pytest.CaptureFixture[str]) -> None:
+    src = (
+        "maak funksie factor doe\n  geeftterug getal 2 amen\ngedaan\n"
+        "maak onthoud funksie maal met x doe\n  geeftterug da x keer roep factor amen\ngedaan\n"
+        "plan doe\n  klap roep maal met getal 7 amen\ngedaan\n"
+    )
+    program = HotProgram("o.plats", optimize=1)
+    program.load(src)
+    program.load(src.replace("getal 2", "getal 3"))
+    assert capsys.readouterr().out == "14\n21\n"
+
+
+def test_fast_locals_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        HotProgram("w.plats", optimize=2)
+
+
+def test_watch_polls_the_file(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    path = tmp_path / "w.plats"
+    path.write_text(PROGRAM, encoding="utf-8")
+    stop = threading.Event()
+    report = io.StringIO()
+    thread = threading.Thread(target=watch, args=(path,), kwargs={"interval": 0.01, "stop": stop, "report": report})
+    thread.start()
+    try:
+        deadline = time.monotonic() + 5
+        while "watching" not in report.getvalue() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        path.write_text(PROGRAM.replace("hallo", "dag"), encoding="utf-8")
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))  # coarse mtime clocks
+        while "reload 1" not in report.getvalue() and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        stop.set()
+        thread.join()
+    assert "[watch] reload 1: recompiled groet; entry re-run" in report.getvalue()
+    assert capsys.readouterr().out == "hallo wereld\ndag wereld\n"